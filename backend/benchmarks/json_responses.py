@@ -0,0 +1,102 @@
+"""
+Benchmark of JSON serialization for a large enquiry page.
+Builds a WarrantyEnquiryPage of synthetic rows and times turning it into a
+response body three ways: FastAPI's response_model path into the stdlib
+JSONResponse (as before), the same path into FastJSONResponse (the app's
+default response class now) and list_response, which the list routes
+return directly. Reports p50 and p99 per body, the body size, and the
+extra time and size when list_response gzips the page. Needs no database.
+
+Usage (from backend/src):
+    python ../benchmarks/json_responses.py [--rows 20000] [--repeat 50]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from starlette.requests import Request
+
+from utils.responses import FastJSONResponse, list_response
+from warranty.schemas import WarrantyEnquiry, WarrantyEnquiryPage
+
+
+def make_page(rows: int) -> WarrantyEnquiryPage:
+    items = [
+        WarrantyEnquiry(
+            srf_number=f"R{i:05d}/1",
+            srf_date="02-01-2024",
+            name=f"CUSTOMER {i % 700}",
+            model=f"MODEL {i % 90}",
+            serial_number=f"SN{i:08d}",
+            receive_date="05-01-2024" if i % 2 else None,
+            repair_date="09-01-2024" if i % 3 else None,
+            delivery_date=None,
+            contact1="9830012345",
+            contact2=None,
+        )
+        for i in range(rows)
+    ]
+    return WarrantyEnquiryPage(items=items, next_cursor="UjAwMDAwLzE", total=rows)
+
+
+def make_request(accept_encoding: str) -> Request:
+    headers = [(b"accept-encoding", accept_encoding.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+async def timings(build, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await build()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return p50, p99, len(response.body)
+
+
+async def main(rows: int, repeat: int):
+    page = make_page(rows)
+    field = create_model_field(
+        name="Response", type_=WarrantyEnquiryPage, mode="serialization"
+    )
+    identity = make_request("identity")
+    gzipped = make_request("gzip, deflate, br")
+
+    async def response_model(response_class):
+        content = await serialize_response(field=field, response_content=page)
+        return response_class(content=content)
+
+    cases = (
+        ("response_model + JSONResponse", lambda: response_model(JSONResponse)),
+        ("response_model + FastJSON", lambda: response_model(FastJSONResponse)),
+        ("list_response", lambda: _wrap(list_response(identity, page, rows))),
+        ("list_response, gzip", lambda: _wrap(list_response(gzipped, page, rows))),
+    )
+    print(f"{rows} rows, {repeat} runs each")
+    print(f"{'path':<32}{'p50 ms':>10}{'p99 ms':>10}{'bytes':>12}")
+    for name, build in cases:
+        p50, p99, size = await timings(build, repeat)
+        print(f"{name:<32}{p50 * 1000:>10.1f}{p99 * 1000:>10.1f}{size:>12}")
+
+
+async def _wrap(response):
+    return response
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,160 @@
+"""
+Benchmark of the column-projected list queries against full-entity loads.
+Runs every list path through its service method, then runs the same statement
+again selecting whole entities, as the services did before. For each path it
+reports rows per second and the bytes the result rows take up on the server.
+The full-entity side is timed on loading alone, without building responses,
+so the comparison leans in its favour.
+Reads DATABASE_URL_CONNECT like the application does. Nothing is written.
+
+Usage (from backend/src):
+    python ../benchmarks/list_projection.py [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sqlalchemy import func, literal_column, select
+
+from config import Config
+from db.db import async_session_maker
+from master.models import Master
+from out_of_warranty.models import OutOfWarranty
+from out_of_warranty.service import OutOfWarrantyService
+from retail.models import Retail
+from retail.service import RetailService
+from warranty.models import Warranty
+from warranty.service import WarrantyService
+
+warranty_service = WarrantyService()
+out_of_warranty_service = OutOfWarrantyService()
+retail_service = RetailService()
+page_size = Config.ENQUIRY_MAX_PAGE_SIZE
+
+# name -> (service call, entities the pre-projection query selected)
+CASES = {
+    "warranty pending": (
+        warranty_service.list_warranty_pending,
+        (Warranty, Master),
+    ),
+    "warranty srf not settled": (
+        warranty_service.list_srf_not_settled,
+        (Warranty, Master),
+    ),
+    "warranty final settlement": (
+        warranty_service.list_final_srf_settlement,
+        (Warranty, Master),
+    ),
+    "warranty enquiry page": (
+        lambda session: warranty_service.enquiry_warranty(session, limit=page_size),
+        (Warranty, Master),
+    ),
+    "out of warranty pending": (
+        out_of_warranty_service.list_out_of_warranty_pending,
+        (OutOfWarranty, Master),
+    ),
+    "out of warranty srf not settled": (
+        out_of_warranty_service.list_srf_not_settled,
+        (OutOfWarranty, Master),
+    ),
+    "out of warranty final settlement": (
+        out_of_warranty_service.list_final_srf_settlement,
+        (OutOfWarranty, Master),
+    ),
+    "out of warranty enquiry page": (
+        lambda session: out_of_warranty_service.enquiry_out_of_warranty(
+            session, limit=page_size
+        ),
+        (OutOfWarranty, Master),
+    ),
+    "retail not received": (
+        retail_service.list_retail_not_received,
+        (Retail, Master),
+    ),
+    "retail final settlement": (
+        retail_service.list_retail_final_settlement,
+        (Retail, Master),
+    ),
+    "retail enquiry page": (
+        lambda session: retail_service.get_retail_enquiry(session, limit=page_size),
+        (Retail, Master),
+    ),
+}
+
+
+class RecordingSession:
+    """
+    Passes calls through to a real session, keeping the last statement run.
+    """
+
+    def __init__(self, session):
+        self._session = session
+        self.statement = None
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statement = statement
+        return await self._session.execute(statement, *args, **kwargs)
+
+
+async def result_bytes(session, statement) -> int:
+    rows = statement.subquery("t")
+    size = select(
+        func.coalesce(func.sum(func.pg_column_size(literal_column("t.*"))), 0)
+    ).select_from(rows)
+    return (await session.execute(size)).scalar_one()
+
+
+async def time_call(call, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await call()
+    return (time.perf_counter() - start) / repeat
+
+
+async def run_case(name, service_call, entities, repeat: int):
+    async with async_session_maker() as session:
+        recorder = RecordingSession(session)
+        await service_call(recorder)
+        projected = recorder.statement
+        full = projected.with_only_columns(*entities, maintain_column_froms=True)
+
+        async def load_full():
+            return (await session.execute(full)).all()
+
+        rows = len(await load_full())
+        projected_seconds = await time_call(lambda: service_call(session), repeat)
+        full_seconds = await time_call(load_full, repeat)
+        projected_bytes = await result_bytes(session, projected)
+        full_bytes = await result_bytes(session, full)
+
+    def rate(seconds):
+        return rows / seconds if seconds else 0.0
+
+    saved = 100 * (1 - projected_bytes / full_bytes) if full_bytes else 0.0
+    print(
+        f"{name:<34}{rows:>8}"
+        f"{rate(full_seconds):>14.0f}{rate(projected_seconds):>14.0f}"
+        f"{full_bytes:>14}{projected_bytes:>14}{saved:>9.1f}%"
+    )
+
+
+async def main(repeat: int):
+    print(
+        f"{'list path':<34}{'rows':>8}"
+        f"{'full rows/s':>14}{'proj rows/s':>14}"
+        f"{'full bytes':>14}{'proj bytes':>14}{'saved':>10}"
+    )
+    for name, (service_call, entities) in CASES.items():
+        await run_case(name, service_call, entities, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat))
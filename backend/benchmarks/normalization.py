@@ -0,0 +1,171 @@
+"""
+Benchmark of the per-request overhead of request body normalization.
+Sends the same JSON bodies to a FastAPI route validating them into a model of
+plain str fields, once bare and once behind the Strip and Capitalize
+BaseHTTPMiddleware pair the app used before (kept here as a reference copy),
+then to a route whose model declares its fields as utils.schema_types.Upper.
+Requests go over httpx's in-process ASGI transport, so no sockets are
+involved, and the overhead reported is the mean time per request above the
+bare route. Needs no database.
+
+Usage (from backend/src):
+    python ../benchmarks/normalization.py [--requests 2000] [--items 20]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import httpx
+from fastapi import FastAPI, Request
+from pydantic import BaseModel
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from utils.schema_types import Upper
+
+EXCLUDED_PATHS = [
+    "/auth/login",
+    "/user/create_user",
+    "/user/reset_password",
+    "/user/delete_user",
+]
+
+
+# Shaped like a challan or SRF create request
+class Row(BaseModel):
+    division: str
+    model: str
+    serial_number: str
+
+
+class Body(BaseModel):
+    code: str
+    name: str
+    remark: str
+    rows: List[Row]
+
+
+class UpperRow(BaseModel):
+    division: Upper
+    model: Upper
+    serial_number: Upper
+
+
+class UpperBody(BaseModel):
+    code: Upper
+    name: Upper
+    remark: Upper
+    rows: List[UpperRow]
+
+
+def capitalize_values(obj):
+    if isinstance(obj, dict):
+        return {k: capitalize_values(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [capitalize_values(item) for item in obj]
+    elif isinstance(obj, str):
+        return obj.upper()
+    else:
+        return obj
+
+
+def strip_outer_whitespace(data):
+    if isinstance(data, dict):
+        return {k: strip_outer_whitespace(v) for k, v in data.items()}
+    elif isinstance(data, list):
+        return [strip_outer_whitespace(item) for item in data]
+    elif isinstance(data, str):
+        return data.strip()
+    else:
+        return data
+
+
+class LegacyJSONMiddleware(BaseHTTPMiddleware):
+    # middleware/capitalize.py and middleware/strip.py as they were
+    def __init__(self, app, transform):
+        super().__init__(app)
+        self.transform = transform
+
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path in EXCLUDED_PATHS:
+            return await call_next(request)
+        if request.headers.get("content-type") == "application/json":
+            body_bytes = await request.body()
+            if body_bytes:
+                try:
+                    data = self.transform(json.loads(body_bytes))
+                    request._body = json.dumps(data).encode("utf-8")
+                except json.JSONDecodeError:
+                    pass
+        return await call_next(request)
+
+
+def make_app(model, middleware: bool = False) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(body: model):
+        return body
+
+    if middleware:
+        app.add_middleware(LegacyJSONMiddleware, transform=capitalize_values)
+        app.add_middleware(LegacyJSONMiddleware, transform=strip_outer_whitespace)
+    return app
+
+
+def make_body(items: int) -> bytes:
+    return json.dumps(
+        {
+            "code": " c00012 ",
+            "name": " acme traders ",
+            "remark": "  received in good condition  ",
+            "rows": [
+                {"division": " fan ", "model": f" m{i} ", "serial_number": "sn "}
+                for i in range(items)
+            ],
+        }
+    ).encode("utf-8")
+
+
+async def time_app(app: FastAPI, body: bytes, requests: int):
+    transport = httpx.ASGITransport(app=app)
+    headers = {"content-type": "application/json"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        response = await c.post("/echo", content=body, headers=headers)
+        for _ in range(min(requests, 100)):
+            await c.post("/echo", content=body, headers=headers)
+        start = time.perf_counter()
+        for _ in range(requests):
+            await c.post("/echo", content=body, headers=headers)
+        return (time.perf_counter() - start) / requests, response.json()
+
+
+async def main(requests: int, items: int):
+    body = make_body(items)
+    bare, _ = await time_app(make_app(Body), body, requests)
+    print(f"body {len(body)} bytes, bare route {bare * 1e6:.0f} us/request")
+    print(f"{'normalization':<28}{'us/request':>12}{'overhead us':>14}")
+    results = []
+    for name, app in (
+        ("strip + capitalize", make_app(Body, middleware=True)),
+        ("Upper fields", make_app(UpperBody)),
+    ):
+        seconds, result = await time_app(app, body, requests)
+        results.append(result)
+        print(f"{name:<28}{seconds * 1e6:>12.0f}{(seconds - bare) * 1e6:>14.0f}")
+    if results[0] != results[1]:
+        print("warning: the two normalizations produced different values")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.items))
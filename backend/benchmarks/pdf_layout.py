@@ -0,0 +1,178 @@
+"""
+Micro-benchmark of the shared table layout against the inline wrap loop.
+Lays out the same rows with the loop the print paths used before (stringWidth
+for every candidate line and again for centring) and with
+utils.pdf_layout.draw_table, on a canvas that only counts the strings drawn,
+so neither side pays for building a PDF. Reports rows laid out per second.
+The layout cache is cleared before every timed pass of the shared layout, so
+its figure includes the misses of a cold process.
+
+Usage (from backend/src):
+    python ../benchmarks/pdf_layout.py [--rows 2000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from utils.pdf_layout import draw_table, text_width
+
+# The warranty SRF table
+COLUMNS = [
+    {"x": 40, "width": 20},
+    {"x": 70, "width": 50},
+    {"x": 135, "width": 124},
+    {"x": 263, "width": 97},
+    {"x": 365, "width": 105},
+    {"x": 472, "width": 98},
+]
+LAYOUT = dict(
+    font="Helvetica",
+    font_size=9,
+    line_spacing=10,
+    min_row_height=20,
+    row_padding=6,
+    page_break_below=100,
+    page_top=792,
+)
+
+WORDS = (
+    "FAN MIXER GEYSER PUMP IRON CEILING TABLE WALL DOMESTIC MONOBLOCK "
+    "not working noisy motor burnt switch faulty winding replaced no display "
+    "customer complaint pending spare awaited SN24A0019 HB-1200 MX750"
+).split()
+
+
+class CountingCanvas:
+    """
+    Stands in for a reportlab canvas, counting the calls a layout makes.
+    """
+
+    def __init__(self):
+        self.strings = 0
+        self.pages = 1
+
+    def setFont(self, font, font_size):
+        pass
+
+    def drawString(self, x, y, text):
+        self.strings += 1
+
+    def showPage(self):
+        self.pages += 1
+
+
+def legacy_split_text_to_lines(text, font, font_size, max_width):
+    # utils.file_utils.split_text_to_lines as it was
+    words = (str(text) if text is not None else "").split()
+    lines = []
+    line = ""
+    for word in words:
+        test_line = (line + (" " if line else "") + word) if line or word else ""
+        if stringWidth(test_line or "", font, font_size) <= max_width:
+            line = test_line
+        else:
+            lines.append(line or "")
+            line = word
+    if line:
+        lines.append(line or "")
+    return lines
+
+
+def legacy_draw_table(
+    can,
+    columns,
+    rows,
+    y,
+    font,
+    font_size,
+    line_spacing,
+    min_row_height,
+    row_padding,
+    page_break_below,
+    page_top,
+):
+    # The loop each print overlay carried inline
+    can.setFont(font, font_size)
+    for row in rows:
+        row_lines = [
+            legacy_split_text_to_lines(text, font, font_size, col["width"])
+            for col, text in zip(columns, row)
+        ]
+        max_lines = max(len(lines) for lines in row_lines)
+        row_height = max(max_lines * line_spacing, min_row_height)
+        if y - row_height < page_break_below:
+            can.showPage()
+            can.setFont(font, font_size)
+            y = page_top
+        for col, lines in zip(columns, row_lines):
+            vertical_offset = (row_height - len(lines) * line_spacing) / 2
+            for i, line in enumerate(lines):
+                width = stringWidth(line or "", font, font_size)
+                center_x = col["x"] + col["width"] / 2 - width / 2
+                can.drawString(center_x, y - vertical_offset - i * line_spacing, line)
+        y -= row_height + row_padding
+    return y
+
+
+def make_rows(count: int):
+    rng = random.Random(0)
+
+    def phrase(low, high):
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+    return [
+        [
+            str(i % 10 + 1),
+            f"R{i:05d}/1",
+            phrase(1, 4),
+            f"SN{rng.randint(0, 10**8):08d}",
+            phrase(1, 2),
+            phrase(2, 12),
+        ]
+        for i in range(count)
+    ]
+
+
+def time_layout(layout, rows, repeat: int, before=None):
+    best = float("inf")
+    for _ in range(repeat):
+        if before:
+            before()
+        can = CountingCanvas()
+        start = time.perf_counter()
+        layout(can, COLUMNS, rows, y=541, **LAYOUT)
+        best = min(best, time.perf_counter() - start)
+    return best, can
+
+
+def main(row_count: int, repeat: int):
+    rows = make_rows(row_count)
+    legacy_seconds, legacy_canvas = time_layout(legacy_draw_table, rows, repeat)
+    shared_seconds, shared_canvas = time_layout(
+        draw_table, rows, repeat, before=text_width.cache_clear
+    )
+    warm_seconds, _ = time_layout(draw_table, rows, repeat)
+
+    print(f"{'layout':<24}{'rows/s':>12}{'strings':>10}{'pages':>8}")
+    for name, seconds, can in (
+        ("inline loop", legacy_seconds, legacy_canvas),
+        ("shared, cold cache", shared_seconds, shared_canvas),
+        ("shared, warm cache", warm_seconds, shared_canvas),
+    ):
+        print(f"{name:<24}{row_count / seconds:>12.0f}{can.strings:>10}{can.pages:>8}")
+    print(f"speed-up (warm): {legacy_seconds / warm_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
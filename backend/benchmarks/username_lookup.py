@@ -0,0 +1,144 @@
+"""
+Benchmark of the username lookup before and after the lower(username) index.
+Fills a temporary copy of the users table with synthetic users, then times
+random lookups the way get_user_by_username ran them before (ilike, which
+the unique index on username cannot serve) and the way it runs them now
+(equality on lower(username), backed by ix_users_username_lower). Reports
+p50 and p99 per lookup and the plan Postgres picks for each.
+Reads DATABASE_URL_CONNECT like the application does. The temporary table
+is dropped with the connection; nothing else is written.
+
+Usage (from backend/src):
+    python ../benchmarks/username_lookup.py [--users 10000] [--lookups 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    select,
+    text,
+)
+
+from auth.utils import normalize_username
+from db.db import async_engine
+
+metadata = MetaData()
+bench_users = Table(
+    "bench_users",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("username", String, nullable=False, unique=True),
+    Column("password", String, nullable=False),
+    Column("role", String, nullable=False),
+    Column("phone_number", String, nullable=False),
+    Column("is_active", String(1), nullable=False),
+    prefixes=["TEMPORARY"],
+)
+# ix_users_username_lower, on the copy
+CREATE_LOWER_INDEX = text(
+    "CREATE INDEX ix_bench_users_username_lower ON bench_users (lower(username))"
+)
+
+
+def make_users(count: int):
+    return [
+        {
+            "id": i,
+            "username": f"User {i:05d}",
+            "password": "$2b$12$" + "x" * 53,
+            "role": "ADMIN" if i % 50 == 0 else "USER",
+            "phone_number": f"98{i:08d}",
+            "is_active": "N" if i % 20 == 0 else "Y",
+        }
+        for i in range(count)
+    ]
+
+
+def before(username: str):
+    # get_user_by_username as it was
+    username = " ".join(username.strip().split())
+    return select(bench_users).where(
+        bench_users.c.username.ilike(username), bench_users.c.is_active == "Y"
+    )
+
+
+def after(username: str):
+    return select(bench_users).where(
+        func.lower(bench_users.c.username) == normalize_username(username),
+        bench_users.c.is_active == "Y",
+    )
+
+
+async def plan(conn, statement) -> str:
+    compiled = statement.compile(
+        dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+    )
+    result = await conn.execute(text(f"EXPLAIN {compiled}"))
+    return result.scalars().first()
+
+
+async def time_lookups(conn, build, names):
+    samples = []
+    for name in names:
+        start = time.perf_counter()
+        (await conn.execute(build(name))).first()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return statistics.median(samples), p99
+
+
+async def main(user_count: int, lookup_count: int):
+    rng = random.Random(0)
+    # Mixed case and stray spaces, as typed at the login form
+    names = [
+        (
+            f" user  {rng.randrange(user_count):05d}".upper()
+            if i % 2
+            else f"User {rng.randrange(user_count):05d}"
+        )
+        for i in range(lookup_count)
+    ]
+    async with async_engine.connect() as conn:
+        await conn.run_sync(lambda sync_conn: bench_users.create(sync_conn))
+        await conn.execute(insert(bench_users), make_users(user_count))
+        await conn.execute(text("ANALYZE bench_users"))
+        before_p50, before_p99 = await time_lookups(conn, before, names)
+        before_plan = await plan(conn, before(names[0]))
+
+        await conn.execute(CREATE_LOWER_INDEX)
+        await conn.execute(text("ANALYZE bench_users"))
+        after_p50, after_p99 = await time_lookups(conn, after, names)
+        after_plan = await plan(conn, after(names[0]))
+        await conn.rollback()
+
+    print(f"{user_count} users, {lookup_count} lookups")
+    print(f"{'lookup':<24}{'p50 ms':>10}{'p99 ms':>10}  plan")
+    for name, p50, p99, query_plan in (
+        ("ilike", before_p50, before_p99, before_plan),
+        ("lower() equality", after_p50, after_p99, after_plan),
+    ):
+        print(f"{name:<24}{p50 * 1000:>10.3f}{p99 * 1000:>10.3f}  {query_plan}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.lookups))
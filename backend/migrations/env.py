@@ -20,6 +20,7 @@ from src.model.models import Model
 from src.rewinding_rate.models import RewindingRate
 from src.complaint_number.models import ComplaintNumber
 from src.cg_srf_number.models import CGSRFNumber
+from src.counter.models import Counter, ListVersion
 from sqlmodel import SQLModel
 from src.config import Config
 
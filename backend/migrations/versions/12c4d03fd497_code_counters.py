@@ -0,0 +1,52 @@
+"""Code Counters
+
+Revision ID: 12c4d03fd497
+Revises: 7d2a6be0df56
+Create Date: 2026-10-18 14:03:27.904611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '12c4d03fd497'
+down_revision: Union[str, Sequence[str], None] = '7d2a6be0df56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# prefix -> (table, column) holding the codes already handed out
+COUNTERS = {
+    "C": [("master", "code")],
+    "X": [("retail", "rcode")],
+    "N": [("challan_smart", "challan_number")],
+    "U": [("challan_unique", "challan_number")],
+    "V": [("warranty", "challan_number"), ("out_of_warranty", "challan_number")],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Seed each counter from the highest code already in use
+    for prefix, sources in COUNTERS.items():
+        max_numbers = " UNION ALL ".join(
+            f"SELECT MAX(SUBSTRING({column} FROM 2)::INTEGER) AS number "
+            f"FROM {table} WHERE {column} ~ '^{prefix}[0-9]+$'"
+            for table, column in sources
+        )
+        op.execute(
+            f"""
+            INSERT INTO counter (prefix, last_number)
+            SELECT '{prefix}', COALESCE(MAX(number), 0) FROM ({max_numbers}) AS used
+            ON CONFLICT (prefix) DO NOTHING
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM counter WHERE prefix IN ('C', 'X', 'N', 'U', 'V')")
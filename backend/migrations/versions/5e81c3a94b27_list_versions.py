@@ -0,0 +1,34 @@
+"""List Versions
+
+Revision ID: 5e81c3a94b27
+Revises: 12c4d03fd497
+Create Date: 2026-10-18 16:41:09.372815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e81c3a94b27'
+down_revision: Union[str, Sequence[str], None] = '12c4d03fd497'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A missing row reads as version 0, so no seeding is needed
+    op.create_table('list_version',
+    sa.Column('name', sa.VARCHAR(length=30), nullable=False),
+    sa.Column('version', sa.BIGINT(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('list_version')
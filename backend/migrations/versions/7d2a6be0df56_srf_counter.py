@@ -0,0 +1,50 @@
+"""SRF Counter
+
+Revision ID: 7d2a6be0df56
+Revises: b13ed2f8d212
+Create Date: 2026-10-18 10:12:41.218307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a6be0df56'
+down_revision: Union[str, Sequence[str], None] = 'b13ed2f8d212'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('counter',
+    sa.Column('prefix', sa.VARCHAR(length=1), nullable=False),
+    sa.Column('last_number', sa.INTEGER(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('prefix')
+    )
+    # Seed the counters from the highest base number already in use
+    op.execute(
+        """
+        INSERT INTO counter (prefix, last_number)
+        SELECT 'R', COALESCE(MAX(SUBSTRING(SPLIT_PART(srf_number, '/', 1) FROM 2)::INTEGER), 0)
+        FROM warranty
+        WHERE srf_number ~ '^R[0-9]+/'
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO counter (prefix, last_number)
+        SELECT 'S', COALESCE(MAX(SUBSTRING(SPLIT_PART(srf_number, '/', 1) FROM 2)::INTEGER), 0)
+        FROM out_of_warranty
+        WHERE srf_number ~ '^S[0-9]+/'
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('counter')
@@ -0,0 +1,30 @@
+"""Username Lower Index
+
+Revision ID: 9b3f2d7c1e64
+Revises: 5e81c3a94b27
+Create Date: 2026-10-18 18:02:44.615230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3f2d7c1e64'
+down_revision: Union[str, Sequence[str], None] = '5e81c3a94b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves the case-insensitive username lookup of every login and token check
+    op.create_index('ix_users_username_lower', 'users', [sa.text('lower(username)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_username_lower', table_name='users')
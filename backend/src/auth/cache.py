@@ -0,0 +1,91 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+from config import Config
+
+from .schemas import UserResponse
+
+
+def normalize_username(username: str) -> str:
+    # The form usernames are looked up by: single spaces, lower case. It is
+    # both the user cache key and what the lower(username) index is queried
+    # with, so the two always agree
+    return " ".join(username.split()).lower()
+
+
+class UserCache:
+    """
+    In-memory cache of active users by normalized username, with a TTL.
+    Unknown and inactive users are cached as None, so create_user has to
+    invalidate as well as delete_user and reset_password. Other workers see
+    those writes once their entry expires.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[str, tuple] = {}  # username -> (expires_at, user)
+        self._versions: Dict[str, int] = {}
+
+    def invalidate(self, username: str) -> None:
+        key = normalize_username(username)
+        self._entries.pop(key, None)
+        # A load already running started before this write, so its result
+        # must not be stored
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    async def get_or_load(
+        self, username: str, load: Callable[[], Awaitable[Optional[UserResponse]]]
+    ) -> Optional[UserResponse]:
+        key = normalize_username(username)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        version = self._versions.get(key, 0)
+        user = await load()
+        if self._versions.get(key, 0) == version:
+            self._entries[key] = (time.monotonic() + self.ttl, user)
+        return user
+
+
+class TokenCache:
+    """
+    LRU of verified token payloads keyed by a digest of the token. An entry
+    is only served until the token's own exp, after which the token is
+    decoded again and rejected as expired. The payloads are shared between
+    requests and must not be modified.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, dict]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        payload = self._entries.get(key)
+        if payload is None:
+            return None
+        if payload["exp"] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        # A token without exp never expires, so it is not kept
+        if not isinstance(payload.get("exp"), (int, float)):
+            return
+        key = self._key(token)
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+user_cache = UserCache(ttl=Config.USER_CACHE_TTL)
+token_cache = TokenCache(max_size=Config.TOKEN_CACHE_SIZE)
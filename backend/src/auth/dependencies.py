@@ -4,7 +4,7 @@ from fastapi import Depends, Request
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
-from auth.models import User
+from auth.schemas import UserResponse
 from db.db import get_session
 from exceptions import (
     AccessDenied,
@@ -38,16 +38,11 @@ class TokenBearer(HTTPBearer):
                 token = request.cookies.get("access_token")
         if not token:
             raise InvalidToken()
+        # Raises InvalidToken for a bad or expired token
         token_data = decode_user_token(token)
-        if not self.token_valid(token):
-            raise InvalidToken()
         self.verify_token_data(token_data)
         return token_data
 
-    def token_valid(self, token: str) -> bool:
-        token_data = decode_user_token(token)
-        return token_data is not None
-
     def verify_token_data(self, token_data: dict):
         raise NotImplementedError("Override this method in subclasses")
 
@@ -71,14 +66,16 @@ async def get_current_user(
     session: AsyncSession = Depends(get_session),
 ):
     username = token_data["user"]["username"]
-    return await auth_service.get_user_by_username(username, session)
+    return await auth_service.get_active_user(username, session)
 
 
 class RoleChecker:
     def __init__(self, allowed_roles: List[str]) -> None:
         self.allowed_roles = allowed_roles
 
-    async def __call__(self, current_user: User = Depends(get_current_user)):
-        if current_user.role in self.allowed_roles:
+    async def __call__(self, current_user: UserResponse = Depends(get_current_user)):
+        # A deleted user's token is still signed, so the role comes from the
+        # user record rather than the token claims
+        if current_user is not None and current_user.role in self.allowed_roles:
             return True
         raise AccessDenied()
@@ -1,10 +1,12 @@
 import sqlalchemy.dialects.postgresql as pg
-from sqlalchemy import Identity
+from sqlalchemy import Identity, Index, text
 from sqlmodel import Column, Field, SQLModel
 
 
 class User(SQLModel, table=True):
     __tablename__ = "users"
+    # Usernames are looked up case-insensitively, by lower(username)
+    __table_args__ = (Index("ix_users_username_lower", text("lower(username)")),)
     id: int = Field(
         sa_column=Column(
             pg.INTEGER,
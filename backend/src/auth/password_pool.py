@@ -0,0 +1,108 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+from config import Config
+from exceptions import PasswordPoolBusy
+
+from .utils import generate_hash_password, verify_password
+
+
+class PasswordPool:
+    """
+    Runs bcrypt hashing and verification in a small thread pool, so the
+    few hundred milliseconds each takes never block the event loop (bcrypt
+    releases the GIL while it works). Once max_queued calls are waiting for
+    a thread, further calls fail at once with PasswordPoolBusy rather than
+    queueing behind a login rush. Latency, including the wait for a thread,
+    is kept per operation, so logins can be watched apart from the rest.
+    """
+
+    def __init__(self, workers: int, max_queued: int):
+        self.workers = workers
+        self.max_queued = max_queued
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self._rejected = 0
+        self._latencies: Dict[str, Deque[float]] = {}  # seconds, newest last
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password"
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        if self._in_flight >= self.workers + self.max_queued:
+            self._rejected += 1
+            raise PasswordPoolBusy()
+        self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._in_flight -= 1
+            latencies = self._latencies.setdefault(operation, deque(maxlen=256))
+            latencies.append(time.perf_counter() - start)
+
+    async def hash(self, password: str, operation: str) -> str:
+        return await self._run(operation, generate_hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str, operation: str) -> bool:
+        return await self._run(operation, verify_password, password, hashed_password)
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Queue depth, rejections and recent latency per operation, in
+        milliseconds.
+        """
+
+        def percentiles(samples: Deque[float]) -> Dict[str, Any]:
+            ordered = sorted(samples)
+
+            def percentile(fraction: float) -> float:
+                index = min(len(ordered) - 1, int(fraction * len(ordered)))
+                return round(ordered[index] * 1000, 1)
+
+            return {
+                "count": len(ordered),
+                "latency_ms_p50": percentile(0.5),
+                "latency_ms_p95": percentile(0.95),
+                "latency_ms_max": percentile(1.0),
+            }
+
+        return {
+            "workers": self.workers,
+            "max_queued": self.max_queued,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.workers),
+            "rejected": self._rejected,
+            "operations": {
+                operation: percentiles(samples)
+                for operation, samples in self._latencies.items()
+            },
+        }
+
+
+# Fewer password calls in flight than connections, so a login rush always
+# leaves some for other requests
+_db_connections = Config.DB_POOL_SIZE + Config.DB_MAX_OVERFLOW
+password_pool = PasswordPool(
+    workers=Config.PASSWORD_HASH_WORKERS,
+    max_queued=max(
+        0,
+        min(
+            Config.PASSWORD_HASH_MAX_QUEUED,
+            _db_connections - Config.PASSWORD_HASH_WORKERS - 1,
+        ),
+    ),
+)
@@ -89,7 +89,7 @@ async def get_current_user(
     session: AsyncSession = Depends(get_session),
 ):
     username = token_data["user"]["username"]
-    user = await auth_service.get_user_by_username(username, session)
+    user = await auth_service.get_active_user(username, session)
     return user
 
 
@@ -1,11 +1,16 @@
+from typing import Optional
+
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.future import select
 
 from exceptions import InvalidCredentials, UserNotFound
 
+from .cache import user_cache
 from .models import User
-from .schemas import UserLogin
-from .utils import verify_password
+from .password_pool import password_pool
+from .schemas import UserLogin, UserResponse
+from .utils import normalize_username
 
 
 class AuthService:
@@ -14,16 +19,34 @@ class AuthService:
         existing_user = await self.get_user_by_username(user.username, session)
         if not existing_user:
             raise UserNotFound()
-        if verify_password(user.password, existing_user.password):
+        # End the read before the bcrypt work, which may queue, so the
+        # connection goes back to the pool; expire_on_commit=False keeps the
+        # loaded attributes
+        await session.commit()
+        if await password_pool.verify(user.password, existing_user.password, "login"):
             return existing_user
         raise InvalidCredentials()
 
     async def get_user_by_username(self, username: str, session: AsyncSession):
-        # Normalize username spacing
-        username = username.strip()
-        username = " ".join(username.split())
         statement = select(User).where(
-            User.username.ilike(username), User.is_active == "Y"
+            func.lower(User.username) == normalize_username(username),
+            User.is_active == "Y",
         )
         result = await session.execute(statement)
         return result.scalars().first()
+
+    async def get_active_user(
+        self, username: str, session: AsyncSession
+    ) -> Optional[UserResponse]:
+        """
+        Returns the active user a token names, from the user cache when it
+        holds one. Only the public fields are cached, never the password hash.
+        """
+
+        async def load():
+            user = await self.get_user_by_username(username, session)
+            if user is None:
+                return None
+            return UserResponse.model_validate(user, from_attributes=True)
+
+        return await user_cache.get_or_load(username, load)
@@ -7,6 +7,8 @@ from passlib.context import CryptContext
 from config import Config
 from exceptions import InvalidToken
 
+from .cache import normalize_username, token_cache
+
 password_context = CryptContext(schemes=["bcrypt"])
 
 ACCESS_TOKEN_EXPIRY = timedelta(hours=3)
@@ -37,14 +39,19 @@ def create_user_token(user_data: dict, expiry: timedelta = None, refresh: bool =
 
 
 def decode_user_token(token: str) -> dict:
+    # Each distinct token is verified once and then served from the cache
+    token_data = token_cache.get(token)
+    if token_data is not None:
+        return token_data
     try:
         token_data = jwt.decode(
             jwt=token,
             key=Config.JWT_SECRET_KEY,
             algorithms=[Config.JWT_ALGORITHM],
         )
-        return token_data
     except jwt.ExpiredSignatureError:
         raise InvalidToken()
     except jwt.PyJWTError:
         raise InvalidToken()
+    token_cache.put(token, token_data)
+    return token_data
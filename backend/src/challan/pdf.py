@@ -0,0 +1,81 @@
+from functools import partial
+from typing import Dict, List
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from utils.pdf_layout import draw_table
+from utils.pdf_templates import pdf_templates
+
+
+def _draw_overlay(can: canvas.Canvas, header: Dict[str, str], rows: List[dict]) -> None:
+    """
+    Draws the challan details and rows.
+    """
+    width, height = A4
+
+    # PDF layout constants (integrated)
+    font_bold = "Helvetica-Bold"
+    font_size = 13
+    font_size_bold = 10
+    line_spacing = 10
+    min_row_height = 30
+    row_padding = 1
+    columns = [
+        {"x": 28, "width": 22},  # Sl No
+        {"x": 60, "width": 360},  # Spare
+        {"x": 440, "width": 40},  # Quantity
+        {"x": 490, "width": 80},  # Unit
+    ]
+
+    # Header fields
+    can.setFont(font_bold, font_size_bold)
+    can.drawString(178, 696, header["challan_number"])
+    can.drawString(368, 696, header["challan_date"])
+    can.drawString(240, 658, header["name"])
+    can.drawString(240, 634, header["full_address"])
+    can.drawString(170, 608, header["code"])
+    can.drawString(500, 608, header["contact"])
+    can.drawString(170, 589, header["order_number"])
+    can.drawString(500, 589, header["order_date"])
+    can.drawString(170, 570, header["invoice_number"])
+    can.drawString(500, 570, header["invoice_date"])
+    can.drawString(170, 551, header["remark"])
+
+    can.setFont(font_bold, font_size)
+    can.drawString(450, 251, header["total"])
+
+    # Table rows
+    row_data = [
+        [
+            str(idx),
+            str(row["spare"]) if row["spare"] is not None else "",
+            str(row["quantity"]) if row["quantity"] is not None else "",
+            str(row["unit"]) if row["unit"] is not None else "",
+        ]
+        for idx, row in enumerate(rows, 1)
+    ]
+    draw_table(
+        can,
+        columns,
+        row_data,
+        y=507,
+        font=font_bold,
+        font_size=font_size,
+        line_spacing=line_spacing,
+        min_row_height=min_row_height,
+        row_padding=row_padding,
+        page_break_below=100,
+        page_top=height - 50,
+    )
+
+
+def render_road_challan(
+    template: str, header: Dict[str, str], rows: List[dict]
+) -> bytes:
+    """
+    Renders a road challan over the smart_challan or unique_challan template.
+    Both pages carry the same overlay.
+    """
+    draw = partial(_draw_overlay, header=header, rows=rows)
+    return pdf_templates.render(template, [draw, draw])
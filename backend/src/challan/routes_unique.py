@@ -1,13 +1,19 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from auth.dependencies import AccessTokenBearer
 from db.db import get_session
+from utils.pdf_cache import pdf_response
 
-from .schemas import ChallanNextCodeMaxChallanDate, ChallanNumber, CreateChallan
+from .schemas import (
+    ChallanBatchPrint,
+    ChallanNextCodeMaxChallanDate,
+    ChallanNumber,
+    CreateChallan,
+)
 from .service_unique import ChallanUniqueService
 
 challan_unique_router = APIRouter()
@@ -71,6 +77,7 @@ Print challan details by code.
 
 @challan_unique_router.post("/print", status_code=status.HTTP_200_OK)
 async def print_challan(
+    request: Request,
     data: ChallanNumber,
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
@@ -78,10 +85,20 @@ async def print_challan(
     challan_pdf = await challan_unique_service.print_challan(
         data.challan_number, session
     )
-    return StreamingResponse(
-        challan_pdf,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="{data.challan_number}.pdf"'
-        },
-    )
+    return pdf_response(request, challan_pdf, f"{data.challan_number}.pdf")
+
+
+"""
+Print several challans by challan number as one PDF.
+"""
+
+
+@challan_unique_router.post("/print_batch", status_code=status.HTTP_200_OK)
+async def print_challan_batch(
+    request: Request,
+    data: ChallanBatchPrint,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
+):
+    challan_pdf = await challan_unique_service.print_challan_batch(data, session)
+    return pdf_response(request, challan_pdf, "challan_batch.pdf")
@@ -1,42 +1,44 @@
 from datetime import date
 from operator import ge
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from utils.schema_types import Upper
+
 
 class CreateChallan(BaseModel):
-    name: str = Field(..., min_length=3, max_length=40)
+    name: Upper = Field(..., min_length=3, max_length=40)
     challan_date: date
-    desc1: str = Field(..., max_length=30)
+    desc1: Upper = Field(..., max_length=30)
     qty1: int = Field(..., ge=1)
-    unit1: str = Field(..., max_length=8)
-    desc2: Optional[str] = Field(None, max_length=30)
+    unit1: Upper = Field(..., max_length=8)
+    desc2: Optional[Upper] = Field(None, max_length=30)
     qty2: Optional[int] = Field(None, ge=1)
-    unit2: Optional[str] = Field(None, max_length=8)
-    desc3: Optional[str] = Field(None, max_length=30)
+    unit2: Optional[Upper] = Field(None, max_length=8)
+    desc3: Optional[Upper] = Field(None, max_length=30)
     qty3: Optional[int] = Field(None, ge=1)
-    unit3: Optional[str] = Field(None, max_length=8)
-    desc4: Optional[str] = Field(None, max_length=30)
+    unit3: Optional[Upper] = Field(None, max_length=8)
+    desc4: Optional[Upper] = Field(None, max_length=30)
     qty4: Optional[int] = Field(None, ge=1)
-    unit4: Optional[str] = Field(None, max_length=8)
-    desc5: Optional[str] = Field(None, max_length=30)
+    unit4: Optional[Upper] = Field(None, max_length=8)
+    desc5: Optional[Upper] = Field(None, max_length=30)
     qty5: Optional[int] = Field(None, ge=1)
-    unit5: Optional[str] = Field(None, max_length=8)
-    desc6: Optional[str] = Field(None, max_length=30)
+    unit5: Optional[Upper] = Field(None, max_length=8)
+    desc6: Optional[Upper] = Field(None, max_length=30)
     qty6: Optional[int] = Field(None, ge=1)
-    unit6: Optional[str] = Field(None, max_length=8)
-    desc7: Optional[str] = Field(None, max_length=30)
+    unit6: Optional[Upper] = Field(None, max_length=8)
+    desc7: Optional[Upper] = Field(None, max_length=30)
     qty7: Optional[int] = Field(None, ge=1)
-    unit7: Optional[str] = Field(None, max_length=8)
-    desc8: Optional[str] = Field(None, max_length=30)
+    unit7: Optional[Upper] = Field(None, max_length=8)
+    desc8: Optional[Upper] = Field(None, max_length=30)
     qty8: Optional[int] = Field(None, ge=1)
-    unit8: Optional[str] = Field(None, max_length=8)
-    order_number: Optional[str] = Field(None, max_length=15)
+    unit8: Optional[Upper] = Field(None, max_length=8)
+    order_number: Optional[Upper] = Field(None, max_length=15)
     order_date: Optional[date] = None
-    invoice_number: Optional[str] = Field(None, max_length=15)
+    invoice_number: Optional[Upper] = Field(None, max_length=15)
     invoice_date: Optional[date] = None
-    remark: str = Field(..., min_length=1, max_length=50)
+    remark: Upper = Field(..., min_length=1, max_length=50)
 
 
 class ChallanNextCodeMaxChallanDate(BaseModel):
@@ -45,7 +47,11 @@ class ChallanNextCodeMaxChallanDate(BaseModel):
 
 
 class ChallanNumber(BaseModel):
-    challan_number: str
+    challan_number: Upper
+
+
+class ChallanBatchPrint(BaseModel):
+    challan_numbers: List[Upper]
 
 
 class ChallanPrintRequest(BaseModel):
@@ -1,7 +1,7 @@
 from datetime import date
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
 from fastapi.responses import JSONResponse, StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -9,6 +9,7 @@ from auth.dependencies import AccessTokenBearer, RoleChecker
 from complaint_number.schemas import ComplaintNumberSchema
 from complaint_number.service import ComplaintNumberService
 from db.db import get_session
+from utils.responses import list_response
 
 complaint_number_router = APIRouter()
 complaint_number_service = ComplaintNumberService()
@@ -67,7 +68,9 @@ List all complaint numbers.
     status_code=status.HTTP_200_OK,
 )
 async def list_complaint_numbers(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
     complaints = await complaint_number_service.list_complaints(session)
-    return complaints
+    return list_response(request, complaints, len(complaints))
@@ -175,10 +175,20 @@ class ComplaintNumberService:
         }
 
     async def list_complaints(self, session: AsyncSession):
-        statement = select(ComplaintNumber)
+        statement = select(
+            ComplaintNumber.complaint_number,
+            ComplaintNumber.status,
+            ComplaintNumber.remark,
+        )
         result = await session.execute(statement)
-        complaints = result.scalars().all()
-        return complaints
+        return [
+            ComplaintNumberSchema(
+                complaint_number=row.complaint_number,
+                status=row.status,
+                remark=row.remark,
+            )
+            for row in result.all()
+        ]
     
     async def check_complaint_number_available(
         self, complaint_number: str, session: AsyncSession
@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,6 +9,59 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str
     FRONTEND_URL: str
 
+    # Connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # Dashboard cache lifetime in seconds
+    DASHBOARD_CACHE_TTL: float = 300
+
+    # Authenticated user cache lifetime in seconds
+    USER_CACHE_TTL: float = 60
+
+    # Verified access and refresh tokens kept in memory
+    TOKEN_CACHE_SIZE: int = 1024
+
+    # Enquiry page sizes
+    ENQUIRY_PAGE_SIZE: int = 100
+    ENQUIRY_MAX_PAGE_SIZE: int = 1000
+
+    # Rows fetched per round trip, and per chunk written, by the exports
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # List responses longer than this many items are gzip-compressed for
+    # clients that accept it, at this compression level
+    GZIP_MIN_ITEMS: int = 500
+    GZIP_LEVEL: int = 5
+
+    # Rows changed per UPDATE ... FROM (VALUES ...) statement
+    BULK_UPDATE_BATCH_SIZE: int = 500
+
+    # Worker processes rendering PDFs, and seconds a print may wait for one
+    PDF_RENDER_WORKERS: int = 2
+    PDF_RENDER_TIMEOUT: float = 30
+
+    # Threads hashing and checking passwords, and how many calls may wait for
+    # one before further logins are refused with 503; kept below the
+    # connection pool (DB_POOL_SIZE + DB_MAX_OVERFLOW) in auth/password_pool.py
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUED: int = 16
+
+    # Templates rendered as form XObjects in one reportlab pass instead of by
+    # merging overlay pages, as a JSON list, e.g. ["retail", "vendor_challan"]
+    PDF_FORM_XOBJECT_TEMPLATES: List[str] = []
+
+    # Most documents one batch print may merge
+    BATCH_PRINT_MAX_DOCUMENTS: int = 100
+
+    # Rendered PDF cache; an empty directory means one under the system temp dir
+    PDF_CACHE_DIR: str = ""
+    PDF_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
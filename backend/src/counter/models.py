@@ -0,0 +1,29 @@
+import sqlalchemy.dialects.postgresql as pg
+from sqlmodel import Column, Field, SQLModel
+
+
+class Counter(SQLModel, table=True):
+    __tablename__ = "counter"
+    prefix: str = Field(sa_column=Column(pg.VARCHAR(1), primary_key=True))
+    last_number: int = Field(
+        sa_column=Column(pg.INTEGER, nullable=False, server_default="0")
+    )
+
+    def __repr__(self):
+        return f"<Counter {self.prefix} - {self.last_number}>"
+
+
+class ListVersion(SQLModel, table=True):
+    """
+    Change counter of a reference list, bumped in the transaction of every
+    write that changes the list. Writes made outside the app must bump it too.
+    """
+
+    __tablename__ = "list_version"
+    name: str = Field(sa_column=Column(pg.VARCHAR(30), primary_key=True))
+    version: int = Field(
+        sa_column=Column(pg.BIGINT, nullable=False, server_default="0")
+    )
+
+    def __repr__(self):
+        return f"<ListVersion {self.name} - {self.version}>"
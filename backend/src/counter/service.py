@@ -0,0 +1,88 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from .models import Counter, ListVersion
+
+
+class CounterService:
+
+    async def next_number(self, prefix: str, session: AsyncSession) -> int:
+        """
+        Atomically allocates the next number for a prefix.
+        The counter row stays locked until the caller commits or rolls back,
+        so concurrent creates are serialized and a rollback releases the number.
+        """
+        statement = (
+            insert(Counter)
+            .values(prefix=prefix, last_number=1)
+            .on_conflict_do_update(
+                index_elements=[Counter.prefix],
+                set_={"last_number": Counter.last_number + 1},
+            )
+            .returning(Counter.last_number)
+        )
+        result = await session.execute(statement)
+        return result.scalar_one()
+
+    async def last_number(self, prefix: str, session: AsyncSession) -> int:
+        """
+        Returns the last number handed out for a prefix, without locking.
+        """
+        statement = select(Counter.last_number).where(Counter.prefix == prefix)
+        result = await session.execute(statement)
+        return result.scalar() or 0
+
+    async def peek_next_number(self, prefix: str, session: AsyncSession) -> int:
+        """
+        Returns the number the next allocation will hand out, without locking.
+        """
+        return await self.last_number(prefix, session) + 1
+
+    async def next_code(self, prefix: str, width: int, session: AsyncSession) -> str:
+        next_number = await self.next_number(prefix, session)
+        return prefix + str(next_number).zfill(width)
+
+    async def peek_next_code(
+        self, prefix: str, width: int, session: AsyncSession
+    ) -> str:
+        next_number = await self.peek_next_number(prefix, session)
+        return prefix + str(next_number).zfill(width)
+
+    async def last_code(
+        self, prefix: str, width: int, session: AsyncSession
+    ) -> Optional[str]:
+        last_number = await self.last_number(prefix, session)
+        if not last_number:
+            return None
+        return prefix + str(last_number).zfill(width)
+
+
+class ListVersionService:
+
+    async def bump(self, name: str, session: AsyncSession) -> None:
+        """
+        Marks a reference list as changed. Call it before the commit of the
+        write that changes the list, so a rollback leaves the version alone.
+        """
+        statement = (
+            insert(ListVersion)
+            .values(name=name, version=1)
+            .on_conflict_do_update(
+                index_elements=[ListVersion.name],
+                set_={"version": ListVersion.version + 1},
+            )
+        )
+        await session.execute(statement)
+
+    async def etag(self, name: str, session: AsyncSession) -> str:
+        """
+        Returns a weak ETag for the current version of a reference list.
+        Read it before the list itself: a write landing in between then only
+        makes the tag older than the body, never newer.
+        """
+        statement = select(ListVersion.version).where(ListVersion.name == name)
+        result = await session.execute(statement)
+        return f'W/"{name}-{result.scalar() or 0}"'
@@ -1,23 +1,105 @@
-from typing import AsyncIterator
+import time
+from typing import AsyncIterator, Optional
 
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
 from sqlmodel import create_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config import Config
 
+
+class TimedQueue(AsyncAdaptedQueue):
+    """
+    Pool queue that records how long get() waits for a checked-in connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            wait = time.perf_counter() - start
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long callers wait for a checked-in
+    connection. Opening a new connection when the pool has room is not
+    waiting and is left out, as the queue only times its own get().
+    """
+
+    _queue_class = TimedQueue
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_count = 0
+        self.timeout_count = 0
+
+    def _do_get(self):
+        self.checkout_count += 1
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeout_count += 1
+            raise
+
+    @property
+    def total_wait(self) -> float:
+        return self._pool.total_wait
+
+    @property
+    def max_wait(self) -> float:
+        return self._pool.max_wait
+
+
 async_engine = AsyncEngine(
     create_engine(
         url=Config.DATABASE_URL_CONNECT,
         echo=False,
+        poolclass=TimedQueuePool,
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+        pool_recycle=Config.DB_POOL_RECYCLE,
+        pool_pre_ping=Config.DB_POOL_PRE_PING,
+        connect_args={"statement_cache_size": Config.DB_STATEMENT_CACHE_SIZE},
     )
 )
 
+async_session_maker = sessionmaker(
+    bind=async_engine, class_=AsyncSession, expire_on_commit=False
+)
+
 
 async def get_session() -> AsyncIterator[AsyncSession]:
-    Session = sessionmaker(
-        bind=async_engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with Session() as session:
+    async with async_session_maker() as session:
         yield session
+
+
+def pool_status() -> dict:
+    pool = async_engine.pool
+    checkout_count = pool.checkout_count
+    return {
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": Config.DB_MAX_OVERFLOW,
+        "checkouts": checkout_count,
+        "timeouts": pool.timeout_count,
+        "average_wait_ms": round(
+            (pool.total_wait / checkout_count * 1000) if checkout_count else 0.0, 3
+        ),
+        "max_wait_ms": round(pool.max_wait * 1000, 3),
+    }
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+
+from auth.dependencies import AccessTokenBearer, RoleChecker
+from auth.password_pool import password_pool
+from db.db import pool_status
+from utils.pdf_renderer import pdf_renderer
+from utils.pdf_templates import pdf_templates
+
+db_router = APIRouter()
+access_token_bearer = AccessTokenBearer()
+role_checker = Depends(RoleChecker(allowed_roles=["ADMIN"]))
+
+
+"""
+Connection pool usage: checked in / checked out / overflow and checkout wait time.
+"""
+
+
+@db_router.get(
+    "/pool_status", status_code=status.HTTP_200_OK, dependencies=[role_checker]
+)
+async def get_pool_status(_=Depends(access_token_bearer)):
+    return JSONResponse(content=pool_status())
+
+
+"""
+PDF render pool: renders in flight, queue depth, failures and recent latency.
+"""
+
+
+@db_router.get(
+    "/pdf_render_status", status_code=status.HTTP_200_OK, dependencies=[role_checker]
+)
+async def get_pdf_render_status(_=Depends(access_token_bearer)):
+    return JSONResponse(content=pdf_renderer.status())
+
+
+"""
+Password hashing pool: calls in flight, rejections and recent latency, with
+logins reported apart from user creation and password resets.
+"""
+
+
+@db_router.get(
+    "/password_pool_status",
+    status_code=status.HTTP_200_OK,
+    dependencies=[role_checker],
+)
+async def get_password_pool_status(_=Depends(access_token_bearer)):
+    return JSONResponse(content=password_pool.status())
+
+
+"""
+Loaded PDF templates, their render mode and whether their files changed on
+disk since loading.
+"""
+
+
+@db_router.get(
+    "/pdf_templates", status_code=status.HTTP_200_OK, dependencies=[role_checker]
+)
+async def get_pdf_templates(_=Depends(access_token_bearer)):
+    return JSONResponse(content=pdf_templates.status())
+
+
+"""
+Re-read the PDF templates from disk after a template file is replaced, and
+restart the render workers so they pick the new templates up.
+"""
+
+
+@db_router.post(
+    "/pdf_templates/reload",
+    status_code=status.HTTP_200_OK,
+    dependencies=[role_checker],
+)
+async def reload_pdf_templates(_=Depends(access_token_bearer)):
+    pdf_templates.reload()
+    pdf_renderer.restart()
+    return JSONResponse(content=pdf_templates.status())
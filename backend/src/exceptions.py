@@ -86,6 +86,10 @@ class VendorNotFound(BaseException):
     """Vendor Not Found"""
 
 
+class VendorChallanNotCreated(BaseException):
+    """None of the SRFs could be put on the vendor challan"""
+
+
 class ModelAlreadyExists(BaseException):
     """Model Already Exists"""
 
@@ -107,6 +111,22 @@ class CGSRFNumberNotFound(BaseException):
     """CG SRF Number Not Found"""
 
 
+class InvalidCursor(BaseException):
+    """Invalid Page Cursor"""
+
+
+class PdfRenderTimeout(BaseException):
+    """PDF was not rendered in time"""
+
+
+class InvalidBatchPrint(BaseException):
+    """Batch print needs a list or a range of valid numbers"""
+
+
+class PasswordPoolBusy(BaseException):
+    """Too many password checks are already waiting"""
+
+
 def create_exception_handler(
     status_code: int, initial_detail: Any
 ) -> Callable[[Request, Exception], JSONResponse]:
@@ -333,6 +353,18 @@ def register_exceptions(app: FastAPI):
         ),
     )
 
+    app.add_exception_handler(
+        VendorChallanNotCreated,
+        create_exception_handler(
+            status_code=status.HTTP_409_CONFLICT,
+            initial_detail={
+                "message": "Vendor Challan Not Created",
+                "resolution": "The SRFs are already on a challan or do not exist",
+                "error_code": "vendor_challan_not_created",
+            },
+        ),
+    )
+
     app.add_exception_handler(
         ModelNotFound,
         create_exception_handler(
@@ -417,6 +449,54 @@ def register_exceptions(app: FastAPI):
         ),
     )
 
+    app.add_exception_handler(
+        InvalidCursor,
+        create_exception_handler(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            initial_detail={
+                "message": "Invalid Page Cursor",
+                "resolution": "Please restart the enquiry from the first page",
+                "error_code": "invalid_cursor",
+            },
+        ),
+    )
+
+    app.add_exception_handler(
+        PdfRenderTimeout,
+        create_exception_handler(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            initial_detail={
+                "message": "PDF Not Ready",
+                "resolution": "The server is busy printing, please try again",
+                "error_code": "pdf_render_timeout",
+            },
+        ),
+    )
+
+    app.add_exception_handler(
+        InvalidBatchPrint,
+        create_exception_handler(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            initial_detail={
+                "message": "Invalid Batch Print",
+                "resolution": "Please give a list or a range of valid numbers within the limit",
+                "error_code": "invalid_batch_print",
+            },
+        ),
+    )
+
+    app.add_exception_handler(
+        PasswordPoolBusy,
+        create_exception_handler(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            initial_detail={
+                "message": "Server Busy",
+                "resolution": "Too many users are signing in, please try again in a moment",
+                "error_code": "password_pool_busy",
+            },
+        ),
+    )
+
     # @app.exception_handler(500)
     # async def internal_server_error(request, exc):
     #     return JSONResponse(
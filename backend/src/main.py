@@ -1,10 +1,14 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.responses import FileResponse
 
+from auth.password_pool import password_pool
 from auth.routes import auth_router
 from challan.routes_smart import challan_smart_router
 from challan.routes_unique import challan_unique_router
 from complaint_number.routes import complaint_number_router
+from db.routes import db_router
 from exceptions import register_exceptions
 from master.routes import master_router
 from menu.routes import menu_router
@@ -16,13 +20,29 @@ from rewinding_rate.routes import rewinding_rate_router
 from service_center.routes import service_center_router
 from service_charge.routes import service_charge_router
 from user.routes import user_router
+from utils.pdf_renderer import pdf_renderer
+from utils.pdf_templates import pdf_templates
+from utils.responses import FastJSONResponse
 from vendor.routes import vendor_router
 from warranty.routes import warranty_router
 from cg_srf_number.routes import cg_srf_number_router
 
 version = "v1"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Parse and validate every PDF template before serving requests
+    pdf_templates.load_all()
+    pdf_renderer.start()
+    yield
+    pdf_renderer.shutdown()
+    password_pool.shutdown()
+
+
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     version=version,
     title="Smart Enterprise",
     description="Smart Enterprise Management System",
@@ -97,4 +117,5 @@ app.include_router(
 )
 app.include_router(
     cg_srf_number_router, prefix="/cg_srf_number", tags=["CG SRF Number"]
-)
\ No newline at end of file
+)
+app.include_router(db_router, prefix="/db", tags=["Database"])
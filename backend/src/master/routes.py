@@ -1,10 +1,11 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from auth.dependencies import AccessTokenBearer
+from counter.service import ListVersionService
 from db.db import get_session
 from exceptions import MasterNotFound
 from master.schemas import (
@@ -16,9 +17,11 @@ from master.schemas import (
     UpdateMaster,
 )
 from master.service import MasterService
+from utils.responses import versioned_list_response
 
 master_router = APIRouter()
 master_service = MasterService()
+list_version_service = ListVersionService()
 access_token_bearer = AccessTokenBearer()
 
 """
@@ -56,10 +59,14 @@ List all master names.
 
 @master_router.get("/list_names", response_model=List, status_code=status.HTTP_200_OK)
 async def list_master_names(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
-    names = await master_service.list_master_names(session)
-    return names
+    etag = await list_version_service.etag("master_names", session)
+    return await versioned_list_response(
+        request, etag, lambda: master_service.list_master_names(session)
+    )
 
 
 """
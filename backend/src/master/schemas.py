@@ -2,16 +2,18 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from utils.schema_types import Upper
+
 
 class CreateMaster(BaseModel):
-    name: str = Field(..., min_length=3, max_length=40)
-    address: str = Field(..., max_length=40)
-    city: str = Field(..., max_length=20)
-    pin: Optional[str] = Field(None, pattern=r"^\d{6}$")
-    contact1: str = Field(..., min_length=10, max_length=10, pattern=r"^\d{10}$")
-    contact2: Optional[str] = Field(None, pattern=r"^\d{10}$")
-    gst: Optional[str] = Field(None, pattern=r"^[A-Z0-9]{15}$")
-    remark: Optional[str] = Field(None, max_length=50)
+    name: Upper = Field(..., min_length=3, max_length=40)
+    address: Upper = Field(..., max_length=40)
+    city: Upper = Field(..., max_length=20)
+    pin: Optional[Upper] = Field(None, pattern=r"^\d{6}$")
+    contact1: Upper = Field(..., min_length=10, max_length=10, pattern=r"^\d{10}$")
+    contact2: Optional[Upper] = Field(None, pattern=r"^\d{10}$")
+    gst: Optional[Upper] = Field(None, pattern=r"^[A-Z0-9]{15}$")
+    remark: Optional[Upper] = Field(None, max_length=50)
 
 
 class MasterResponse(BaseModel):
@@ -31,11 +33,11 @@ class UpdateMaster(CreateMaster):
 
 
 class MasterCode(BaseModel):
-    code: str
+    code: Upper
 
 
 class MasterName(BaseModel):
-    name: str
+    name: Upper
 
 
 class MasterAddress(BaseModel):
@@ -2,45 +2,46 @@ from sqlalchemy import func, select, union_all
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from counter.service import CounterService, ListVersionService
 from exceptions import (
     CannotChangeMasterName,
     IncorrectCodeFormat,
     MasterAlreadyExists,
     MasterNotFound,
 )
+from menu.cache import dashboard_cache
+from utils.entity_loader import entity_loader
 
 from .models import Master
 from .schemas import CreateMaster, UpdateMaster
 
+counter_service = CounterService()
+list_version_service = ListVersionService()
+
 
 class MasterService:
 
     async def create_master(
         self, session: AsyncSession, master: CreateMaster, token: dict
     ):
-        for _ in range(3):  # Retry up to 3 times
-            master_data_dict = master.model_dump()
-            master_data_dict["code"] = await self.master_next_code(session)
-            if await self.check_master_name_available(master.name, session):
-                raise MasterAlreadyExists()
-            master_data_dict["created_by"] = token["user"]["username"]
-            new_master = Master(**master_data_dict)
-            session.add(new_master)
-            try:
-                await session.commit()
-                return new_master
-            except IntegrityError:
-                await session.rollback()
+        if await self.check_master_name_available(master.name, session):
+            raise MasterAlreadyExists()
+        master_data_dict = master.model_dump()
+        master_data_dict["code"] = await counter_service.next_code("C", 4, session)
+        master_data_dict["created_by"] = token["user"]["username"]
+        new_master = Master(**master_data_dict)
+        session.add(new_master)
+        try:
+            await list_version_service.bump("master_names", session)
+            await session.commit()
+            dashboard_cache.invalidate("master")
+        except IntegrityError:
+            await session.rollback()
             raise MasterAlreadyExists()
+        return new_master
 
     async def master_next_code(self, session: AsyncSession):
-        statement = select(Master.code).order_by(Master.code.desc()).limit(1)
-        result = await session.execute(statement)
-        last_code = result.scalar()
-        last_number = last_code[1:] if last_code else "0"
-        next_code = int(last_number) + 1
-        next_code = "C" + str(next_code).zfill(4)
-        return next_code
+        return await counter_service.peek_next_code("C", 4, session)
 
     async def check_master_name_available(
         self, name: str, session: AsyncSession
@@ -64,18 +65,14 @@ class MasterService:
             code = "C" + code.zfill(4)
         if not code.startswith("C") or not code[1:].isdigit():
             raise IncorrectCodeFormat()
-        statement = select(Master).where(Master.code == code)
-        result = await session.execute(statement)
-        master = result.scalars().first()
+        master = await entity_loader(session).load(Master.code, code)
         if master:
             return master
         else:
             raise MasterNotFound()
 
     async def get_master_by_name(self, name: str, session: AsyncSession):
-        statement = select(Master).where(Master.name == name)
-        result = await session.execute(statement)
-        master = result.scalars().first()
+        master = await entity_loader(session).load(Master.name, name)
         if master:
             return master
         else:
@@ -107,6 +104,12 @@ class MasterService:
 
     async def get_master_details(self, code: str, session: AsyncSession):
         master = await self.get_master_by_code(code, session)
+        return self.master_details(master)
+
+    def master_details(self, master: Master):
+        """
+        Print details of an already loaded master row.
+        """
         full_address = master.address + ", " + master.city
         if master.pin:
             full_address += " - " + master.pin
@@ -0,0 +1,62 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config import Config
+
+
+class DashboardCache:
+    """
+    In-memory cache of dashboard sections with a TTL.
+    Write paths call invalidate() for the sections they affect, and concurrent
+    misses for one section share a single recomputation.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[str, tuple] = {}  # section -> (expires_at, value)
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._versions: Dict[str, int] = {}
+
+    def get(self, section: str) -> Optional[Any]:
+        entry = self._entries.get(section)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def invalidate(self, *sections: str) -> None:
+        for section in sections:
+            self._entries.pop(section, None)
+            # A recomputation already running started before this write,
+            # so its result must not be stored
+            self._versions[section] = self._versions.get(section, 0) + 1
+            self._pending.pop(section, None)
+
+    async def get_or_compute(
+        self, section: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        value = self.get(section)
+        if value is not None:
+            return value
+        task = self._pending.get(section)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(section, compute))
+            self._pending[section] = task
+        # Shield so one cancelled request does not cancel the shared task
+        return await asyncio.shield(task)
+
+    async def _compute(
+        self, section: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        version = self._versions.get(section, 0)
+        try:
+            value = await compute()
+        finally:
+            if self._pending.get(section) is asyncio.current_task():
+                self._pending.pop(section, None)
+        if self._versions.get(section, 0) == version:
+            self._entries[section] = (time.monotonic() + self.ttl, value)
+        return value
+
+
+dashboard_cache = DashboardCache(ttl=Config.DASHBOARD_CACHE_TTL)
@@ -3,12 +3,10 @@ import json
 import os
 
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse
-from sqlmodel.ext.asyncio.session import AsyncSession
 
 from auth.dependencies import AccessTokenBearer
-from db.db import get_session
 from menu.service import MenuService
+from utils.responses import FastJSONResponse
 
 menu_router = APIRouter()
 menu_service = MenuService()
@@ -32,17 +30,16 @@ Returns dashboard data:
 
 
 @menu_router.get("/dashboard", status_code=status.HTTP_200_OK)
-async def get_dashboard_data(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
-):
-    # Use the grouped service methods (these each make multiple internal queries
-    # but significantly reduce number of round-trips overall).
-    master = await menu_service.master_overview(session)
-    retail = await menu_service.retail_overview(session)
-    challan = await menu_service.challan_overview(session)
-    warranty = await menu_service.warranty_overview(session)
-    ow = await menu_service.out_of_warranty_overview(session)
-    vendor = await menu_service.vendor_overview(session)
+async def get_dashboard_data(_=Depends(access_token_bearer)):
+    # Each group runs concurrently on its own pooled session, so the latency is
+    # roughly that of the slowest group.
+    overview = await menu_service.dashboard_overview()
+    master = overview["master"]
+    retail = overview["retail"]
+    challan = overview["challan"]
+    warranty = overview["warranty"]
+    ow = overview["out_of_warranty"]
+    vendor = overview["vendor"]
 
     number_of_customers = master["master_count"]
     number_of_asc_names = master["asc_count"]
@@ -96,4 +93,4 @@ async def get_dashboard_data(
             "out_of_warranty_count": ((ow_count // 10) * 10),
         },
     }
-    return JSONResponse(content=dashboard_data)
+    return FastJSONResponse(content=dashboard_data)
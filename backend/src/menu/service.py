@@ -1,11 +1,17 @@
+import asyncio
 from datetime import date, timedelta
+from functools import partial
+from typing import Optional
 
-from sqlalchemy import case, func, literal, select, union_all
+from sqlalchemy import case, func, literal, select, text, union_all
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from challan.models_smart import ChallanSmart
 from challan.models_unique import ChallanUnique
+from db.db import async_session_maker
 from master.models import Master
+from menu.cache import dashboard_cache
 from out_of_warranty.models import OutOfWarranty
 from retail.models import Retail
 from service_center.models import ServiceCentre
@@ -14,6 +20,66 @@ from warranty.models import Warranty
 
 class MenuService:
 
+    # ---------------------------
+    # DASHBOARD — ALL GROUPS IN PARALLEL
+    # ---------------------------
+    async def dashboard_overview(self):
+        """
+        Returns every overview group keyed by group name.
+        Fresh groups come from the dashboard cache. Stale groups run
+        concurrently, each on its own pooled session, reading from one exported
+        snapshot so the figures agree with each other.
+        """
+        groups = {
+            "master": self.master_overview,
+            "retail": self.retail_overview,
+            "challan": self.challan_overview,
+            "warranty": self.warranty_overview,
+            "out_of_warranty": self.out_of_warranty_overview,
+            "vendor": self.vendor_overview,
+        }
+        cached = {name: dashboard_cache.get(name) for name in groups}
+        if all(value is not None for value in cached.values()):
+            return cached
+        # The exporting transaction must stay open while the others import it
+        async with async_session_maker() as snapshot_session:
+            snapshot_id = await self._export_snapshot(snapshot_session)
+            results = await asyncio.gather(
+                *[
+                    dashboard_cache.get_or_compute(
+                        name, partial(self._run_group, group, snapshot_id)
+                    )
+                    for name, group in groups.items()
+                ]
+            )
+        return dict(zip(groups.keys(), results))
+
+    async def _export_snapshot(self, session: AsyncSession) -> Optional[str]:
+        try:
+            await session.connection(
+                execution_options={"isolation_level": "REPEATABLE READ"}
+            )
+            return (await session.execute(text("SELECT pg_export_snapshot()"))).scalar()
+        except DBAPIError:
+            await session.rollback()
+            return None
+
+    async def _run_group(self, group, snapshot_id: Optional[str]):
+        async with async_session_maker() as session:
+            if snapshot_id:
+                await session.connection(
+                    execution_options={"isolation_level": "REPEATABLE READ"}
+                )
+                # Snapshot ids are server generated; SET does not accept binds
+                try:
+                    await session.execute(
+                        text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'")
+                    )
+                except DBAPIError:
+                    # The exporting transaction already ended
+                    await session.rollback()
+            return await group(session)
+
     # ---------------------------
     # GROUP 1 — MASTER + ASC + TOP CUSTOMERS
     # ---------------------------
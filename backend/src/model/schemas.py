@@ -2,10 +2,12 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from utils.schema_types import Upper
+
 
 class ModelRequest(BaseModel):
-    division: str
-    model: str
+    division: Upper
+    model: Upper
 
 
 class RewindingCharge(BaseModel):
@@ -16,16 +18,16 @@ class RewindingCharge(BaseModel):
 
 
 class CreateModel(BaseModel):
-    model: str = Field(..., max_length=30)
-    division: str = Field(..., max_length=15)
-    frame: Optional[str] = Field(..., max_length=10)
-    winding_type: Optional[str] = Field(..., max_length=15)
+    model: Upper = Field(..., max_length=30)
+    division: Upper = Field(..., max_length=15)
+    frame: Optional[Upper] = Field(..., max_length=10)
+    winding_type: Optional[Upper] = Field(..., max_length=15)
     hp_rating: Optional[float]
     rewinding_charge: int
 
 
 class ModelList(BaseModel):
-    division: str
+    division: Upper
 
 
 class CostDetails(BaseModel):
@@ -0,0 +1,56 @@
+from functools import partial
+from typing import Dict, List
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from utils.pdf_layout import draw_table
+from utils.pdf_templates import pdf_templates
+
+
+def _draw_overlay(
+    can: canvas.Canvas, header: Dict[str, str], rows: List[List[str]]
+) -> None:
+    width, height = A4
+
+    can.setFont("Helvetica-Bold", 10)
+    can.drawString(110, 736, header["srf_no"])
+    can.drawString(480, 736, header["srf_date"])
+    can.drawString(300, 736, header["code"])
+    can.drawString(190, 680, header["name"])
+    can.drawString(190, 655, header["address"])
+    can.drawString(190, 630, header["contact1"])
+    can.drawString(475, 630, header["gst"])
+    can.drawString(410, 140, header["received_by"])
+
+    columns = [
+        {"x": 10, "width": 20},
+        {"x": 40, "width": 50},
+        {"x": 105, "width": 95},
+        {"x": 210, "width": 75},
+        {"x": 290, "width": 110},
+        {"x": 405, "width": 110},
+        {"x": 520, "width": 60},
+    ]
+    draw_table(
+        can,
+        columns,
+        rows,
+        y=556,
+        font="Helvetica",
+        font_size=9,
+        line_spacing=8,
+        min_row_height=16,
+        row_padding=7,
+        page_break_below=100,
+        page_top=height - 50,
+    )
+
+
+def render_out_of_warranty_srf(header: Dict[str, str], rows: List[List[str]]) -> bytes:
+    """
+    Renders the out of warranty SRF over its template. Both pages carry the
+    same overlay, so it is drawn once.
+    """
+    draw = partial(_draw_overlay, header=header, rows=rows)
+    return pdf_templates.render("out_of_warranty_srf", [draw, draw])
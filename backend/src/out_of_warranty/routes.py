@@ -1,17 +1,19 @@
 from datetime import date
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from auth.dependencies import AccessTokenBearer, RoleChecker
+from config import Config
 from db.db import get_session
-from exceptions import OutOfWarrantyNotFound
+from exceptions import InvalidCursor, OutOfWarrantyNotFound
 from out_of_warranty.schemas import (
     OutOfWarrantyCreate,
-    OutOfWarrantyEnquiry,
+    OutOfWarrantyEnquiryPage,
     OutOfWarrantyPending,
+    OutOfWarrantySRFBatchPrint,
     OutOfWarrantySRFNumber,
     OutOfWarrantySRFNumberList,
     OutOfWarrantySRFSettleRecord,
@@ -20,7 +22,10 @@ from out_of_warranty.schemas import (
     UpdateSRFFinalSettlement,
     UpdateSRFUnsettled,
 )
-from out_of_warranty.service import OutOfWarrantyService
+from out_of_warranty.service import ENQUIRY_EXPORT_COLUMNS, OutOfWarrantyService
+from utils.export_utils import export_response
+from utils.pdf_cache import pdf_response
+from utils.responses import list_response
 
 out_of_warranty_router = APIRouter()
 out_of_warranty_service = OutOfWarrantyService()
@@ -74,10 +79,12 @@ List all prending out of Out Of Warranty records.
     status_code=status.HTTP_200_OK,
 )
 async def list_out_of_warranty_pending(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
     pending = await out_of_warranty_service.list_out_of_warranty_pending(session)
-    return pending
+    return list_response(request, pending, len(pending))
 
 
 """
@@ -152,32 +159,45 @@ Print srf by srf number.
 
 @out_of_warranty_router.post("/srf_print", status_code=status.HTTP_200_OK)
 async def print_srf(
+    request: Request,
     data: OutOfWarrantySRFNumber,
     session: AsyncSession = Depends(get_session),
     token=Depends(access_token_bearer),
 ):
     srf_pdf = await out_of_warranty_service.print_srf(data.srf_number, token, session)
-    return StreamingResponse(
-        srf_pdf,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="{data.srf_number}.pdf"'
-        },
-    )
+    return pdf_response(request, srf_pdf, f"{data.srf_number}.pdf")
 
 
 """
-OutOfWarranty enquiry using query parameters.
+Print several srfs, by list or from/to range, as one PDF.
+"""
+
+
+@out_of_warranty_router.post("/srf_print_batch", status_code=status.HTTP_200_OK)
+async def print_srf_batch(
+    request: Request,
+    data: OutOfWarrantySRFBatchPrint,
+    session: AsyncSession = Depends(get_session),
+    token=Depends(access_token_bearer),
+):
+    srf_pdf = await out_of_warranty_service.print_srf_batch(data, token, session)
+    return pdf_response(request, srf_pdf, "srf_batch.pdf")
+
+
+"""
+OutOfWarranty enquiry using query parameters, one page at a time.
+Pass next_cursor back as cursor to fetch the following page.
 
  """
 
 
 @out_of_warranty_router.get(
     "/enquiry",
-    response_model=List[OutOfWarrantyEnquiry],
+    response_model=OutOfWarrantyEnquiryPage,
     status_code=status.HTTP_200_OK,
 )
 async def enquiry_out_of_warranty(
+    request: Request,
     final_status: Optional[str] = None,
     final_settled: Optional[str] = None,
     vendor_settled: Optional[str] = None,
@@ -189,27 +209,79 @@ async def enquiry_out_of_warranty(
     repaired: Optional[str] = None,
     challaned: Optional[str] = None,
     delivered: Optional[str] = None,
+    limit: int = Query(Config.ENQUIRY_PAGE_SIZE, ge=1, le=Config.ENQUIRY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    with_total: bool = False,
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
     try:
         result = await out_of_warranty_service.enquiry_out_of_warranty(
             session,
-            final_status,
-            name,
-            division,
-            from_srf_date,
-            to_srf_date,
-            estimated,
-            final_settled,
-            vendor_settled,
-            challaned,
-            delivered,
-            repaired,
+            final_status=final_status,
+            name=name,
+            division=division,
+            from_srf_date=from_srf_date,
+            to_srf_date=to_srf_date,
+            estimated=estimated,
+            final_settled=final_settled,
+            challaned=challaned,
+            vendor_settled=vendor_settled,
+            delivered=delivered,
+            repaired=repaired,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
         )
-        return result
+        return list_response(request, result, len(result.items))
+    except InvalidCursor:
+        raise
     except:
-        return []
+        # An empty later page would pass for the end of the list
+        if cursor:
+            raise
+        return OutOfWarrantyEnquiryPage(items=[])
+
+
+"""
+Export every out of warranty record matching the enquiry filters as CSV or
+XLSX, streamed as the rows are read.
+
+ """
+
+
+@out_of_warranty_router.get("/enquiry_export", status_code=status.HTTP_200_OK)
+async def export_out_of_warranty(
+    final_status: Optional[str] = None,
+    final_settled: Optional[str] = None,
+    vendor_settled: Optional[str] = None,
+    name: Optional[str] = None,
+    division: Optional[str] = None,
+    from_srf_date: Optional[date] = None,
+    to_srf_date: Optional[date] = None,
+    estimated: Optional[str] = None,
+    repaired: Optional[str] = None,
+    challaned: Optional[str] = None,
+    delivered: Optional[str] = None,
+    file_format: Literal["csv", "xlsx"] = "csv",
+    _=Depends(access_token_bearer),
+):
+    rows = out_of_warranty_service.export_out_of_warranty(
+        final_status=final_status,
+        name=name,
+        division=division,
+        from_srf_date=from_srf_date,
+        to_srf_date=to_srf_date,
+        estimated=estimated,
+        final_settled=final_settled,
+        challaned=challaned,
+        vendor_settled=vendor_settled,
+        delivered=delivered,
+        repaired=repaired,
+    )
+    return export_response(
+        "out_of_warranty_enquiry", ENQUIRY_EXPORT_COLUMNS, rows, file_format
+    )
 
 
 """
@@ -223,10 +295,12 @@ List all unsettled srf records.
     status_code=status.HTTP_200_OK,
 )
 async def list_srf_unsettled(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
     unsettled = await out_of_warranty_service.list_srf_not_settled(session)
-    return unsettled
+    return list_response(request, unsettled, len(unsettled))
 
 
 """
@@ -242,8 +316,10 @@ async def update_srf_unsettled(
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
-    await out_of_warranty_service.update_srf_unsettled(list_srf, session)
-    return JSONResponse(content={"message": f"SRF Records Proposed for Settlement"})
+    missing = await out_of_warranty_service.update_srf_unsettled(list_srf, session)
+    return JSONResponse(
+        content={"message": f"SRF Records Proposed for Settlement", "missing": missing}
+    )
 
 
 """
@@ -258,10 +334,12 @@ List all final srf settlement records
     dependencies=[role_checker],
 )
 async def list_final_srf_settlement(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
     final_settlement = await out_of_warranty_service.list_final_srf_settlement(session)
-    return final_settlement
+    return list_response(request, final_settlement, len(final_settlement))
 
 
 """
@@ -279,5 +357,9 @@ async def update_final_srf_settlement(
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
-    await out_of_warranty_service.update_final_srf_settlement(list_srf, session)
-    return JSONResponse(content={"message": f"Vendor Records Settled"})
+    missing = await out_of_warranty_service.update_final_srf_settlement(
+        list_srf, session
+    )
+    return JSONResponse(
+        content={"message": f"Vendor Records Settled", "missing": missing}
+    )
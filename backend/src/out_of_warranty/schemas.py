@@ -7,24 +7,26 @@ from pydantic import BaseModel, Field
 from sqlalchemy import ForeignKey
 from sqlmodel import Column, Field, SQLModel
 
+from utils.schema_types import Upper
+
 
 class OutOfWarrantyCreate(BaseModel):
-    srf_number: str = Field(..., max_length=8)
-    name: str = Field(..., max_length=30)
-    customer_challan_number: str = Field(..., max_length=6)
+    srf_number: Upper = Field(..., max_length=8)
+    name: Upper = Field(..., max_length=30)
+    customer_challan_number: Upper = Field(..., max_length=6)
     customer_challan_date: date
-    division: str = Field(..., max_length=15)
-    head: str = Field(..., max_length=15)
+    division: Upper = Field(..., max_length=15)
+    head: Upper = Field(..., max_length=15)
     srf_date: date
-    model: str = Field(..., max_length=30)
-    serial_number: str = Field(..., max_length=15)
-    problem: str = Field(None, max_length=30)
-    complaint_number: Optional[str] = Field(None, max_length=20)
-    remark: Optional[str] = Field(None, max_length=40)
+    model: Upper = Field(..., max_length=30)
+    serial_number: Upper = Field(..., max_length=15)
+    problem: Upper = Field(None, max_length=30)
+    complaint_number: Optional[Upper] = Field(None, max_length=20)
+    remark: Optional[Upper] = Field(None, max_length=40)
     service_charge: int
-    service_charge_waive: str = Field(..., max_length=1)
+    service_charge_waive: Upper = Field(..., max_length=1)
     collection_date: Optional[date]
-    waive_details: Optional[str] = Field(None, max_length=40)
+    waive_details: Optional[Upper] = Field(None, max_length=40)
 
 
 class OutOfWarrantyPending(BaseModel):
@@ -33,7 +35,13 @@ class OutOfWarrantyPending(BaseModel):
 
 
 class OutOfWarrantySRFNumber(BaseModel):
-    srf_number: str
+    srf_number: Upper
+
+
+class OutOfWarrantySRFBatchPrint(BaseModel):
+    srf_numbers: List[Upper] = []
+    from_srf_number: Optional[Upper] = None
+    to_srf_number: Optional[Upper] = None
 
 
 class OutOfWarrantyUpdateResponse(BaseModel):
@@ -99,9 +107,9 @@ class OutOfWarrantyUpdate(BaseModel):
     vendor_cost1: Optional[float]
     vendor_cost2: Optional[float]
     estimate_date: Optional[date]
-    vendor_paint: str
-    vendor_stator: str
-    vendor_leg: str
+    vendor_paint: Upper
+    vendor_stator: Upper
+    vendor_leg: Upper
     vendor_paint_cost: Optional[int]
     paint_cost: Optional[int]
     vendor_stator_cost: Optional[int]
@@ -112,24 +120,24 @@ class OutOfWarrantyUpdate(BaseModel):
     repair_date: Optional[date]
     rewinding_cost: Optional[float]
     other_cost: Optional[float]
-    work_done: Optional[str] = Field(None, max_length=50)
-    spare1: Optional[str] = Field(None, max_length=20)
+    work_done: Optional[Upper] = Field(None, max_length=50)
+    spare1: Optional[Upper] = Field(None, max_length=20)
     cost1: Optional[float]
-    spare2: Optional[str] = Field(None, max_length=20)
+    spare2: Optional[Upper] = Field(None, max_length=20)
     cost2: Optional[float]
-    spare3: Optional[str] = Field(None, max_length=20)
+    spare3: Optional[Upper] = Field(None, max_length=20)
     cost3: Optional[float]
-    spare4: Optional[str] = Field(None, max_length=20)
+    spare4: Optional[Upper] = Field(None, max_length=20)
     cost4: Optional[float]
-    spare5: Optional[str] = Field(None, max_length=20)
+    spare5: Optional[Upper] = Field(None, max_length=20)
     cost5: Optional[float]
-    spare6: Optional[str] = Field(None, max_length=20)
+    spare6: Optional[Upper] = Field(None, max_length=20)
     cost6: Optional[float]
     spare_cost: Optional[float]
     godown_cost: Optional[float]
     discount: Optional[float]
     total: Optional[float]
-    gst: str = Field(..., max_length=1)
+    gst: Upper = Field(..., max_length=1)
     gst_amount: Optional[float]
     round_off: Optional[float]
     final_amount: Optional[float]
@@ -137,7 +145,7 @@ class OutOfWarrantyUpdate(BaseModel):
     delivery_date: Optional[date]
     pc_number: Optional[int]
     invoice_number: Optional[int]
-    final_status: str = Field(..., max_length=1)
+    final_status: Upper = Field(..., max_length=1)
 
 
 class OutOfWarrantySRFSettleRecord(BaseModel):
@@ -154,13 +162,13 @@ class OutOfWarrantySRFSettleRecord(BaseModel):
 
 
 class UpdateSRFUnsettled(BaseModel):
-    srf_number: str
+    srf_number: Upper
     settlement_date: date
 
 
 class UpdateSRFFinalSettlement(BaseModel):
-    srf_number: str
-    final_settled: str = Field(..., max_length=1)
+    srf_number: Upper
+    final_settled: Upper = Field(..., max_length=1)
 
 
 class OutOfWarrantyEnquiry(BaseModel):
@@ -177,6 +185,12 @@ class OutOfWarrantyEnquiry(BaseModel):
     contact2: Optional[str]
 
 
+class OutOfWarrantyEnquiryPage(BaseModel):
+    items: List[OutOfWarrantyEnquiry]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
 class OutOfWarrantyEstimatePrintResponse(BaseModel):
     srf_number: str
     srf_date: str
@@ -1,25 +1,26 @@
-import io
-import os
 from datetime import date, datetime, timedelta
-from typing import List, Optional
+from itertools import groupby
+from typing import AsyncIterator, List, Optional
 
-from PyPDF2 import PdfReader, PdfWriter
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfbase.pdfmetrics import stringWidth
-from reportlab.pdfgen import canvas
 from sqlalchemy import case, func, select
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from config import Config
+from counter.service import CounterService
+from db.db import async_session_maker
 from exceptions import IncorrectCodeFormat, ModelNotFound, OutOfWarrantyNotFound
 from master.models import Master
 from master.service import MasterService
+from menu.cache import dashboard_cache
 from model.service import ModelService
 from out_of_warranty.models import OutOfWarranty
+from out_of_warranty.pdf import render_out_of_warranty_srf
 from out_of_warranty.schemas import (
     OutOfWarrantyCreate,
     OutOfWarrantyEnquiry,
+    OutOfWarrantyEnquiryPage,
     OutOfWarrantyPending,
+    OutOfWarrantySRFBatchPrint,
     OutOfWarrantySRFNumber,
     OutOfWarrantySRFNumberList,
     OutOfWarrantySRFSettleRecord,
@@ -28,35 +29,40 @@ from out_of_warranty.schemas import (
     UpdateSRFFinalSettlement,
     UpdateSRFUnsettled,
 )
-from utils.date_utils import format_date_ddmmyyyy, parse_date
-from utils.file_utils import safe_join, split_text_to_lines
+from utils.date_utils import (
+    format_date_ddmmyyyy,
+    parse_date,
+    sql_format_date_ddmmyyyy,
+)
+from utils.batch_print import batch_filter, render_batch
+from utils.bulk_update import bulk_update
+from utils.entity_loader import entity_loader
+from utils.pagination import paginate
+from utils.pdf_cache import RenderedPdf, pdf_cache
 
 master_service = MasterService()
 model_service = ModelService()
+counter_service = CounterService()
+
+ENQUIRY_EXPORT_COLUMNS = [
+    "SRF Number",
+    "SRF Date",
+    "Name",
+    "Model",
+    "Estimate Date",
+    "Repair Date",
+    "Challan Date",
+    "Delivery Date",
+    "Final Amount",
+    "Contact 1",
+    "Contact 2",
+]
 
 
 class OutOfWarrantyService:
 
     async def get_next_base_number(self, session: AsyncSession) -> int:
-        statement = select(OutOfWarranty.srf_number)
-        result = await session.execute(statement)
-        srf_numbers = [
-            row[0]
-            for row in result.fetchall()
-            if row[0] and row[0].startswith("S") and "/" in row[0]
-        ]
-        base_numbers = []
-        for srf in srf_numbers:
-            base, _ = srf.split("/")
-            try:
-                base_num = int(base[1:])
-                base_numbers.append(base_num)
-            except ValueError:
-                continue
-        if base_numbers:
-            return max(base_numbers) + 1
-        else:
-            return 1
+        return await counter_service.next_number("S", session)
 
     async def create_out_of_warranty(
         self, session: AsyncSession, out_of_warranty: OutOfWarrantyCreate, token: dict
@@ -74,63 +80,38 @@ class OutOfWarrantyService:
             ):
                 raise ModelNotFound()
 
-        # If frontend requests a new base, generate next base number
-        base_part = parts[0]
-        if base_part == "NEW":
-            for _ in range(3):  # Retry up to 3 times
-                next_base = await self.get_next_base_number(session)
-                srf_number = f"S{str(next_base).zfill(5)}/1"
-                out_of_warranty_dict = out_of_warranty.model_dump()
-                out_of_warranty_dict["srf_number"] = srf_number
-                master = await master_service.get_master_by_name(
-                    out_of_warranty.name, session
+        out_of_warranty_dict = out_of_warranty.model_dump()
+        master = await master_service.get_master_by_name(out_of_warranty.name, session)
+        out_of_warranty_dict["created_by"] = token["user"]["username"]
+        out_of_warranty_dict["code"] = master.code
+        for date_field in ["srf_date", "collection_date", "customer_challan_date"]:
+            if date_field in out_of_warranty_dict:
+                out_of_warranty_dict[date_field] = parse_date(
+                    out_of_warranty_dict[date_field]
                 )
-                out_of_warranty_dict["created_by"] = token["user"]["username"]
-                out_of_warranty_dict["code"] = master.code
-                for date_field in [
-                    "srf_date",
-                    "collection_date",
-                    "customer_challan_date",
-                ]:
-                    if date_field in out_of_warranty_dict:
-                        out_of_warranty_dict[date_field] = parse_date(
-                            out_of_warranty_dict[date_field]
-                        )
-                out_of_warranty_dict.pop("name", None)
-                new_out_of_warranty = OutOfWarranty(**out_of_warranty_dict)
-                session.add(new_out_of_warranty)
-                try:
-                    await session.commit()
-                    return new_out_of_warranty
-                except IntegrityError:
-                    await session.rollback()
-        else:
-            # Use the base provided by frontend, just validate sub-number
-            out_of_warranty_dict = out_of_warranty.model_dump()
-            master = await master_service.get_master_by_name(
-                out_of_warranty.name, session
-            )
-            out_of_warranty_dict["created_by"] = token["user"]["username"]
-            out_of_warranty_dict["code"] = master.code
-            for date_field in ["srf_date", "collection_date", "customer_challan_date"]:
-                if date_field in out_of_warranty_dict:
-                    out_of_warranty_dict[date_field] = parse_date(
-                        out_of_warranty_dict[date_field]
-                    )
-            out_of_warranty_dict.pop("name", None)
-            new_out_of_warranty = OutOfWarranty(**out_of_warranty_dict)
-            session.add(new_out_of_warranty)
-            await session.commit()
-            return new_out_of_warranty
+        out_of_warranty_dict.pop("name", None)
+
+        # If frontend requests a new base, allocate the next base number,
+        # otherwise use the base provided by frontend
+        if parts[0] == "NEW":
+            next_base = await self.get_next_base_number(session)
+            out_of_warranty_dict["srf_number"] = f"S{str(next_base).zfill(5)}/1"
+
+        new_out_of_warranty = OutOfWarranty(**out_of_warranty_dict)
+        session.add(new_out_of_warranty)
+        await session.commit()
+        dashboard_cache.invalidate("out_of_warranty", "master")
+        return new_out_of_warranty
 
     async def warranty_next_code(self, session: AsyncSession):
-        next_base_number = await self.get_next_base_number(session)
-        next_srf_number = "S" + str(next_base_number).zfill(5)
-        return next_srf_number
+        return await counter_service.peek_next_code("S", 5, session)
 
     async def list_out_of_warranty_pending(self, session: AsyncSession):
         statement = (
-            select(OutOfWarranty, Master)
+            select(
+                OutOfWarranty.srf_number,
+                Master.name,
+            )
             .join(Master, OutOfWarranty.code == Master.code)
             .where(OutOfWarranty.final_status == "N")
             .order_by(OutOfWarranty.srf_number)
@@ -139,8 +120,8 @@ class OutOfWarrantyService:
         rows = result.all()
         return [
             OutOfWarrantyPending(
-                srf_number=row.OutOfWarranty.srf_number,
-                name=row.Master.name,
+                srf_number=row.srf_number,
+                name=row.name,
             )
             for row in rows
         ]
@@ -164,6 +145,10 @@ class OutOfWarrantyService:
         result = await session.execute(statement)
         row = result.first()
         if row:
+            # update_out_of_warranty loads the same record next
+            entity_loader(session).prime(
+                OutOfWarranty.srf_number, srf_number, row.OutOfWarranty
+            )
             return OutOfWarrantyUpdateResponse(
                 srf_number=row.OutOfWarranty.srf_number,
                 srf_date=format_date_ddmmyyyy(row.OutOfWarranty.srf_date),
@@ -233,9 +218,11 @@ class OutOfWarrantyService:
         session: AsyncSession,
         token: dict,
     ):
-        statement = select(OutOfWarranty).where(OutOfWarranty.srf_number == srf_number)
-        result = await session.execute(statement)
-        existing_out_of_warranty = result.scalars().first()
+        existing_out_of_warranty = await entity_loader(session).load(
+            OutOfWarranty.srf_number, srf_number
+        )
+        if not existing_out_of_warranty:
+            raise OutOfWarrantyNotFound()
         # if role != ADMIN, ignore discount
         if token["user"]["role"] != "ADMIN":
             out_of_warranty.__dict__.pop("discount", None)
@@ -244,27 +231,67 @@ class OutOfWarrantyService:
         existing_out_of_warranty.updated_by = token["user"]["username"]
         session.add(existing_out_of_warranty)
         await session.commit()
+        dashboard_cache.invalidate("out_of_warranty")
         await session.refresh(existing_out_of_warranty)
         return existing_out_of_warranty
 
     async def last_srf_number(self, session: AsyncSession):
-        statement = (
-            select(OutOfWarranty.srf_number)
-            .order_by(OutOfWarranty.srf_number.desc())
-            .limit(1)
-        )
-        result = await session.execute(statement)
-        last_srf_number = result.scalar()
-        last_srf_number = last_srf_number.split("/")[0] if last_srf_number else None
-        return last_srf_number
+        return await counter_service.last_code("S", 5, session)
 
     async def print_srf(
         self, srf_number: OutOfWarrantySRFNumber, token: dict, session: AsyncSession
-    ) -> io.BytesIO:
+    ) -> RenderedPdf:
         # Query out_of_warranty and master data for SRF
         if len(srf_number) != 6:
             srf_number = "S" + srf_number.zfill(5)
-        statement = (
+        statement = self._srf_print_statement().where(
+            OutOfWarranty.srf_number.like(f"{srf_number}%")
+        )
+        result = await session.execute(statement)
+        rows = result.fetchall()
+
+        if not rows:
+            raise OutOfWarrantyNotFound()
+
+        return await pdf_cache.render(
+            render_out_of_warranty_srf,
+            *self._srf_document(rows, token["user"]["username"]),
+        )
+
+    async def print_srf_batch(
+        self, data: OutOfWarrantySRFBatchPrint, token: dict, session: AsyncSession
+    ) -> RenderedPdf:
+        """
+        Prints a list or a range of SRFs as one PDF, from a single query.
+        """
+        srf_filter = batch_filter(
+            OutOfWarranty.srf_number,
+            "S",
+            data.srf_numbers,
+            data.from_srf_number,
+            data.to_srf_number,
+            suffixed=True,
+        )
+        result = await session.execute(self._srf_print_statement().where(srf_filter))
+        rows = result.fetchall()
+
+        if not rows:
+            raise OutOfWarrantyNotFound()
+
+        received_by = token["user"]["username"]
+        srf_groups = groupby(rows, key=lambda row: row.srf_number[:6])
+        return await render_batch(
+            [
+                (
+                    render_out_of_warranty_srf,
+                    self._srf_document(list(srf_rows), received_by),
+                )
+                for _, srf_rows in srf_groups
+            ]
+        )
+
+    def _srf_print_statement(self):
+        return (
             select(
                 OutOfWarranty.srf_number,
                 OutOfWarranty.srf_date,
@@ -283,16 +310,14 @@ class OutOfWarrantyService:
                 OutOfWarranty.problem,
             )
             .join(Master, OutOfWarranty.code == Master.code)
-            .where(OutOfWarranty.srf_number.like(f"{srf_number}%"))
             .order_by(OutOfWarranty.srf_number)
         )
-        result = await session.execute(statement)
-        rows = result.fetchall()
-
-        if not rows:
-            raise OutOfWarrantyNotFound()
 
-        srf_no = srf_number[:6]
+    def _srf_document(self, rows, received_by: str):
+        """
+        Header and table rows of one SRF from its print statement rows.
+        """
+        srf_no = rows[0].srf_number[:6]
         srf_date = rows[0][1].strftime("%d-%m-%Y") if rows[0][1] else ""
         code = rows[0][7]
         name = rows[0][8]
@@ -300,142 +325,35 @@ class OutOfWarrantyService:
         address = rows[0][9] + ", " + rows[0][12] + pin
         contact1 = rows[0][10]
         gst = rows[0][11] if rows[0][11] else ""
-        received_by = token["user"]["username"]
 
-        def generate_overlay(
-            rows, srf_no, srf_date, code, name, address, contact1, gst, received_by
-        ):
-            packet = io.BytesIO()
-            can = canvas.Canvas(packet, pagesize=A4)
-            width, height = A4
-
-            can.setFont("Helvetica-Bold", 10)
-            can.drawString(110, 736, srf_no)
-            can.drawString(480, 736, srf_date)
-            can.drawString(300, 736, code)
-            can.drawString(190, 680, name)
-            can.drawString(190, 655, address)
-            can.drawString(190, 630, contact1)
-            can.drawString(475, 630, gst)
-            can.drawString(410, 140, received_by)
-
-            start_y = 556
-            y = start_y
-            line_spacing = 8
-            min_row_height = 16
-            row_padding = 7
-            columns = [
-                {"x": 10, "width": 20},
-                {"x": 40, "width": 50},
-                {"x": 105, "width": 95},
-                {"x": 210, "width": 75},
-                {"x": 290, "width": 110},
-                {"x": 405, "width": 110},
-                {"x": 520, "width": 60},
+        # Table rows: index, division, model, serial_number, problem, remark, charge
+        table_rows = [
+            [
+                str(idx),
+                row.division or "",
+                row.model or "",
+                str(row.serial_number or ""),
+                row.problem or "",
+                row.remark or "",
+                f"{row.service_charge:.2f}",
             ]
-
-            can.setFont("Helvetica", 9)
-
-            for idx, row in enumerate(rows, 1):
-                division = row[2] or ""
-                model = row[3] or ""
-                slno = row[4] or ""
-                remark = row[5] or ""
-                service_charge_raw = row[6]
-                service_charge = f"{service_charge_raw:.2f}"
-                problem = row[14] or ""
-
-                row_data = [
-                    str(idx),
-                    division,
-                    model,
-                    str(slno),
-                    problem,
-                    remark,
-                    str(service_charge),
-                ]
-
-                row_lines = []
-                for col, text in zip(columns, row_data):
-                    words = text.split()
-                    lines = []
-                    line = ""
-                    for word in words:
-                        test_line = line + (" " if line else "") + word
-                        if stringWidth(test_line, "Helvetica", 9) <= col["width"]:
-                            line = test_line
-                        else:
-                            lines.append(line)
-                            line = word
-                    if line:
-                        lines.append(line)
-                    row_lines.append(lines)
-
-                max_lines = max(len(lines) for lines in row_lines)
-                row_height = max(max_lines * line_spacing, min_row_height)
-
-                if y - row_height < 100:
-                    can.showPage()
-                    can.setFont("Helvetica", 9)
-                    y = height - 50
-
-                for col, lines in zip(columns, row_lines):
-                    total_text_height = len(lines) * line_spacing
-                    vertical_offset = (row_height - total_text_height) / 2
-
-                    for i, ln in enumerate(lines):
-                        text_width = stringWidth(ln, "Helvetica", 9)
-                        center_x = col["x"] + col["width"] / 2 - text_width / 2
-                        y_position = y - vertical_offset - (i * line_spacing)
-                        can.drawString(center_x, y_position, ln)
-
-                y -= row_height + row_padding
-
-            can.save()
-            packet.seek(0)
-            return PdfReader(packet)
-
-        # Create overlays
-        overlay_customer = generate_overlay(
-            rows, srf_no, srf_date, code, name, address, contact1, gst, received_by
-        )
-        overlay_asc = generate_overlay(
-            rows, srf_no, srf_date, code, name, address, contact1, gst, received_by
-        )
-
-        # Path to the static PDF template (use absolute path for portability, with path injection protection)
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        static_dir = os.path.normpath(os.path.join(base_dir, "..", "static"))
-        template_path = safe_join(static_dir, "out_of_warranty_srf.pdf")
-
-        # Read the template PDF
-        try:
-            with open(template_path, "rb") as f:
-                template_bytes = f.read()
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Template PDF not found at {template_path}")
-        template_buffer = io.BytesIO(template_bytes)
-        template_pdf = PdfReader(template_buffer)
-
-        # Merge overlays
-        writer = PdfWriter()
-        page1 = template_pdf.pages[0]
-        page1.merge_page(overlay_customer.pages[0])
-        writer.add_page(page1)
-
-        if len(template_pdf.pages) > 1:
-            page2 = template_pdf.pages[1]
-            page2.merge_page(overlay_asc.pages[0])
-            writer.add_page(page2)
-
-        output_stream = io.BytesIO()
-        writer.write(output_stream)
-        output_stream.seek(0)
-        return output_stream
-
-    async def enquiry_out_of_warranty(
+            for idx, row in enumerate(rows, 1)
+        ]
+        header = {
+            "srf_no": srf_no,
+            "srf_date": srf_date,
+            "code": code,
+            "name": name,
+            "address": address,
+            "contact1": contact1,
+            "gst": gst,
+            "received_by": received_by,
+        }
+        return header, table_rows
+
+    def filter_enquiry(
         self,
-        session: AsyncSession,
+        statement,
         final_status: Optional[str] = None,
         name: Optional[str] = None,
         division: Optional[str] = None,
@@ -449,10 +367,6 @@ class OutOfWarrantyService:
         repaired: Optional[str] = None,
     ):
 
-        statement = select(OutOfWarranty, Master).join(
-            Master, OutOfWarranty.code == Master.code
-        )
-
         if final_status:
             statement = statement.where(OutOfWarranty.final_status == final_status)
 
@@ -497,52 +411,138 @@ class OutOfWarrantyService:
                 statement = statement.where(OutOfWarranty.challan_date.isnot(None))
             else:
                 statement = statement.where(OutOfWarranty.challan_date.is_(None))
+        return statement
 
-        statement = statement.order_by(OutOfWarranty.srf_number)
-
-        result = await session.execute(statement)
-        rows = result.all()
-
-        return [
+    async def enquiry_out_of_warranty(
+        self,
+        session: AsyncSession,
+        final_status: Optional[str] = None,
+        name: Optional[str] = None,
+        division: Optional[str] = None,
+        from_srf_date: Optional[date] = None,
+        to_srf_date: Optional[date] = None,
+        estimated: Optional[str] = None,
+        final_settled: Optional[str] = None,
+        challaned: Optional[str] = None,
+        vendor_settled: Optional[str] = None,
+        delivered: Optional[str] = None,
+        repaired: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+    ) -> OutOfWarrantyEnquiryPage:
+        statement = self.filter_enquiry(
+            select(
+                OutOfWarranty.srf_number,
+                sql_format_date_ddmmyyyy(OutOfWarranty.srf_date),
+                Master.name,
+                OutOfWarranty.model,
+                sql_format_date_ddmmyyyy(OutOfWarranty.estimate_date, ""),
+                sql_format_date_ddmmyyyy(OutOfWarranty.repair_date, ""),
+                sql_format_date_ddmmyyyy(OutOfWarranty.challan_date, ""),
+                sql_format_date_ddmmyyyy(OutOfWarranty.delivery_date, ""),
+                OutOfWarranty.final_amount,
+                Master.contact1,
+                Master.contact2,
+            ).join(Master, OutOfWarranty.code == Master.code),
+            final_status=final_status,
+            name=name,
+            division=division,
+            from_srf_date=from_srf_date,
+            to_srf_date=to_srf_date,
+            estimated=estimated,
+            final_settled=final_settled,
+            challaned=challaned,
+            vendor_settled=vendor_settled,
+            delivered=delivered,
+            repaired=repaired,
+        )
+        rows, next_cursor, total = await paginate(
+            session, statement, OutOfWarranty.srf_number, limit, cursor, with_total
+        )
+        items = [
             OutOfWarrantyEnquiry(
-                srf_number=row.OutOfWarranty.srf_number,
-                srf_date=format_date_ddmmyyyy(row.OutOfWarranty.srf_date),
-                name=row.Master.name,
-                model=row.OutOfWarranty.model,
-                estimate_date=(
-                    format_date_ddmmyyyy(row.OutOfWarranty.estimate_date)
-                    if row.OutOfWarranty.estimate_date
-                    else ""
-                ),
-                repair_date=(
-                    format_date_ddmmyyyy(row.OutOfWarranty.repair_date)
-                    if row.OutOfWarranty.repair_date
-                    else ""
-                ),
-                challan_date=(
-                    format_date_ddmmyyyy(row.OutOfWarranty.challan_date)
-                    if row.OutOfWarranty.challan_date
-                    else ""
-                ),
-                delivery_date=(
-                    format_date_ddmmyyyy(row.OutOfWarranty.delivery_date)
-                    if row.OutOfWarranty.delivery_date
-                    else ""
-                ),
-                final_amount=(
-                    row.OutOfWarranty.final_amount
-                    if row.OutOfWarranty.final_amount
-                    else 0
-                ),
-                contact1=row.Master.contact1,
-                contact2=row.Master.contact2,
+                srf_number=row.srf_number,
+                srf_date=row.srf_date,
+                name=row.name,
+                model=row.model,
+                estimate_date=row.estimate_date,
+                repair_date=row.repair_date,
+                challan_date=row.challan_date,
+                delivery_date=row.delivery_date,
+                final_amount=row.final_amount or 0,
+                contact1=row.contact1,
+                contact2=row.contact2,
             )
             for row in rows
         ]
+        return OutOfWarrantyEnquiryPage(
+            items=items, next_cursor=next_cursor, total=total
+        )
+
+    async def export_out_of_warranty(
+        self,
+        final_status: Optional[str] = None,
+        name: Optional[str] = None,
+        division: Optional[str] = None,
+        from_srf_date: Optional[date] = None,
+        to_srf_date: Optional[date] = None,
+        estimated: Optional[str] = None,
+        final_settled: Optional[str] = None,
+        challaned: Optional[str] = None,
+        vendor_settled: Optional[str] = None,
+        delivered: Optional[str] = None,
+        repaired: Optional[str] = None,
+    ) -> AsyncIterator[tuple]:
+        statement = self.filter_enquiry(
+            select(
+                OutOfWarranty.srf_number,
+                sql_format_date_ddmmyyyy(OutOfWarranty.srf_date),
+                Master.name,
+                OutOfWarranty.model,
+                sql_format_date_ddmmyyyy(OutOfWarranty.estimate_date),
+                sql_format_date_ddmmyyyy(OutOfWarranty.repair_date),
+                sql_format_date_ddmmyyyy(OutOfWarranty.challan_date),
+                sql_format_date_ddmmyyyy(OutOfWarranty.delivery_date),
+                func.coalesce(OutOfWarranty.final_amount, 0).label("final_amount"),
+                Master.contact1,
+                Master.contact2,
+            ).join(Master, OutOfWarranty.code == Master.code),
+            final_status=final_status,
+            name=name,
+            division=division,
+            from_srf_date=from_srf_date,
+            to_srf_date=to_srf_date,
+            estimated=estimated,
+            final_settled=final_settled,
+            challaned=challaned,
+            vendor_settled=vendor_settled,
+            delivered=delivered,
+            repaired=repaired,
+        ).order_by(OutOfWarranty.srf_number)
+
+        # Own session, since the stream outlives the request handler
+        async with async_session_maker() as session:
+            result = await session.stream(
+                statement.execution_options(yield_per=Config.EXPORT_BATCH_SIZE)
+            )
+            async for row in result:
+                yield tuple(row)
 
     async def list_srf_not_settled(self, session: AsyncSession):
         statement = (
-            select(OutOfWarranty, Master)
+            select(
+                OutOfWarranty.srf_number,
+                Master.name,
+                OutOfWarranty.model,
+                OutOfWarranty.delivery_date,
+                OutOfWarranty.final_amount,
+                OutOfWarranty.received_by,
+                OutOfWarranty.pc_number,
+                OutOfWarranty.invoice_number,
+                OutOfWarranty.service_charge,
+                OutOfWarranty.waive_details,
+            )
             .join(Master, OutOfWarranty.code == Master.code)
             .where(
                 OutOfWarranty.settlement_date.is_(None)
@@ -554,36 +554,49 @@ class OutOfWarrantyService:
         rows = result.all()
         return [
             OutOfWarrantySRFSettleRecord(
-                srf_number=row.OutOfWarranty.srf_number,
-                name=row.Master.name,
-                model=row.OutOfWarranty.model,
-                delivery_date=row.OutOfWarranty.delivery_date,
-                final_amount=row.OutOfWarranty.final_amount,
-                received_by=row.OutOfWarranty.received_by,
-                pc_number=row.OutOfWarranty.pc_number,
-                invoice_number=row.OutOfWarranty.invoice_number,
-                service_charge=row.OutOfWarranty.service_charge,
-                waive_details=row.OutOfWarranty.waive_details,
+                srf_number=row.srf_number,
+                name=row.name,
+                model=row.model,
+                delivery_date=row.delivery_date,
+                final_amount=row.final_amount,
+                received_by=row.received_by,
+                pc_number=row.pc_number,
+                invoice_number=row.invoice_number,
+                service_charge=row.service_charge,
+                waive_details=row.waive_details,
             )
             for row in rows
         ]
 
     async def update_srf_unsettled(
         self, list_srf: List[UpdateSRFUnsettled], session: AsyncSession
-    ):
-        for srf in list_srf:
-            statement = select(OutOfWarranty).where(
-                OutOfWarranty.srf_number == srf.srf_number
-            )
-            result = await session.execute(statement)
-            existing_srf = result.scalar_one_or_none()
-            if existing_srf:
-                existing_srf.settlement_date = srf.settlement_date
+    ) -> List[str]:
+        missing = await bulk_update(
+            session,
+            OutOfWarranty,
+            "srf_number",
+            [
+                (srf.srf_number, {"settlement_date": srf.settlement_date})
+                for srf in list_srf
+            ],
+        )
         await session.commit()
+        return missing
 
     async def list_final_srf_settlement(self, session: AsyncSession):
         statement = (
-            select(OutOfWarranty, Master)
+            select(
+                OutOfWarranty.srf_number,
+                Master.name,
+                OutOfWarranty.model,
+                OutOfWarranty.delivery_date,
+                OutOfWarranty.final_amount,
+                OutOfWarranty.received_by,
+                OutOfWarranty.pc_number,
+                OutOfWarranty.invoice_number,
+                OutOfWarranty.service_charge,
+                OutOfWarranty.waive_details,
+            )
             .join(Master, OutOfWarranty.code == Master.code)
             .where(
                 OutOfWarranty.settlement_date.isnot(None)
@@ -595,29 +608,31 @@ class OutOfWarrantyService:
         rows = result.all()
         return [
             OutOfWarrantySRFSettleRecord(
-                srf_number=row.OutOfWarranty.srf_number,
-                name=row.Master.name,
-                model=row.OutOfWarranty.model,
-                delivery_date=row.OutOfWarranty.delivery_date,
-                final_amount=row.OutOfWarranty.final_amount,
-                received_by=row.OutOfWarranty.received_by,
-                pc_number=row.OutOfWarranty.pc_number,
-                invoice_number=row.OutOfWarranty.invoice_number,
-                service_charge=row.OutOfWarranty.service_charge,
-                waive_details=row.OutOfWarranty.waive_details,
+                srf_number=row.srf_number,
+                name=row.name,
+                model=row.model,
+                delivery_date=row.delivery_date,
+                final_amount=row.final_amount,
+                received_by=row.received_by,
+                pc_number=row.pc_number,
+                invoice_number=row.invoice_number,
+                service_charge=row.service_charge,
+                waive_details=row.waive_details,
             )
             for row in rows
         ]
 
     async def update_final_srf_settlement(
         self, list_srf: List[UpdateSRFFinalSettlement], session: AsyncSession
-    ):
-        for srf in list_srf:
-            statement = select(OutOfWarranty).where(
-                OutOfWarranty.srf_number == srf.srf_number
-            )
-            result = await session.execute(statement)
-            existing_srf = result.scalar_one_or_none()
-            if existing_srf:
-                existing_srf.final_settled = srf.final_settled
+    ) -> List[str]:
+        missing = await bulk_update(
+            session,
+            OutOfWarranty,
+            "srf_number",
+            [
+                (srf.srf_number, {"final_settled": srf.final_settled})
+                for srf in list_srf
+            ],
+        )
         await session.commit()
+        return missing
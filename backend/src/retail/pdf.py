@@ -0,0 +1,58 @@
+from functools import partial
+from typing import Dict, List
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from utils.pdf_layout import draw_table, text_width
+from utils.pdf_templates import pdf_templates
+
+
+def _draw_overlay(
+    can: canvas.Canvas, header: Dict[str, str], rows: List[List[str]]
+) -> None:
+    width, height = A4
+    # Header
+    can.setFont("Helvetica-Bold", 10)
+    can.drawString(262, 675, header["name"])
+    can.drawString(262, 640, header["address"])
+    can.drawString(405, 608, header["contact"])
+    can.drawString(190, 608, header["code"])
+
+    text = header["grand_total"]
+    column_width = 55
+    x_start = 500
+    total_width = text_width(text, "Helvetica-Bold", 10)
+    x_position = x_start + (column_width - total_width) / 2
+    can.drawString(x_position, 397, text)
+
+    # Table
+    columns = [
+        {"x": 50, "width": 60},  # Retail Code
+        {"x": 120, "width": 55},  # Retail Date
+        {"x": 180, "width": 70},  # Division
+        {"x": 260, "width": 235},  # Details
+        {"x": 500, "width": 55},  # Total Amount
+    ]
+    draw_table(
+        can,
+        columns,
+        rows,
+        y=562,
+        font="Helvetica",
+        font_size=9,
+        line_spacing=8,
+        min_row_height=20,
+        row_padding=0.2,
+    )
+
+
+def render_retail(header: Dict[str, str], rows: List[List[str]]) -> bytes:
+    """
+    Renders the retail receipt over the retail template.
+    """
+    # Apply the overlay on each template page
+    draw = partial(_draw_overlay, header=header, rows=rows)
+    return pdf_templates.render(
+        "retail", [draw] * len(pdf_templates.get("retail").pages)
+    )
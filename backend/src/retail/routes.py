@@ -1,15 +1,17 @@
 from datetime import date
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from auth.dependencies import AccessTokenBearer, RoleChecker
+from config import Config
 from db.db import get_session
+from exceptions import InvalidCursor
 from retail.schemas import (
     RetailCreate,
-    RetailEnquiry,
+    RetailEnquiryPage,
     RetailFinalSettlementResponse,
     RetailNotReceivedResponse,
     RetailPrintResponse,
@@ -19,7 +21,10 @@ from retail.schemas import (
     UpdateRetailReceived,
     UpdateRetailUnsettled,
 )
-from retail.service import RetailService
+from retail.service import ENQUIRY_EXPORT_COLUMNS, RetailService
+from utils.export_utils import export_response
+from utils.pdf_cache import pdf_response
+from utils.responses import list_response
 
 retail_router = APIRouter()
 retail_service = RetailService()
@@ -66,10 +71,12 @@ List all not received retail records.
     status_code=status.HTTP_200_OK,
 )
 async def list_retail_not_received(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
     not_received = await retail_service.list_retail_not_received(session)
-    return not_received
+    return list_response(request, not_received, len(not_received))
 
 
 """
@@ -83,8 +90,10 @@ async def update_received(
     session: AsyncSession = Depends(get_session),
     token=Depends(access_token_bearer),
 ):
-    await retail_service.update_received(list_retail, session, token)
-    return JSONResponse(content={"message": f"Retail Records Updated"})
+    missing = await retail_service.update_received(list_retail, session, token)
+    return JSONResponse(
+        content={"message": f"Retail Records Updated", "missing": missing}
+    )
 
 
 """
@@ -98,10 +107,12 @@ List all unsettled retail records.
     status_code=status.HTTP_200_OK,
 )
 async def list_retail_unsettled(
-    session: AsyncSession = Depends(get_session), token=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    token=Depends(access_token_bearer),
 ):
     unsettled = await retail_service.list_retail_unsettled(session, token)
-    return unsettled
+    return list_response(request, unsettled, len(unsettled))
 
 
 """
@@ -115,8 +126,13 @@ async def update_unsettled(
     session: AsyncSession = Depends(get_session),
     token=Depends(access_token_bearer),
 ):
-    await retail_service.update_unsettled(list_retail, session, token)
-    return JSONResponse(content={"message": f"Retail Records Proposed for Settlement"})
+    missing = await retail_service.update_unsettled(list_retail, session, token)
+    return JSONResponse(
+        content={
+            "message": f"Retail Records Proposed for Settlement",
+            "missing": missing,
+        }
+    )
 
 
 """
@@ -131,10 +147,12 @@ List all final settlement records
     dependencies=[role_checker],
 )
 async def list_retail_final_settlement(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
     final_settlement = await retail_service.list_retail_final_settlement(session)
-    return final_settlement
+    return list_response(request, final_settlement, len(final_settlement))
 
 
 """
@@ -152,23 +170,30 @@ async def update_final_settlement(
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
-    await retail_service.update_final_settlement(list_retail, session)
-    return JSONResponse(content={"message": f"Retail Records Settled"})
+    missing = await retail_service.update_final_settlement(list_retail, session)
+    return JSONResponse(
+        content={"message": f"Retail Records Settled", "missing": missing}
+    )
 
 
 """
-Filter retail enquiry records
+Filter retail enquiry records, one page at a time.
+Pass next_cursor back as cursor to fetch the following page.
 """
 
 
-@retail_router.get("/enquiry", response_model=List[RetailEnquiry])
+@retail_router.get("/enquiry", response_model=RetailEnquiryPage)
 async def retail_enquiry(
+    request: Request,
     name: Optional[str] = None,
     division: Optional[str] = None,
     from_retail_date: Optional[date] = None,
     to_retail_date: Optional[date] = None,
     received: Optional[str] = None,
     final_status: Optional[str] = None,
+    limit: int = Query(Config.ENQUIRY_PAGE_SIZE, ge=1, le=Config.ENQUIRY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    with_total: bool = False,
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
@@ -181,10 +206,46 @@ async def retail_enquiry(
             to_retail_date,
             received,
             final_status,
+            limit,
+            cursor,
+            with_total,
         )
-        return enquiry_list
+        return list_response(request, enquiry_list, len(enquiry_list.items))
+    except InvalidCursor:
+        raise
     except:
-        return []
+        # An empty later page would pass for the end of the list
+        if cursor:
+            raise
+        return RetailEnquiryPage(items=[])
+
+
+"""
+Export every retail record matching the enquiry filters as CSV or XLSX,
+streamed as the rows are read.
+"""
+
+
+@retail_router.get("/enquiry_export", status_code=status.HTTP_200_OK)
+async def export_retail(
+    name: Optional[str] = None,
+    division: Optional[str] = None,
+    from_retail_date: Optional[date] = None,
+    to_retail_date: Optional[date] = None,
+    received: Optional[str] = None,
+    final_status: Optional[str] = None,
+    file_format: Literal["csv", "xlsx"] = "csv",
+    _=Depends(access_token_bearer),
+):
+    rows = retail_service.export_retail(
+        name=name,
+        division=division,
+        from_retail_date=from_retail_date,
+        to_retail_date=to_retail_date,
+        received=received,
+        final_status=final_status,
+    )
+    return export_response("retail_enquiry", ENQUIRY_EXPORT_COLUMNS, rows, file_format)
 
 
 """
@@ -194,13 +255,14 @@ Get retail print details by name (check if customer exists)
 
 @retail_router.get("/show_receipt_names", response_model=List[RetailPrintResponse])
 async def retail_print(
+    request: Request,
     name: str,
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
 
     print_details = await retail_service.get_retail_print_details(session, name)
-    return print_details
+    return list_response(request, print_details, len(print_details))
 
 
 """
@@ -210,13 +272,10 @@ Print retail receipt by rcode.
 
 @retail_router.post("/print", status_code=status.HTTP_200_OK)
 async def print_retail(
+    request: Request,
     data: RetailRcode,
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
     retail_pdf = await retail_service.print_retail(data, session)
-    return StreamingResponse(
-        retail_pdf,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="retail.pdf"'},
-    )
+    return pdf_response(request, retail_pdf, "retail.pdf")
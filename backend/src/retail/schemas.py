@@ -3,14 +3,16 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from utils.schema_types import Upper
+
 
 class RetailCreate(BaseModel):
     retail_date: date
-    name: str = Field(..., min_length=3, max_length=40)
-    division: str = Field(..., max_length=20)
-    details: str = Field(..., max_length=50)
+    name: Upper = Field(..., min_length=3, max_length=40)
+    division: Upper = Field(..., max_length=20)
+    details: Upper = Field(..., max_length=50)
     amount: int = Field(..., ge=1)
-    received: str = Field(..., max_length=1)
+    received: Upper = Field(..., max_length=1)
 
 
 class RetailNotReceivedResponse(BaseModel):
@@ -24,8 +26,8 @@ class RetailNotReceivedResponse(BaseModel):
 
 
 class UpdateRetailReceived(BaseModel):
-    rcode: str
-    received: str = Field(..., max_length=1)
+    rcode: Upper
+    received: Upper = Field(..., max_length=1)
 
 
 class RetailUnsettledResponse(BaseModel):
@@ -37,8 +39,8 @@ class RetailUnsettledResponse(BaseModel):
 
 
 class UpdateRetailUnsettled(BaseModel):
-    rcode: str
-    received: str = Field(..., max_length=1)
+    rcode: Upper
+    received: Upper = Field(..., max_length=1)
     settlement_date: date
 
 
@@ -52,9 +54,9 @@ class RetailFinalSettlementResponse(BaseModel):
 
 
 class UpdateRetailFinalSettlement(BaseModel):
-    rcode: str
+    rcode: Upper
     amount: int
-    final_status: str = Field(..., max_length=1)
+    final_status: Upper = Field(..., max_length=1)
 
 
 class RetailEnquiry(BaseModel):
@@ -68,6 +70,12 @@ class RetailEnquiry(BaseModel):
     final_status: str
 
 
+class RetailEnquiryPage(BaseModel):
+    items: List[RetailEnquiry]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
 class RetailPrintResponse(BaseModel):
     rcode: str
     retail_date: str
@@ -76,4 +84,4 @@ class RetailPrintResponse(BaseModel):
 
 
 class RetailRcode(BaseModel):
-    rcode: List[str]
+    rcode: List[Upper]
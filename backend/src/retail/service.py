@@ -1,23 +1,22 @@
-import io
-import os
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
-from PyPDF2 import PdfReader, PdfWriter
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfbase.pdfmetrics import stringWidth
-from reportlab.pdfgen import canvas
 from sqlalchemy import case, func, select
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from config import Config
+from counter.service import CounterService
+from db.db import async_session_maker
 from exceptions import MasterNotFound
 from master.models import Master
 from master.service import MasterService
+from menu.cache import dashboard_cache
 from retail.models import Retail
+from retail.pdf import render_retail
 from retail.schemas import (
     RetailCreate,
     RetailEnquiry,
+    RetailEnquiryPage,
     RetailFinalSettlementResponse,
     RetailNotReceivedResponse,
     RetailPrintResponse,
@@ -27,10 +26,28 @@ from retail.schemas import (
     UpdateRetailReceived,
     UpdateRetailUnsettled,
 )
-from utils.date_utils import format_date_ddmmyyyy, parse_date
-from utils.file_utils import safe_join, split_text_to_lines
+from utils.date_utils import (
+    format_date_ddmmyyyy,
+    parse_date,
+    sql_format_date_ddmmyyyy,
+)
+from utils.bulk_update import bulk_update
+from utils.pagination import paginate
+from utils.pdf_cache import RenderedPdf, pdf_cache
 
 master_service = MasterService()
+counter_service = CounterService()
+
+ENQUIRY_EXPORT_COLUMNS = [
+    "Code",
+    "Name",
+    "Date",
+    "Division",
+    "Details",
+    "Amount",
+    "Received",
+    "Final Status",
+]
 
 
 class RetailService:
@@ -38,39 +55,36 @@ class RetailService:
     async def create_retail(
         self, session: AsyncSession, retail: RetailCreate, token: dict
     ):
-        for _ in range(3):  # Retry up to 3 times in case of IntegrityError
-            master = await master_service.get_master_by_name(retail.name, session)
-            retail_data_dict = retail.model_dump()
-            retail_data_dict["rcode"] = await self.retail_next_code(session)
-            retail_data_dict["created_by"] = token["user"]["username"]
-            retail_data_dict["code"] = master.code
-            # Convert date fields to date objects
-            for date_field in ["retail_date"]:
-                if date_field in retail_data_dict:
-                    retail_data_dict[date_field] = parse_date(
-                        retail_data_dict[date_field]
-                    )
-            retail_data_dict.pop("name", None)
-            new_retail = Retail(**retail_data_dict)
-            session.add(new_retail)
-            try:
-                await session.commit()
-                return new_retail
-            except IntegrityError as e:
-                await session.rollback()
+        master = await master_service.get_master_by_name(retail.name, session)
+        retail_data_dict = retail.model_dump()
+        retail_data_dict["rcode"] = await counter_service.next_code("X", 5, session)
+        retail_data_dict["created_by"] = token["user"]["username"]
+        retail_data_dict["code"] = master.code
+        # Convert date fields to date objects
+        for date_field in ["retail_date"]:
+            if date_field in retail_data_dict:
+                retail_data_dict[date_field] = parse_date(retail_data_dict[date_field])
+        retail_data_dict.pop("name", None)
+        new_retail = Retail(**retail_data_dict)
+        session.add(new_retail)
+        await session.commit()
+        dashboard_cache.invalidate("retail", "master")
+        return new_retail
 
     async def retail_next_code(self, session: AsyncSession):
-        statement = select(Retail.rcode).order_by(Retail.rcode.desc()).limit(1)
-        result = await session.execute(statement)
-        last_rcode = result.scalar()
-        last_number = last_rcode[1:] if last_rcode else "0"
-        next_rcode = int(last_number) + 1
-        next_rcode = "X" + str(next_rcode).zfill(5)
-        return next_rcode
+        return await counter_service.peek_next_code("X", 5, session)
 
     async def list_retail_not_received(self, session: AsyncSession):
         statement = (
-            select(Retail, Master)
+            select(
+                Retail.rcode,
+                Master.name,
+                Master.contact1,
+                Master.contact2,
+                Retail.details,
+                Retail.amount,
+                Retail.received,
+            )
             .join(Master, Retail.code == Master.code)
             .where(Retail.received == "N")
             .order_by(Retail.rcode)
@@ -79,13 +93,13 @@ class RetailService:
         rows = result.all()
         return [
             RetailNotReceivedResponse(
-                rcode=row.Retail.rcode,
-                name=row.Master.name,
-                contact1=row.Master.contact1,
-                contact2=row.Master.contact2,
-                details=row.Retail.details,
-                amount=row.Retail.amount,
-                received=row.Retail.received,
+                rcode=row.rcode,
+                name=row.name,
+                contact1=row.contact1,
+                contact2=row.contact2,
+                details=row.details,
+                amount=row.amount,
+                received=row.received,
             )
             for row in rows
         ]
@@ -95,20 +109,31 @@ class RetailService:
         list_retail: List[UpdateRetailReceived],
         session: AsyncSession,
         token: dict,
-    ):
-        for retail in list_retail:
-            statement = select(Retail).where(Retail.rcode == retail.rcode)
-            result = await session.execute(statement)
-            existing_retail = result.scalar_one_or_none()
-            if existing_retail:
-                existing_retail.received = retail.received
-                existing_retail.updated_by = token["user"]["username"]
+    ) -> List[str]:
+        updated_by = token["user"]["username"]
+        missing = await bulk_update(
+            session,
+            Retail,
+            "rcode",
+            [
+                (retail.rcode, {"received": retail.received, "updated_by": updated_by})
+                for retail in list_retail
+            ],
+        )
         await session.commit()
+        dashboard_cache.invalidate("retail")
+        return missing
 
     async def list_retail_unsettled(self, session: AsyncSession, token: dict):
         received_by = token["user"]["username"]
         statement = (
-            select(Retail, Master)
+            select(
+                Retail.rcode,
+                Master.name,
+                Retail.details,
+                Retail.amount,
+                Retail.received,
+            )
             .join(Master, Retail.code == Master.code)
             .where((Retail.settlement_date == None) & ((Retail.updated_by == received_by) | (Retail.updated_by.is_(None) & (Retail.created_by == received_by))))
             .order_by(Retail.rcode)
@@ -117,31 +142,49 @@ class RetailService:
         rows = result.all()
         return [
             RetailUnsettledResponse(
-                rcode=row.Retail.rcode,
-                name=row.Master.name,
-                details=row.Retail.details,
-                amount=row.Retail.amount,
-                received=row.Retail.received,
+                rcode=row.rcode,
+                name=row.name,
+                details=row.details,
+                amount=row.amount,
+                received=row.received,
             )
             for row in rows
         ]
 
     async def update_unsettled(
         self, list_retail: List[UpdateRetailUnsettled], session: AsyncSession, token: dict
-    ):
-        for retail in list_retail:
-            statement = select(Retail).where(Retail.rcode == retail.rcode)
-            result = await session.execute(statement)
-            existing_retail = result.scalar_one_or_none()
-            if existing_retail:
-                existing_retail.received = retail.received
-                existing_retail.settlement_date = retail.settlement_date
-                existing_retail.updated_by = token["user"]["username"]
+    ) -> List[str]:
+        updated_by = token["user"]["username"]
+        missing = await bulk_update(
+            session,
+            Retail,
+            "rcode",
+            [
+                (
+                    retail.rcode,
+                    {
+                        "received": retail.received,
+                        "settlement_date": retail.settlement_date,
+                        "updated_by": updated_by,
+                    },
+                )
+                for retail in list_retail
+            ],
+        )
         await session.commit()
+        dashboard_cache.invalidate("retail")
+        return missing
 
     async def list_retail_final_settlement(self, session: AsyncSession):
         statement = (
-            select(Retail, Master)
+            select(
+                Retail.rcode,
+                Master.name,
+                sql_format_date_ddmmyyyy(Retail.retail_date),
+                Retail.details,
+                Retail.amount,
+                Retail.updated_by,
+            )
             .join(Master, Retail.code == Master.code)
             .where((Retail.settlement_date != None) & (Retail.final_status == "N"))
             .order_by(Retail.rcode)
@@ -150,40 +193,45 @@ class RetailService:
         rows = result.all()
         return [
             RetailFinalSettlementResponse(
-                rcode=row.Retail.rcode,
-                name=row.Master.name,
-                retail_date=format_date_ddmmyyyy(row.Retail.retail_date),
-                details=row.Retail.details,
-                amount=row.Retail.amount,
-                received_by=row.Retail.updated_by,
+                rcode=row.rcode,
+                name=row.name,
+                retail_date=row.retail_date,
+                details=row.details,
+                amount=row.amount,
+                received_by=row.updated_by,
             )
             for row in rows
         ]
 
     async def update_final_settlement(
         self, list_retail: List[UpdateRetailFinalSettlement], session: AsyncSession
-    ):
-        for retail in list_retail:
-            statement = select(Retail).where(Retail.rcode == retail.rcode)
-            result = await session.execute(statement)
-            existing_retail = result.scalar_one_or_none()
-            if existing_retail:
-                existing_retail.amount = retail.amount
-                existing_retail.final_status = retail.final_status
+    ) -> List[str]:
+        missing = await bulk_update(
+            session,
+            Retail,
+            "rcode",
+            [
+                (
+                    retail.rcode,
+                    {"amount": retail.amount, "final_status": retail.final_status},
+                )
+                for retail in list_retail
+            ],
+        )
         await session.commit()
+        dashboard_cache.invalidate("retail")
+        return missing
 
-    async def get_retail_enquiry(
+    def filter_enquiry(
         self,
-        session: AsyncSession,
+        statement,
         name: Optional[str] = None,
         division: Optional[str] = None,
         from_retail_date: Optional[date] = None,
         to_retail_date: Optional[date] = None,
         received: Optional[str] = None,
         final_status: Optional[str] = None,
-    ) -> List[RetailEnquiry]:
-        # Check if master name exists
-        statement = select(Retail, Master.name).join(Master, Master.code == Retail.code)
+    ):
 
         # Apply filters dynamically
         if final_status:
@@ -202,24 +250,92 @@ class RetailService:
 
         if received:
             statement = statement.where(Retail.received == received)
+        return statement
 
-        statement = statement.order_by(Retail.rcode)
-
-        result = await session.execute(statement)
-        rows = result.all()
-        return [
+    async def get_retail_enquiry(
+        self,
+        session: AsyncSession,
+        name: Optional[str] = None,
+        division: Optional[str] = None,
+        from_retail_date: Optional[date] = None,
+        to_retail_date: Optional[date] = None,
+        received: Optional[str] = None,
+        final_status: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+    ) -> RetailEnquiryPage:
+        statement = self.filter_enquiry(
+            select(
+                Retail.rcode,
+                Master.name,
+                sql_format_date_ddmmyyyy(Retail.retail_date),
+                Retail.division,
+                Retail.details,
+                Retail.amount,
+                Retail.received,
+                Retail.final_status,
+            ).join(Master, Master.code == Retail.code),
+            name=name,
+            division=division,
+            from_retail_date=from_retail_date,
+            to_retail_date=to_retail_date,
+            received=received,
+            final_status=final_status,
+        )
+        rows, next_cursor, total = await paginate(
+            session, statement, Retail.rcode, limit, cursor, with_total
+        )
+        items = [
             RetailEnquiry(
-                rcode=row.Retail.rcode,
+                rcode=row.rcode,
                 name=row.name,
-                retail_date=format_date_ddmmyyyy(row.Retail.retail_date),
-                division=row.Retail.division,
-                details=row.Retail.details,
-                amount=row.Retail.amount,
-                received=row.Retail.received,
-                final_status=row.Retail.final_status,
+                retail_date=row.retail_date,
+                division=row.division,
+                details=row.details,
+                amount=row.amount,
+                received=row.received,
+                final_status=row.final_status,
             )
             for row in rows
         ]
+        return RetailEnquiryPage(items=items, next_cursor=next_cursor, total=total)
+
+    async def export_retail(
+        self,
+        name: Optional[str] = None,
+        division: Optional[str] = None,
+        from_retail_date: Optional[date] = None,
+        to_retail_date: Optional[date] = None,
+        received: Optional[str] = None,
+        final_status: Optional[str] = None,
+    ) -> AsyncIterator[tuple]:
+        statement = self.filter_enquiry(
+            select(
+                Retail.rcode,
+                Master.name,
+                sql_format_date_ddmmyyyy(Retail.retail_date),
+                Retail.division,
+                Retail.details,
+                Retail.amount,
+                Retail.received,
+                Retail.final_status,
+            ).join(Master, Master.code == Retail.code),
+            name=name,
+            division=division,
+            from_retail_date=from_retail_date,
+            to_retail_date=to_retail_date,
+            received=received,
+            final_status=final_status,
+        ).order_by(Retail.rcode)
+
+        # Own session, since the stream outlives the request handler
+        async with async_session_maker() as session:
+            result = await session.stream(
+                statement.execution_options(yield_per=Config.EXPORT_BATCH_SIZE)
+            )
+            async for row in result:
+                yield tuple(row)
 
     async def get_retail_print_details(
         self,
@@ -251,7 +367,7 @@ class RetailService:
 
     async def print_retail(
         self, codes: RetailRcode, session: AsyncSession
-    ) -> io.BytesIO:
+    ) -> RenderedPdf:
 
         # Query retail and master info for all codes
         statement = (
@@ -267,7 +383,7 @@ class RetailService:
         first_row = rows[0]
         master = first_row.Master
         code = master.code
-        master_details = await master_service.get_master_details(code, session)
+        master_details = master_service.master_details(master)
         name = master_details["name"]
         address = master_details["full_address"]
         contact = master_details["contact1"]
@@ -288,92 +404,11 @@ class RetailService:
             grand_total += amount
         grand_total_str = f"{grand_total:.2f}"
 
-        def generate_overlay(rows, name, address, contact, code, grand_total):
-            packet = io.BytesIO()
-            can = canvas.Canvas(packet, pagesize=A4)
-            width, height = A4
-            # Header
-            can.setFont("Helvetica-Bold", 10)
-            can.drawString(262, 675, name)
-            can.drawString(262, 640, address)
-            can.drawString(405, 608, contact)
-            can.drawString(190, 608, code)
-
-            text = str(grand_total)
-            column_width = 55
-            x_start = 500
-            text_width = stringWidth(text, "Helvetica-Bold", 10)
-            x_position = x_start + (column_width - text_width) / 2
-            can.drawString(x_position, 397, text)
-
-            # Table
-            y = 562
-            line_spacing = 8
-            min_row_height = 20
-            row_padding = 0.2
-            columns = [
-                {"x": 50, "width": 60},  # Retail Code
-                {"x": 120, "width": 55},  # Retail Date
-                {"x": 180, "width": 70},  # Division
-                {"x": 260, "width": 235},  # Details
-                {"x": 500, "width": 55},  # Total Amount
-            ]
-            can.setFont("Helvetica", 9)
-            for idx, row in enumerate(rows, 1):
-                row_data = row
-                row_lines = []
-                for col, text in zip(columns, row_data):
-                    words = text.split()
-                    lines = []
-                    line = ""
-                    for word in words:
-                        test_line = line + (" " if line else "") + word
-                        if stringWidth(test_line, "Helvetica", 9) <= col["width"]:
-                            line = test_line
-                        else:
-                            lines.append(line)
-                            line = word
-                    if line:
-                        lines.append(line)
-                    row_lines.append(lines)
-                max_lines = max(len(lines) for lines in row_lines)
-                row_height = max(max_lines * line_spacing, min_row_height)
-                for col, lines in zip(columns, row_lines):
-                    total_text_height = len(lines) * line_spacing
-                    vertical_offset = (row_height - total_text_height) / 2
-                    for i, ln in enumerate(lines):
-                        text_width = stringWidth(ln, "Helvetica", 9)
-                        center_x = col["x"] + col["width"] / 2 - text_width / 2
-                        y_position = y - vertical_offset - (i * line_spacing)
-                        can.drawString(center_x, y_position, ln)
-                y -= row_height + row_padding
-            can.save()
-            packet.seek(0)
-            return PdfReader(packet)
-
-        # Path to the static PDF template (use absolute path for portability, with path injection protection)
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        static_dir = os.path.normpath(os.path.join(base_dir, "..", "static"))
-        template_path = safe_join(static_dir, "retail.pdf")
-        try:
-            with open(template_path, "rb") as f:
-                template_bytes = f.read()
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Template PDF not found at {template_path}")
-        template_buffer = io.BytesIO(template_bytes)
-        base_pdf = PdfReader(template_buffer)
-
-        overlay = generate_overlay(
-            retail_rows, name, address, contact, code, grand_total_str
-        )
-        output = PdfWriter()
-        # Apply overlay on each base page
-        for i in range(len(base_pdf.pages)):
-            page = base_pdf.pages[i]
-            overlay_page = overlay.pages[min(i, len(overlay.pages) - 1)]
-            page.merge_page(overlay_page)
-            output.add_page(page)
-        result = io.BytesIO()
-        output.write(result)
-        result.seek(0)
-        return result
+        header = {
+            "name": name,
+            "address": address,
+            "contact": contact,
+            "code": code,
+            "grand_total": grand_total_str,
+        }
+        return await pdf_cache.render(render_retail, header, retail_rows)
@@ -2,9 +2,11 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from utils.schema_types import Upper
+
 
 class RewindingCharge(BaseModel):
-    division: str
-    frame: Optional[str]
+    division: Upper
+    frame: Optional[Upper]
     hp_rating: Optional[float]
-    winding_type: Optional[str]
+    winding_type: Optional[Upper]
@@ -1,16 +1,19 @@
 from typing import List
 
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, Request, status
 from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from auth.dependencies import AccessTokenBearer, RoleChecker
+from counter.service import ListVersionService
 from db.db import get_session
 from service_center.schemas import ServiceCenterCreate
 from service_center.service import ServiceCenterService
+from utils.responses import versioned_list_response
 
 service_center_router = APIRouter()
 service_center_service = ServiceCenterService()
+list_version_service = ListVersionService()
 access_token_bearer = AccessTokenBearer()
 role_checker = Depends(RoleChecker(allowed_roles=["ADMIN"]))
 
@@ -24,10 +27,16 @@ List all service_center names.
     "/list_names", response_model=List, status_code=status.HTTP_200_OK
 )
 async def list_service_center_names(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
-    asc_names = await service_center_service.list_service_center_names(session)
-    return asc_names
+    etag = await list_version_service.etag("service_center_names", session)
+    return await versioned_list_response(
+        request,
+        etag,
+        lambda: service_center_service.list_service_center_names(session),
+    )
 
 
 """
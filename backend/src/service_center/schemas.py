@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+from utils.schema_types import Upper
+
 
 class ServiceCenterCreate(BaseModel):
-    asc_name: str
+    asc_name: Upper
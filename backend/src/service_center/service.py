@@ -2,10 +2,14 @@ from sqlalchemy import func, select, union_all
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from counter.service import ListVersionService
 from exceptions import ServiceCenterAlreadyExists, ServiceCenterNotFound
+from menu.cache import dashboard_cache
 
 from .models import ServiceCentre
 
+list_version_service = ListVersionService()
+
 
 class ServiceCenterService:
 
@@ -33,4 +37,6 @@ class ServiceCenterService:
         except ServiceCenterNotFound:
             new_service_center = ServiceCentre(asc_name=name)
             session.add(new_service_center)
+            await list_version_service.bump("service_center_names", session)
             await session.commit()
+            dashboard_cache.invalidate("master")
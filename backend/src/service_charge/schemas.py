@@ -3,7 +3,9 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from utils.schema_types import Upper
+
 
 class ServiceChargeRequest(BaseModel):
-    division: str
-    sub_division: Optional[str] = None
+    division: Upper
+    sub_division: Optional[Upper] = None
@@ -1,9 +1,12 @@
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.future import select
 
+from auth.cache import user_cache
 from auth.models import User
-from auth.utils import generate_hash_password, verify_password
+from auth.password_pool import password_pool
+from auth.utils import normalize_username
 from exceptions import CannotDeleteCurrentUser, InvalidCredentials, UserNotFound
 from user.schema import UserChangePassword, UserCreate
 
@@ -25,13 +28,16 @@ class UserService:
         user.username = " ".join(user.username.split())
         user_data_dict = user.model_dump()
         new_user = User(**user_data_dict)
-        new_user.password = generate_hash_password(user_data_dict["password"])
+        new_user.password = await password_pool.hash(
+            user_data_dict["password"], "create_user"
+        )
         session.add(new_user)
         try:
             await session.commit()
         except:
             await session.rollback()
             raise IntegrityError()
+        user_cache.invalidate(new_user.username)
         return new_user
 
     async def user_exists(self, username: str, session: AsyncSession) -> bool:
@@ -39,10 +45,9 @@ class UserService:
         return existing_user is not None
 
     async def get_user_by_username(self, username: str, session: AsyncSession):
-        username = username.strip()
-        username = " ".join(username.split())
         statement = select(User).where(
-            User.username.ilike(username), User.is_active == "Y"
+            func.lower(User.username) == normalize_username(username),
+            User.is_active == "Y",
         )
         result = await session.execute(statement)
         return result.scalars().first()
@@ -56,16 +61,29 @@ class UserService:
         user_to_delete.is_active = "N"
         session.add(user_to_delete)
         await session.commit()
+        user_cache.invalidate(user_to_delete.username)
 
     async def reset_password(
         self, user_data: UserChangePassword, session: AsyncSession
     ):
         existing_user = await self.get_user_by_username(user_data.username, session)
-        if existing_user and verify_password(
-            user_data.old_password, existing_user.password
+        if not existing_user:
+            raise InvalidCredentials()
+        old_hash = existing_user.password
+        # No connection is held through the bcrypt work, which may queue
+        await session.commit()
+        if not await password_pool.verify(
+            user_data.old_password, old_hash, "reset_password"
         ):
-            existing_user.password = generate_hash_password(user_data.new_password)
-            session.add(existing_user)
-            await session.commit()
-            return existing_user
-        raise InvalidCredentials()
+            raise InvalidCredentials()
+        new_hash = await password_pool.hash(user_data.new_password, "reset_password")
+        # Reload in a short transaction; the user may have been deleted or
+        # given another password meanwhile
+        await session.refresh(existing_user)
+        if existing_user.is_active != "Y" or existing_user.password != old_hash:
+            raise InvalidCredentials()
+        existing_user.password = new_hash
+        session.add(existing_user)
+        await session.commit()
+        user_cache.invalidate(existing_user.username)
+        return existing_user
@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import io
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from PyPDF2 import PdfReader, PdfWriter
+from sqlalchemy import func
+
+from config import Config
+from exceptions import InvalidBatchPrint
+from utils.pdf_cache import RenderedPdf, pdf_cache
+from utils.pdf_renderer import pdf_renderer
+
+
+def normalize_number(number: str, prefix: str) -> str:
+    """
+    Expands a bare number to its six character code ("12" -> "R00012") and
+    checks the result, as the single print endpoints do.
+    """
+    number = number.strip()
+    if len(number) != 6:
+        number = prefix + number.zfill(5)
+    if not number.startswith(prefix) or not number[1:].isdigit():
+        raise InvalidBatchPrint()
+    return number
+
+
+def batch_filter(
+    column,
+    prefix: str,
+    numbers: Sequence[str] = (),
+    from_number: Optional[str] = None,
+    to_number: Optional[str] = None,
+    suffixed: bool = False,
+):
+    """
+    WHERE clause selecting the documents of a batch print, given either a list
+    of numbers or an inclusive from/to range. With suffixed=True the column
+    holds one row per item ("R00012/1", "R00012/2") and a document is every
+    row sharing the six character code.
+    """
+    has_range = from_number is not None or to_number is not None
+    if bool(numbers) == has_range:
+        raise InvalidBatchPrint()
+
+    if numbers:
+        codes = list(dict.fromkeys(normalize_number(n, prefix) for n in numbers))
+        if len(codes) > Config.BATCH_PRINT_MAX_DOCUMENTS:
+            raise InvalidBatchPrint()
+        if suffixed:
+            return func.split_part(column, "/", 1).in_(codes)
+        return column.in_(codes)
+
+    if from_number is None or to_number is None:
+        raise InvalidBatchPrint()
+    first = normalize_number(from_number, prefix)
+    last = normalize_number(to_number, prefix)
+    count = int(last[1:]) - int(first[1:]) + 1
+    if count < 1 or count > Config.BATCH_PRINT_MAX_DOCUMENTS:
+        raise InvalidBatchPrint()
+    if suffixed:
+        # Compare the codes themselves: under a locale collation the "/" of
+        # "<last>/n" is ignored, so a bound on the raw column drops the last SRF
+        return func.split_part(column, "/", 1).between(first, last)
+    return column.between(first, last)
+
+
+def merge_pdfs(pdfs: List[bytes]) -> bytes:
+    """
+    Concatenates the pages of several PDFs into one document.
+    """
+    writer = PdfWriter()
+    for pdf in pdfs:
+        writer.append(PdfReader(io.BytesIO(pdf)))
+    output_stream = io.BytesIO()
+    writer.write(output_stream)
+    return output_stream.getvalue()
+
+
+async def render_batch(
+    documents: Sequence[Tuple[Callable[..., bytes], Tuple[Any, ...]]],
+) -> RenderedPdf:
+    """
+    Renders (render function, arguments) documents in parallel on the render
+    pool, reusing cached ones, and returns them merged into one PDF in the
+    order given. The batch ETag is derived from the documents' ETags.
+    """
+    pdfs = await asyncio.gather(
+        *(pdf_cache.render(render_func, *args) for render_func, args in documents)
+    )
+    content = await pdf_renderer.render(merge_pdfs, [pdf.content for pdf in pdfs])
+    etag = hashlib.sha256("".join(pdf.etag for pdf in pdfs).encode()).hexdigest()
+    return RenderedPdf(etag=etag, content=content)
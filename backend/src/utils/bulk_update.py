@@ -0,0 +1,46 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import column, update, values
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from config import Config
+
+
+async def bulk_update(
+    session: AsyncSession,
+    model,
+    key: str,
+    changes: Sequence[Tuple[Any, Dict[str, Any]]],
+    batch_size: int = Config.BULK_UPDATE_BATCH_SIZE,
+) -> List[Any]:
+    """
+    Applies (key value, {field: value}) changes to the rows of `model` with one
+    UPDATE ... FROM (VALUES ...) statement per batch. Every change must set the
+    same fields; a key given twice keeps its last change.
+    Returns the key values that matched no row. Does not commit.
+    """
+    latest = dict(changes)
+    if not latest:
+        return []
+    fields = list(next(iter(latest.values())))
+    if any(list(item) != fields for item in latest.values()):
+        raise ValueError("Every change in a bulk update must set the same fields")
+
+    table = model.__table__
+    columns = [column(name, table.c[name].type) for name in [key, *fields]]
+    items = list(latest.items())
+    updated = set()
+    for start in range(0, len(items), batch_size):
+        batch = items[start : start + batch_size]
+        data = values(*columns, name="changes").data(
+            [(value, *(item[name] for name in fields)) for value, item in batch]
+        )
+        statement = (
+            update(table)
+            .where(table.c[key] == data.c[key])
+            .values({name: data.c[name] for name in fields})
+            .returning(table.c[key])
+        )
+        result = await session.execute(statement)
+        updated.update(result.scalars().all())
+    return [value for value in latest if value not in updated]
@@ -1,6 +1,8 @@
 from datetime import date, datetime
 from typing import Optional, Union
 
+from sqlalchemy import func
+
 
 def parse_date(date_input: Optional[Union[str, datetime, date]]) -> Optional[date]:
     """
@@ -44,3 +46,15 @@ def format_date_ddmmyyyy(
             f"Unsupported type for format_date_ddmmyyyy: {type(date_input)}"
         )
     return d.strftime("%d-%m-%Y")
+
+
+def sql_format_date_ddmmyyyy(column, default: Optional[str] = None):
+    """
+    SQL counterpart of format_date_ddmmyyyy, so the database renders the
+    'dd-mm-yyyy' string. NULL dates stay NULL unless a default is given.
+    The result is labelled with the column's own name.
+    """
+    formatted = func.to_char(column, "DD-MM-YYYY")
+    if default is not None:
+        formatted = func.coalesce(formatted, default)
+    return formatted.label(column.key)
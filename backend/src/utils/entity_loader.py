@@ -0,0 +1,109 @@
+import asyncio
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+# (model, attribute name), e.g. (Master, "code")
+LoaderKey = Tuple[type, str]
+
+
+class EntityLoader:
+    """
+    Identity map over one session, so over one request, in the style of a
+    DataLoader. Every entity is fetched at most once per (column, key) and is
+    also remembered under its primary key, so loading a master by name and
+    then by code costs one query. Keys asked for in the same event loop tick,
+    e.g. under asyncio.gather or through load_many, are fetched with a single
+    IN query. Keys that match nothing are remembered as None.
+    The map is cleared when the session rolls back, since rolled back
+    instances are expired and would need lazy loads to read.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._loaded: Dict[LoaderKey, Dict[Hashable, Any]] = {}
+        self._pending: Dict[LoaderKey, Dict[Hashable, asyncio.Future]] = {}
+        self._dispatches: Set[asyncio.Task] = set()
+        # A session runs one statement at a time
+        self._lock = asyncio.Lock()
+        event.listen(session.sync_session, "after_soft_rollback", self._clear)
+
+    @staticmethod
+    def _loader_key(column: InstrumentedAttribute) -> LoaderKey:
+        return (column.class_, column.key)
+
+    def _clear(self, *_) -> None:
+        self._loaded.clear()
+
+    def prime(self, column: InstrumentedAttribute, key: Hashable, entity: Any) -> None:
+        """
+        Records an entity the caller already loaded, e.g. through a join.
+        """
+        self._remember(self._loader_key(column), key, entity)
+
+    def _remember(self, loader_key: LoaderKey, key: Hashable, entity: Any) -> None:
+        self._loaded.setdefault(loader_key, {})[key] = entity
+        if entity is None:
+            return
+        model = loader_key[0]
+        primary_key = inspect(model).primary_key
+        if len(primary_key) == 1 and primary_key[0].key != loader_key[1]:
+            self._loaded.setdefault((model, primary_key[0].key), {})[
+                getattr(entity, primary_key[0].key)
+            ] = entity
+
+    async def load(self, column: InstrumentedAttribute, key: Hashable) -> Optional[Any]:
+        loader_key = self._loader_key(column)
+        loaded = self._loaded.get(loader_key, {})
+        if key in loaded:
+            return loaded[key]
+        pending = self._pending.get(loader_key)
+        if pending is None:
+            pending = self._pending[loader_key] = {}
+            # Dispatch once the callers of this tick have added their keys
+            task = asyncio.ensure_future(self._dispatch(column))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+        future = pending.get(key)
+        if future is None:
+            future = pending[key] = asyncio.get_running_loop().create_future()
+        return await asyncio.shield(future)
+
+    async def load_many(
+        self, column: InstrumentedAttribute, keys: Iterable[Hashable]
+    ) -> List[Optional[Any]]:
+        return list(await asyncio.gather(*(self.load(column, key) for key in keys)))
+
+    async def _dispatch(self, column: InstrumentedAttribute) -> None:
+        loader_key = self._loader_key(column)
+        async with self._lock:
+            pending = self._pending.pop(loader_key)
+            try:
+                statement = select(column.class_).where(column.in_(list(pending)))
+                result = await self.session.execute(statement)
+                found = {
+                    getattr(entity, column.key): entity
+                    for entity in result.scalars().all()
+                }
+            except Exception as exc:
+                for future in pending.values():
+                    if not future.done():
+                        future.set_exception(exc)
+                return
+        for key, future in pending.items():
+            entity = found.get(key)
+            self._remember(loader_key, key, entity)
+            if not future.done():
+                future.set_result(entity)
+
+
+def entity_loader(session: AsyncSession) -> EntityLoader:
+    """
+    The loader of this session, created on first use.
+    """
+    loader = session.info.get("entity_loader")
+    if loader is None:
+        loader = session.info["entity_loader"] = EntityLoader(session)
+    return loader
@@ -0,0 +1,168 @@
+import csv
+import io
+import re
+import zipfile
+from typing import Any, AsyncIterator, Iterable, List, Sequence
+from xml.sax.saxutils import escape
+
+from fastapi.responses import StreamingResponse
+
+from config import Config
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Control characters that are not allowed anywhere in an XML document
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+        'officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+        'officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+
+
+class _ChunkBuffer:
+    """
+    Write-only, unseekable file object that hands its bytes back in chunks.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_csv(
+    columns: Sequence[str], rows: AsyncIterator[Sequence[Any]]
+) -> AsyncIterator[bytes]:
+    """
+    Encodes rows as CSV, yielding the header at once and then one chunk every
+    EXPORT_BATCH_SIZE rows. A BOM is written first so Excel reads UTF-8.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode("utf-8-sig")
+    buffer.seek(0)
+    buffer.truncate()
+
+    count = 0
+    async for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % Config.EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _xlsx_row(values: Iterable[Any]) -> str:
+    cells = []
+    for value in values:
+        if value is None or value == "":
+            cells.append("<c/>")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f"<c><v>{value}</v></c>")
+        else:
+            text = escape(_ILLEGAL_XML.sub("", str(value)))
+            cells.append(
+                f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+            )
+    return f"<row>{''.join(cells)}</row>"
+
+
+async def stream_xlsx(
+    columns: Sequence[str], rows: AsyncIterator[Sequence[Any]]
+) -> AsyncIterator[bytes]:
+    """
+    Encodes rows as a single-sheet XLSX workbook without holding it in memory.
+    The zip is written to an unseekable buffer, so each entry carries a data
+    descriptor and compressed bytes can be yielded as soon as they exist.
+    """
+    output = _ChunkBuffer()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in _XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        with workbook.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                b"<sheetData>"
+            )
+            sheet.write(_xlsx_row(columns).encode())
+            yield output.drain()
+
+            count = 0
+            async for row in rows:
+                sheet.write(_xlsx_row(row).encode())
+                count += 1
+                if count % Config.EXPORT_BATCH_SIZE == 0:
+                    chunk = output.drain()
+                    if chunk:
+                        yield chunk
+            sheet.write(b"</sheetData></worksheet>")
+    yield output.drain()
+
+
+def export_response(
+    filename: str,
+    columns: Sequence[str],
+    rows: AsyncIterator[Sequence[Any]],
+    file_format: str = "csv",
+) -> StreamingResponse:
+    """
+    Wraps an async row iterator in a StreamingResponse of the requested format.
+    """
+    stream = stream_xlsx if file_format == "xlsx" else stream_csv
+    return StreamingResponse(
+        stream(columns, rows),
+        media_type=MEDIA_TYPES[file_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{file_format}"'
+        },
+    )
@@ -0,0 +1,66 @@
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from exceptions import InvalidCursor
+
+
+def encode_cursor(key: str) -> str:
+    """
+    Encodes the last key of a page as an opaque, URL-safe cursor token.
+    """
+    raw = json.dumps({"k": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Decodes a cursor token back into the key it was built from.
+    Raises InvalidCursor if the token was not produced by encode_cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded))["k"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor()
+    if not isinstance(key, str):
+        raise InvalidCursor()
+    return key
+
+
+async def paginate(
+    session: AsyncSession,
+    statement,
+    key,
+    limit: int,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
+) -> Tuple[List[Any], Optional[str], Optional[int]]:
+    """
+    Runs a filtered select one keyset page at a time.
+    Rows are ordered by the unique column `key` and start after the key held
+    in `cursor`. Returns the rows, the cursor of the next page (None on the
+    last page) and, if asked for, the number of rows matching the filters.
+    """
+    total = None
+    if with_total:
+        count_statement = statement.with_only_columns(
+            func.count(), maintain_column_froms=True
+        ).order_by(None)
+        total = (await session.execute(count_statement)).scalar_one()
+
+    if cursor:
+        statement = statement.where(key > decode_cursor(cursor))
+    # The key is selected on its own so the next cursor can be read off the
+    # last row, and one extra row tells whether another page follows
+    statement = statement.add_columns(key).order_by(None).order_by(key).limit(limit + 1)
+    rows = (await session.execute(statement)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]._mapping[key])
+    return rows, next_cursor, total
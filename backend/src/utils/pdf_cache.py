@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple, Optional
+
+from fastapi import Request, status
+from fastapi.responses import Response
+
+from config import Config
+from utils import pdf_layout
+from utils.pdf_renderer import pdf_renderer
+from utils.pdf_templates import PdfTemplateRegistry, pdf_templates
+from utils.responses import etag_matches
+
+
+class RenderedPdf(NamedTuple):
+    etag: str
+    content: bytes
+
+
+@lru_cache(maxsize=None)
+def _source_version(module_file: str) -> str:
+    # A deploy that changes a render module must not serve PDFs drawn by the old code
+    with open(module_file, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# The layout helpers and template drawing every render function goes through
+_SHARED_SOURCES = (
+    inspect.getsourcefile(pdf_layout),
+    inspect.getsourcefile(PdfTemplateRegistry),
+)
+
+
+class PdfCache:
+    """
+    Disk-backed cache of rendered PDFs, evicted least recently used once the
+    files exceed max_bytes. The key is a digest of everything the PDF is
+    drawn from: the render function and its source, the source of the shared
+    layout and template modules, its arguments (the rows and header,
+    received_by included) and the template version. Any change to a record,
+    a template or the drawing code therefore produces a new key, and the key
+    doubles as the ETag.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size
+        self._size = 0
+        self._indexed = False
+        self._lock = threading.Lock()
+
+    def key(self, render_func: Callable[..., bytes], *args: Any) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{render_func.__module__}.{render_func.__qualname__}".encode())
+        digest.update(_source_version(inspect.getsourcefile(render_func)).encode())
+        for module_file in _SHARED_SOURCES:
+            digest.update(_source_version(module_file).encode())
+        digest.update(pdf_templates.version().encode())
+        digest.update(json.dumps(args, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _index(self) -> None:
+        # Picks up files left by earlier runs, oldest access first
+        if self._indexed:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".tmp"):
+                # Another worker may still be writing a recent one
+                if entry.stat().st_mtime < time.time() - 3600:
+                    os.unlink(entry.path)
+            elif entry.name.endswith(".pdf"):
+                stat = entry.stat()
+                files.append((stat.st_atime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._size += size
+        self._indexed = True
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            try:
+                os.unlink(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _read(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            self._index()
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            os.utime(self._path(key))
+            return data
+        except FileNotFoundError:
+            # Removed behind our back, e.g. by another worker's eviction
+            with self._lock:
+                self._size -= self._entries.pop(key, 0)
+            return None
+
+    def _write(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._index()
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, self._path(key))
+        with self._lock:
+            self._size += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    async def render(
+        self, render_func: Callable[..., bytes], *args: Any
+    ) -> RenderedPdf:
+        """
+        Returns the cached PDF for these inputs, rendering and storing it on
+        the render pool if there is none.
+        """
+        key = self.key(render_func, *args)
+        content = await asyncio.to_thread(self._read, key)
+        if content is None:
+            content = await pdf_renderer.render(render_func, *args)
+            try:
+                await asyncio.to_thread(self._write, key, content)
+            except OSError:
+                # A full or read-only cache directory must not fail the print
+                pass
+        return RenderedPdf(etag=key, content=content)
+
+
+def pdf_response(request: Request, pdf: RenderedPdf, filename: str) -> Response:
+    """
+    Sends a rendered PDF with its ETag, or 304 Not Modified when the client
+    already holds this version.
+    """
+    etag = f'"{pdf.etag}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return Response(content=pdf.content, media_type="application/pdf", headers=headers)
+
+
+pdf_cache = PdfCache(
+    Config.PDF_CACHE_DIR
+    or os.path.join(tempfile.gettempdir(), "smart_enterprise_pdf_cache"),
+    Config.PDF_CACHE_MAX_BYTES,
+)
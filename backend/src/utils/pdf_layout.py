@@ -0,0 +1,83 @@
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+
+@lru_cache(maxsize=65536)
+def text_width(text: str, font: str, font_size: float) -> float:
+    """
+    Memoized stringWidth. Prints reuse the same words (divisions, models,
+    names), so most lookups after the first few documents are hits.
+    """
+    return stringWidth(text, font, font_size)
+
+
+def wrap_text(
+    text, font: str, font_size: float, max_width: float
+) -> List[Tuple[str, float]]:
+    """
+    Splits text into lines no wider than max_width, breaking between words,
+    and returns each line with its width. A word wider than the column gets
+    a line of its own. Widths are summed from memoized word widths, which
+    matches stringWidth for the standard fonts as they have no kerning.
+    """
+    space = text_width(" ", font, font_size)
+    lines = []
+    line, line_width = "", 0.0
+    for word in str(text if text is not None else "").split():
+        width = text_width(word, font, font_size)
+        if not line:
+            line, line_width = word, width
+        elif line_width + space + width <= max_width:
+            line, line_width = f"{line} {word}", line_width + space + width
+        else:
+            lines.append((line, line_width))
+            line, line_width = word, width
+    if line:
+        lines.append((line, line_width))
+    return lines
+
+
+def draw_table(
+    can,
+    columns: Sequence[dict],
+    rows: Sequence[Sequence[str]],
+    y: float,
+    font: str,
+    font_size: float,
+    line_spacing: float,
+    min_row_height: float,
+    row_padding: float,
+    page_break_below: Optional[float] = None,
+    page_top: Optional[float] = None,
+) -> float:
+    """
+    Draws rows as a table of {"x", "width"} columns, starting at y. Each cell
+    is word-wrapped and its lines centred horizontally and vertically in the
+    row, which is as tall as its tallest cell. With page_break_below set, a
+    row that would end below it starts a new page at page_top instead.
+    Returns the y below the last row.
+    """
+    can.setFont(font, font_size)
+    for row in rows:
+        row_lines = [
+            wrap_text(text, font, font_size, col["width"])
+            for col, text in zip(columns, row)
+        ]
+        max_lines = max((len(lines) for lines in row_lines), default=0)
+        row_height = max(max_lines * line_spacing, min_row_height)
+
+        if page_break_below is not None and y - row_height < page_break_below:
+            can.showPage()
+            can.setFont(font, font_size)
+            y = page_top
+
+        for col, lines in zip(columns, row_lines):
+            vertical_offset = (row_height - len(lines) * line_spacing) / 2
+            for i, (line, width) in enumerate(lines):
+                center_x = col["x"] + col["width"] / 2 - width / 2
+                can.drawString(center_x, y - vertical_offset - i * line_spacing, line)
+
+        y -= row_height + row_padding
+    return y
@@ -0,0 +1,119 @@
+import asyncio
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+from config import Config
+from exceptions import PdfRenderTimeout
+from utils.pdf_templates import pdf_templates
+
+
+def _load_templates() -> None:
+    # Runs once in every worker process
+    pdf_templates.load_all()
+
+
+class PdfRenderer:
+    """
+    Runs PDF render functions in a pool of worker processes so the canvas
+    drawing, word wrapping and page merging never block the event loop.
+    A render function is a module-level function taking plain data and
+    returning the PDF bytes. Every worker parses the templates once on start.
+    """
+
+    def __init__(self, workers: int, timeout: float):
+        self.workers = workers
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._latencies: Deque[float] = deque(maxlen=256)  # seconds, newest last
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, as forking a process that runs an event loop and
+            # connection pool threads can deadlock the child
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_load_templates,
+            )
+        return self._executor
+
+    def start(self) -> None:
+        self._get_executor()
+
+    def restart(self) -> None:
+        """
+        Replaces the workers, so new renders use freshly loaded templates.
+        Renders already submitted finish on the old workers.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self._get_executor()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def render(self, render_func: Callable[..., bytes], *args: Any) -> bytes:
+        """
+        Runs render_func(*args) in the pool and returns its PDF bytes.
+        Raises PdfRenderTimeout if the PDF is not ready within the timeout,
+        counting time spent queued behind other renders.
+        """
+        future = self._get_executor().submit(render_func, *args)
+        self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            pdf = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            # A render that has not started is dropped; one already running
+            # finishes in its worker and the result is discarded
+            future.cancel()
+            self._timed_out += 1
+            raise PdfRenderTimeout()
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+        self._completed += 1
+        self._latencies.append(time.perf_counter() - start)
+        return pdf
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Queue depth and latency of recent renders, in milliseconds.
+        """
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not latencies:
+                return None
+            index = min(len(latencies) - 1, int(fraction * len(latencies)))
+            return round(latencies[index] * 1000, 1)
+
+        return {
+            "workers": self.workers,
+            "timeout_seconds": self.timeout,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.workers),
+            "completed": self._completed,
+            "failed": self._failed,
+            "timed_out": self._timed_out,
+            "latency_ms_p50": percentile(0.5),
+            "latency_ms_p95": percentile(0.95),
+            "latency_ms_max": percentile(1.0),
+        }
+
+
+pdf_renderer = PdfRenderer(
+    workers=Config.PDF_RENDER_WORKERS, timeout=Config.PDF_RENDER_TIMEOUT
+)
@@ -0,0 +1,269 @@
+import hashlib
+import io
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import pdfrw
+from pdfrw.buildxobj import pagexobj
+from pdfrw.toreportlab import makerl
+from PyPDF2 import PdfReader, PdfWriter
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from config import Config
+from utils.file_utils import safe_join
+
+STATIC_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "static")
+)
+
+# Every template a print path uses, by name
+TEMPLATES = (
+    "warranty_srf",
+    "out_of_warranty_srf",
+    "vendor_challan",
+    "retail",
+    "smart_challan",
+    "unique_challan",
+)
+
+# How a template's pages are combined with the text drawn for a print
+RENDER_MODE_MERGE = "merge"
+RENDER_MODE_FORM_XOBJECT = "form_xobject"
+
+# Draws the dynamic text of one page onto a reportlab canvas
+PageDraw = Callable[[canvas.Canvas], None]
+
+
+def _pdfrw_objects(root) -> List:
+    # Every dict and array reachable from root, resolving indirect references
+    found, seen, stack = [], set(), [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        if isinstance(obj, pdfrw.PdfDict):
+            stack.extend(obj.values())
+        elif isinstance(obj, pdfrw.PdfArray):
+            stack.extend(obj)
+        else:
+            continue
+        seen.add(id(obj))
+        found.append(obj)
+    return found
+
+
+def _overlay_page(draw: PageDraw):
+    packet = io.BytesIO()
+    # invariant=1 leaves out the creation date and random document ID, so the
+    # same draw always gives the same bytes
+    can = canvas.Canvas(packet, pagesize=A4, invariant=1)
+    draw(can)
+    can.save()
+    packet.seek(0)
+    return PdfReader(packet).pages[0]
+
+
+class PdfTemplate:
+    """
+    A template PDF parsed once, kept with the bytes and mtime it was read from.
+    In form XObject mode every page is also imported once as a form XObject.
+    """
+
+    def __init__(self, name: str, path: str, render_mode: str = RENDER_MODE_MERGE):
+        self.name = name
+        self.path = path
+        self.render_mode = render_mode
+        try:
+            with open(path, "rb") as f:
+                self.data = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Template PDF not found at {path}")
+        self.mtime = os.path.getmtime(path)
+        self.version = hashlib.sha256(self.data).hexdigest()
+        try:
+            self.reader = PdfReader(io.BytesIO(self.data))
+            if self.reader.is_encrypted:
+                raise ValueError("encrypted")
+            # Resolve every page now so a broken file fails here, not mid-print
+            self.pages = list(self.reader.pages)
+        except Exception as e:
+            raise ValueError(f"Template PDF {path} is not usable: {e}") from e
+        if not self.pages:
+            raise ValueError(f"Template PDF {path} has no pages")
+        self.forms = []
+        self._form_objects = []
+        if render_mode == RENDER_MODE_FORM_XOBJECT:
+            try:
+                pages = pdfrw.PdfReader(fdata=self.data).pages
+                self.forms = [pagexobj(page) for page in pages]
+                # Resolved up front, so rendering only ever reads them
+                self._form_objects = [
+                    obj for form in self.forms for obj in _pdfrw_objects(form)
+                ]
+            except Exception as e:
+                raise ValueError(
+                    f"Template PDF {path} cannot be imported as form XObjects: {e}"
+                ) from e
+
+
+class PdfTemplateRegistry:
+    """
+    Parsed template PDFs, loaded at startup or on first use and kept.
+    writer() hands out a PdfWriter holding copies of a template's pages, so
+    overlays merged for one request never touch the cached pages.
+
+    render() draws a print over a template in one of two modes, chosen per
+    template. "merge" draws the text into an overlay PDF, parses it back and
+    merges it onto copies of the template pages. "form_xobject" draws each
+    template page as a form XObject imported once, and the text on top of
+    it, in a single reportlab pass.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        names: Iterable[str],
+        form_xobject_names: Iterable[str] = (),
+    ):
+        self.directory = directory
+        self.names = tuple(names)
+        self.form_xobject_names = frozenset(form_xobject_names)
+        self._templates: Dict[str, PdfTemplate] = {}
+        # PdfReader reads objects from its stream lazily, which is not thread safe
+        self._lock = threading.Lock()
+
+    def render_mode(self, name: str) -> str:
+        if name in self.form_xobject_names:
+            return RENDER_MODE_FORM_XOBJECT
+        return RENDER_MODE_MERGE
+
+    def _load(self, name: str) -> PdfTemplate:
+        if name not in self.names:
+            raise KeyError(f"Unknown PDF template {name}")
+        template = PdfTemplate(
+            name, safe_join(self.directory, f"{name}.pdf"), self.render_mode(name)
+        )
+        self._templates[name] = template
+        return template
+
+    def load_all(self) -> None:
+        """
+        Loads and validates every template, raising on the first bad one.
+        """
+        unknown = self.form_xobject_names.difference(self.names)
+        if unknown:
+            raise KeyError(f"Unknown PDF templates {', '.join(sorted(unknown))}")
+        with self._lock:
+            for name in self.names:
+                self._load(name)
+
+    def reload(self, name: Optional[str] = None) -> None:
+        """
+        Re-reads one template, or all of them, from disk. A template that fails
+        to load keeps its previous version and the error is raised.
+        """
+        with self._lock:
+            for template_name in [name] if name else self.names:
+                self._load(template_name)
+
+    def get(self, name: str) -> PdfTemplate:
+        template = self._templates.get(name)
+        if template is None:
+            with self._lock:
+                template = self._templates.get(name) or self._load(name)
+        return template
+
+    def version(self) -> str:
+        """
+        Digest of every template's content and render mode, changing whenever
+        one is reloaded with different bytes or switched to the other mode.
+        """
+        digest = hashlib.sha256()
+        for name in self.names:
+            template = self.get(name)
+            digest.update(f"{template.version}:{template.render_mode}".encode())
+        return digest.hexdigest()
+
+    def writer(self, name: str) -> PdfWriter:
+        """
+        Returns a new PdfWriter with a copy of every page of the template.
+        """
+        template = self.get(name)
+        writer = PdfWriter()
+        with self._lock:
+            for page in template.pages:
+                writer.add_page(page)
+        return writer
+
+    def render(self, name: str, pages: Sequence[PageDraw]) -> bytes:
+        """
+        Draws pages[i] over page i of the template and returns the PDF. Pages
+        of the template beyond the list are kept as they are. Passing the
+        same function for several pages lets merge mode draw it only once.
+        A draw that breaks onto a new page loses that page in merge mode; in
+        form XObject mode it is kept, without the template behind it.
+        """
+        template = self.get(name)
+        if template.render_mode == RENDER_MODE_FORM_XOBJECT:
+            return self._render_forms(template, pages)
+
+        writer = self.writer(name)
+        overlays = {}
+        for page, draw in zip(writer.pages, pages):
+            if draw not in overlays:
+                overlays[draw] = _overlay_page(draw)
+            page.merge_page(overlays[draw])
+        output_stream = io.BytesIO()
+        writer.write(output_stream)
+        return output_stream.getvalue()
+
+    def _render_forms(self, template: PdfTemplate, pages: Sequence[PageDraw]) -> bytes:
+        packet = io.BytesIO()
+        can = canvas.Canvas(packet, pagesize=A4, invariant=1)
+        with self._lock:
+            form_names = [makerl(can, form) for form in template.forms]
+            # makerl caches what it converted on the shared template objects,
+            # keyed by this document; drop it or every print stays referenced
+            for obj in template._form_objects:
+                converted = getattr(obj, "derived_rl_obj", None)
+                if converted:
+                    converted.pop(can._doc, None)
+        for i, (form, form_name) in enumerate(zip(template.forms, form_names)):
+            x0, y0, x1, y1 = (float(v) for v in form.BBox)
+            can.setPageSize((x1 - x0, y1 - y0))
+            can.doForm(form_name)
+            if i < len(pages):
+                pages[i](can)
+            can.showPage()
+        can.save()
+        return packet.getvalue()
+
+    def status(self) -> Dict[str, dict]:
+        """
+        Loaded templates with their page count and whether the file on disk
+        has changed since it was read.
+        """
+        result = {}
+        for name in self.names:
+            template = self._templates.get(name)
+            if template is None:
+                result[name] = {"loaded": False}
+                continue
+            try:
+                changed = os.path.getmtime(template.path) != template.mtime
+            except OSError:
+                changed = True
+            result[name] = {
+                "loaded": True,
+                "pages": len(template.pages),
+                "render_mode": template.render_mode,
+                "changed_on_disk": changed,
+            }
+        return result
+
+
+pdf_templates = PdfTemplateRegistry(
+    STATIC_DIR, TEMPLATES, Config.PDF_FORM_XOBJECT_TEMPLATES
+)
@@ -0,0 +1,102 @@
+import gzip
+from decimal import Decimal
+from typing import Any, Awaitable, Callable
+
+import orjson
+import pydantic_core
+from fastapi import Request, status
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from config import Config
+
+
+def _default(obj: Any) -> Any:
+    # Types orjson does not serialize itself, encoded as jsonable_encoder does
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse serialized with orjson, which encodes dates, datetimes and
+    dataclasses natively. Pydantic models, alone or as a list, are written
+    straight to JSON by pydantic-core, as a response_model would be, without
+    building the intermediate dicts.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel) or (
+            isinstance(content, list) and content and isinstance(content[0], BaseModel)
+        ):
+            return pydantic_core.to_json(content)
+        return orjson.dumps(content, default=_default)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    # gzip, or failing that *, with a q-value above 0; "gzip;q=0" refuses it
+    qualities = {}
+    for entry in accept_encoding.split(","):
+        coding, *params = entry.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def list_response(request: Request, content: Any, count: int) -> Response:
+    """
+    Sends a list, or a page of count items, as a FastJSONResponse. Returning
+    it from a route skips the response_model round trip, so the service must
+    already return the response schema. Past Config.GZIP_MIN_ITEMS items the
+    body is gzip-compressed for clients that accept it.
+    """
+    response = FastJSONResponse(content=content)
+    if count <= Config.GZIP_MIN_ITEMS:
+        return response
+    response.headers["Vary"] = "Accept-Encoding"
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        response.body = gzip.compress(response.body, compresslevel=Config.GZIP_LEVEL)
+        response.headers["Content-Encoding"] = "gzip"
+        response.headers["Content-Length"] = str(len(response.body))
+    return response
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match names this ETag. The comparison is
+    weak, so a W/ prefix on either side is ignored.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags or "*" in tags
+
+
+async def versioned_list_response(
+    request: Request, etag: str, load: Callable[[], Awaitable[list]]
+) -> Response:
+    """
+    Sends a reference list with its version ETag, or 304 Not Modified without
+    calling load when the client already holds this version. Browsers keep
+    the list and revalidate it each time it is needed.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    content = await load()
+    response = list_response(request, content, len(content))
+    response.headers.update(headers)
+    return response
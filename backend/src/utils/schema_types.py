@@ -0,0 +1,15 @@
+from typing import Annotated
+
+from pydantic import BeforeValidator
+
+
+def _upper(value):
+    if isinstance(value, str):
+        return value.strip().upper()
+    return value
+
+
+# A string stored upper-cased, as the application keeps its data. Surrounding
+# whitespace is stripped and the value upper-cased before the field's own
+# constraints run, so a pattern like ^[A-Z0-9]{15}$ sees the normalized value
+Upper = Annotated[str, BeforeValidator(_upper)]
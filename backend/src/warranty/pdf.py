@@ -0,0 +1,64 @@
+from functools import partial
+from typing import Dict, List
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from utils.pdf_layout import draw_table
+from utils.pdf_templates import pdf_templates
+
+
+def _draw_overlay(
+    can: canvas.Canvas, header: Dict[str, str], rows: List[List[str]]
+) -> None:
+    width, height = A4
+
+    # Header details
+    can.setFont("Helvetica-Bold", 10)
+    can.drawString(140, 690, header["srf_no"])
+    can.drawString(485, 690, header["srf_date"])
+    can.drawString(375, 690, header["code"])
+    can.drawString(220, 651, header["name"])
+    can.drawString(220, 626, header["address"])
+    can.drawString(220, 601, header["contact1"])
+    can.drawString(475, 601, header["gst"])
+    can.drawString(375, 187, header["received_by"])
+
+    # Prepare columns with x positions and widths
+    column_defs = [
+        {"x": 40, "width": 20},
+        {"x": 70, "width": 50},
+        {"x": 135, "width": 124},
+        {"x": 263, "width": 97},
+        {"x": 365, "width": 105},
+        {"x": 472, "width": 98},
+    ]
+    draw_table(
+        can,
+        column_defs,
+        rows,
+        y=541,
+        font="Helvetica",
+        font_size=9,
+        line_spacing=10,
+        min_row_height=20,
+        row_padding=6,
+        page_break_below=100,
+        page_top=height - 50,
+    )
+
+
+def render_warranty_srf(
+    header: Dict[str, str], page1_rows: List[List[str]], page2_rows: List[List[str]]
+) -> bytes:
+    """
+    Renders the two-page warranty SRF: the customer copy from page1_rows and
+    the ASC copy from page2_rows, over the warranty_srf template.
+    """
+    return pdf_templates.render(
+        "warranty_srf",
+        [
+            partial(_draw_overlay, header=header, rows=page1_rows),
+            partial(_draw_overlay, header=header, rows=page2_rows),
+        ],
+    )
@@ -1,28 +1,35 @@
 from datetime import date
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from auth.dependencies import AccessTokenBearer, RoleChecker
+from config import Config
+from counter.service import ListVersionService
 from db.db import get_session
-from exceptions import WarrantyNotFound
+from exceptions import InvalidCursor, WarrantyNotFound
+from utils.export_utils import export_response
+from utils.pdf_cache import pdf_response
+from utils.responses import list_response, versioned_list_response
 from warranty.schemas import (
     UpdateSRFFinalSettlement,
     UpdateSRFUnsettled,
     WarrantyCreate,
-    WarrantyEnquiry,
+    WarrantyEnquiryPage,
     WarrantyPending,
+    WarrantySrfBatchPrint,
     WarrantySrfNumber,
     WarrantySRFSettleRecord,
     WarrantyUpdate,
     WarrantyUpdateResponse,
 )
-from warranty.service import WarrantyService
+from warranty.service import ENQUIRY_EXPORT_COLUMNS, WarrantyService
 
 warranty_router = APIRouter()
 warranty_service = WarrantyService()
+list_version_service = ListVersionService()
 access_token_bearer = AccessTokenBearer()
 role_checker = Depends(RoleChecker(allowed_roles=["ADMIN"]))
 
@@ -71,10 +78,12 @@ List all not received warranty records.
     status_code=status.HTTP_200_OK,
 )
 async def list_warranty_pending(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
     pending = await warranty_service.list_warranty_pending(session)
-    return pending
+    return list_response(request, pending, len(pending))
 
 
 """
@@ -134,10 +143,14 @@ List distinct delivered_by names
     "/list_delivered_by", response_model=List, status_code=status.HTTP_200_OK
 )
 async def list_delivered_by(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
-    names = await warranty_service.list_delivered_by(session)
-    return names
+    etag = await list_version_service.etag("delivered_by", session)
+    return await versioned_list_response(
+        request, etag, lambda: warranty_service.list_delivered_by(session)
+    )
 
 
 """
@@ -160,30 +173,43 @@ Print srf by srf number.
 
 @warranty_router.post("/srf_print", status_code=status.HTTP_200_OK)
 async def print_srf(
+    request: Request,
     data: WarrantySrfNumber,
     session: AsyncSession = Depends(get_session),
     token=Depends(access_token_bearer),
 ):
     srf_pdf = await warranty_service.print_srf(data.srf_number, token, session)
-    return StreamingResponse(
-        srf_pdf,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="{data.srf_number}.pdf"'
-        },
-    )
+    return pdf_response(request, srf_pdf, f"{data.srf_number}.pdf")
 
 
 """
-Warranty enquiry using query parameters.
+Print several srfs, by list or from/to range, as one PDF.
+"""
+
+
+@warranty_router.post("/srf_print_batch", status_code=status.HTTP_200_OK)
+async def print_srf_batch(
+    request: Request,
+    data: WarrantySrfBatchPrint,
+    session: AsyncSession = Depends(get_session),
+    token=Depends(access_token_bearer),
+):
+    srf_pdf = await warranty_service.print_srf_batch(data, token, session)
+    return pdf_response(request, srf_pdf, "srf_batch.pdf")
+
+
+"""
+Warranty enquiry using query parameters, one page at a time.
+Pass next_cursor back as cursor to fetch the following page.
 
  """
 
 
 @warranty_router.get(
-    "/enquiry", response_model=List[WarrantyEnquiry], status_code=status.HTTP_200_OK
+    "/enquiry", response_model=WarrantyEnquiryPage, status_code=status.HTTP_200_OK
 )
 async def enquiry_warranty(
+    request: Request,
     final_status: Optional[str] = None,
     final_settled: Optional[str] = None,
     vendor_settled: Optional[str] = None,
@@ -196,6 +222,9 @@ async def enquiry_warranty(
     received: Optional[str] = None,
     repaired: Optional[str] = None,
     head: Optional[str] = None,
+    limit: int = Query(Config.ENQUIRY_PAGE_SIZE, ge=1, le=Config.ENQUIRY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    with_total: bool = False,
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
@@ -214,10 +243,61 @@ async def enquiry_warranty(
             received,
             repaired,
             head,
+            limit,
+            cursor,
+            with_total,
         )
-        return result
+        return list_response(request, result, len(result.items))
+    except InvalidCursor:
+        raise
     except:
-        return []
+        # An empty later page would pass for the end of the list
+        if cursor:
+            raise
+        return WarrantyEnquiryPage(items=[])
+
+
+"""
+Export every warranty record matching the enquiry filters as CSV or XLSX,
+streamed as the rows are read.
+
+ """
+
+
+@warranty_router.get("/enquiry_export", status_code=status.HTTP_200_OK)
+async def export_warranty(
+    final_status: Optional[str] = None,
+    final_settled: Optional[str] = None,
+    vendor_settled: Optional[str] = None,
+    name: Optional[str] = None,
+    division: Optional[str] = None,
+    from_srf_date: Optional[date] = None,
+    to_srf_date: Optional[date] = None,
+    serial_number: Optional[str] = None,
+    delivered: Optional[str] = None,
+    received: Optional[str] = None,
+    repaired: Optional[str] = None,
+    head: Optional[str] = None,
+    file_format: Literal["csv", "xlsx"] = "csv",
+    _=Depends(access_token_bearer),
+):
+    rows = warranty_service.export_warranty(
+        final_status=final_status,
+        final_settled=final_settled,
+        vendor_settled=vendor_settled,
+        name=name,
+        division=division,
+        from_srf_date=from_srf_date,
+        to_srf_date=to_srf_date,
+        serial_number=serial_number,
+        delivered=delivered,
+        received=received,
+        repaired=repaired,
+        head=head,
+    )
+    return export_response(
+        "warranty_enquiry", ENQUIRY_EXPORT_COLUMNS, rows, file_format
+    )
 
 
 """
@@ -231,10 +311,12 @@ List all unsettled srf records.
     status_code=status.HTTP_200_OK,
 )
 async def list_srf_unsettled(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
     unsettled = await warranty_service.list_srf_not_settled(session)
-    return unsettled
+    return list_response(request, unsettled, len(unsettled))
 
 
 """
@@ -248,8 +330,10 @@ async def update_srf_unsettled(
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
-    await warranty_service.update_srf_unsettled(list_srf, session)
-    return JSONResponse(content={"message": f"SRF Records Proposed for Settlement"})
+    missing = await warranty_service.update_srf_unsettled(list_srf, session)
+    return JSONResponse(
+        content={"message": f"SRF Records Proposed for Settlement", "missing": missing}
+    )
 
 
 """
@@ -264,10 +348,12 @@ List all final srf settlement records
     dependencies=[role_checker],
 )
 async def list_final_srf_settlement(
-    session: AsyncSession = Depends(get_session), _=Depends(access_token_bearer)
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    _=Depends(access_token_bearer),
 ):
     final_settlement = await warranty_service.list_final_srf_settlement(session)
-    return final_settlement
+    return list_response(request, final_settlement, len(final_settlement))
 
 
 """
@@ -285,5 +371,7 @@ async def update_final_srf_settlement(
     session: AsyncSession = Depends(get_session),
     _=Depends(access_token_bearer),
 ):
-    await warranty_service.update_final_srf_settlement(list_srf, session)
-    return JSONResponse(content={"message": f"Vendor Records Settled"})
+    missing = await warranty_service.update_final_srf_settlement(list_srf, session)
+    return JSONResponse(
+        content={"message": f"Vendor Records Settled", "missing": missing}
+    )
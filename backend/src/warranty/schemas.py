@@ -3,25 +3,27 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from utils.schema_types import Upper
+
 
 class WarrantyCreate(BaseModel):
-    srf_number: str = Field(..., max_length=8)
-    name: str = Field(..., max_length=40)
+    srf_number: Upper = Field(..., max_length=8)
+    name: Upper = Field(..., max_length=40)
     srf_date: date
-    head: str = Field(..., max_length=15)
-    division: str = Field(..., max_length=15)
-    model: str = Field(..., max_length=30)
-    serial_number: str = Field(..., max_length=20)
-    problem: str = Field(..., max_length=30)
-    remark: Optional[str] = Field(None, max_length=40)
-    sticker_number: Optional[str] = Field(None, max_length=15)
-    asc_name: Optional[str] = Field(None, max_length=30)
-    complaint_number: Optional[str] = Field(None, max_length=15)
-    dealer_name: Optional[str] = Field(None, max_length=30)
+    head: Upper = Field(..., max_length=15)
+    division: Upper = Field(..., max_length=15)
+    model: Upper = Field(..., max_length=30)
+    serial_number: Upper = Field(..., max_length=20)
+    problem: Upper = Field(..., max_length=30)
+    remark: Optional[Upper] = Field(None, max_length=40)
+    sticker_number: Optional[Upper] = Field(None, max_length=15)
+    asc_name: Optional[Upper] = Field(None, max_length=30)
+    complaint_number: Optional[Upper] = Field(None, max_length=15)
+    dealer_name: Optional[Upper] = Field(None, max_length=30)
     rpm: Optional[int]
-    purchase_number: Optional[str] = Field(None, max_length=15)
+    purchase_number: Optional[Upper] = Field(None, max_length=15)
     purchase_date: Optional[date]
-    customer_challan_number: str = Field(..., max_length=15)
+    customer_challan_number: Upper = Field(..., max_length=15)
     customer_challan_date: date
 
 
@@ -38,13 +40,25 @@ class WarrantyEnquiry(BaseModel):
     contact2: Optional[str]
 
 
+class WarrantyEnquiryPage(BaseModel):
+    items: List[WarrantyEnquiry]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
 class WarrantyPending(BaseModel):
     srf_number: str
     name: str
 
 
 class WarrantySrfNumber(BaseModel):
-    srf_number: str
+    srf_number: Upper
+
+
+class WarrantySrfBatchPrint(BaseModel):
+    srf_numbers: List[Upper] = []
+    from_srf_number: Optional[Upper] = None
+    to_srf_number: Optional[Upper] = None
 
 
 class WarrantyUpdateResponse(BaseModel):
@@ -111,34 +125,34 @@ class WarrantyUpdate(BaseModel):
     vendor_cost1: Optional[float]
     vendor_cost2: Optional[float]
     repair_date: Optional[date]
-    rewinding_done: str = Field(..., max_length=1)
+    rewinding_done: Upper = Field(..., max_length=1)
     rewinding_cost: Optional[float]
     other_cost: Optional[float]
-    work_done: Optional[str] = Field(None, max_length=50)
-    vendor_paint: str = Field(..., max_length=1)
-    vendor_stator: str = Field(..., max_length=1)
-    vendor_leg: str = Field(..., max_length=1)
+    work_done: Optional[Upper] = Field(None, max_length=50)
+    vendor_paint: Upper = Field(..., max_length=1)
+    vendor_stator: Upper = Field(..., max_length=1)
+    vendor_leg: Upper = Field(..., max_length=1)
     vendor_paint_cost: Optional[int]
     vendor_stator_cost: Optional[int]
     vendor_leg_cost: Optional[int]
     vendor_cost: Optional[float]
-    spare1: Optional[str] = Field(None, max_length=20)
+    spare1: Optional[Upper] = Field(None, max_length=20)
     cost1: Optional[float]
-    spare2: Optional[str] = Field(None, max_length=20)
+    spare2: Optional[Upper] = Field(None, max_length=20)
     cost2: Optional[float]
-    spare3: Optional[str] = Field(None, max_length=20)
+    spare3: Optional[Upper] = Field(None, max_length=20)
     cost3: Optional[float]
-    spare4: Optional[str] = Field(None, max_length=20)
+    spare4: Optional[Upper] = Field(None, max_length=20)
     cost4: Optional[float]
-    spare5: Optional[str] = Field(None, max_length=20)
+    spare5: Optional[Upper] = Field(None, max_length=20)
     cost5: Optional[float]
-    spare6: Optional[str] = Field(None, max_length=20)
+    spare6: Optional[Upper] = Field(None, max_length=20)
     cost6: Optional[float]
     spare_cost: Optional[float]
     godown_cost: Optional[float]
     discount: Optional[float]
     total: Optional[float]
-    gst: str = Field(..., max_length=1)
+    gst: Upper = Field(..., max_length=1)
     gst_amount: Optional[float]
     round_off: Optional[float]
     final_amount: Optional[float]
@@ -146,10 +160,10 @@ class WarrantyUpdate(BaseModel):
     delivery_date: Optional[date]
     pc_number: Optional[int]
     invoice_number: Optional[int]
-    complaint_number: Optional[str] = Field(None, max_length=15)
+    complaint_number: Optional[Upper] = Field(None, max_length=15)
     cg_srf_number: Optional[int]
-    final_status: str = Field(..., max_length=1)
-    chargeable: str = Field(..., max_length=1)
+    final_status: Upper = Field(..., max_length=1)
+    chargeable: Upper = Field(..., max_length=1)
 
 
 class WarrantySRFSettleRecord(BaseModel):
@@ -164,10 +178,10 @@ class WarrantySRFSettleRecord(BaseModel):
 
 
 class UpdateSRFUnsettled(BaseModel):
-    srf_number: str
+    srf_number: Upper
     settlement_date: date
 
 
 class UpdateSRFFinalSettlement(BaseModel):
-    srf_number: str
-    final_settled: str = Field(..., max_length=1)
+    srf_number: Upper
+    final_settled: Upper = Field(..., max_length=1)
@@ -1,17 +1,14 @@
-import io
-import os
 from datetime import date, timedelta
-from typing import List, Optional
+from itertools import groupby
+from typing import AsyncIterator, List, Optional
 
-from PyPDF2 import PdfReader, PdfWriter
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfbase.pdfmetrics import stringWidth
-from reportlab.pdfgen import canvas
 from sqlalchemy import case, func, select
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from complaint_number.service import ComplaintNumberService
+from config import Config
+from counter.service import CounterService
+from db.db import async_session_maker
 from exceptions import (
     ComplaintNumberAlreadyExists,
     IncorrectCodeFormat,
@@ -23,19 +20,31 @@ from exceptions import (
 )
 from master.models import Master
 from master.service import MasterService
+from menu.cache import dashboard_cache
 from model.service import ModelService
 from service_center.service import ServiceCenterService
 from cg_srf_number.service import CGSRFNumberService
-from utils.date_utils import format_date_ddmmyyyy, parse_date
-from utils.file_utils import safe_join, split_text_to_lines
+from utils.date_utils import (
+    format_date_ddmmyyyy,
+    parse_date,
+    sql_format_date_ddmmyyyy,
+)
+from utils.batch_print import batch_filter, render_batch
+from utils.bulk_update import bulk_update
+from utils.entity_loader import entity_loader
+from utils.pagination import paginate
+from utils.pdf_cache import RenderedPdf, pdf_cache
 from warranty.models import Warranty
+from warranty.pdf import render_warranty_srf
 from warranty.schemas import (
     UpdateSRFFinalSettlement,
     UpdateSRFUnsettled,
     WarrantyCreate,
     WarrantyEnquiry,
+    WarrantyEnquiryPage,
     WarrantyPending,
     WarrantySRFSettleRecord,
+    WarrantySrfBatchPrint,
     WarrantyUpdate,
     WarrantyUpdateResponse,
 )
@@ -45,30 +54,27 @@ service_center_service = ServiceCenterService()
 model_service = ModelService()
 complaint_number_service = ComplaintNumberService()
 cg_srf_number_service = CGSRFNumberService()
+counter_service = CounterService()
+
+ENQUIRY_EXPORT_COLUMNS = [
+    "SRF Number",
+    "SRF Date",
+    "Name",
+    "Model",
+    "Serial Number",
+    "Receive Date",
+    "Repair Date",
+    "Delivery Date",
+    "Final Status",
+    "Contact 1",
+    "Contact 2",
+]
 
 
 class WarrantyService:
 
     async def get_next_base_number(self, session: AsyncSession) -> int:
-        statement = select(Warranty.srf_number)
-        result = await session.execute(statement)
-        srf_numbers = [
-            row[0]
-            for row in result.fetchall()
-            if row[0] and row[0].startswith("R") and "/" in row[0]
-        ]
-        base_numbers = []
-        for srf in srf_numbers:
-            base, _ = srf.split("/")
-            try:
-                base_num = int(base[1:])
-                base_numbers.append(base_num)
-            except ValueError:
-                continue
-        if base_numbers:
-            return max(base_numbers) + 1
-        else:
-            return 1
+        return await counter_service.next_number("R", session)
 
     async def create_warranty(
         self, session: AsyncSession, warranty: WarrantyCreate, token: dict
@@ -86,67 +92,42 @@ class WarrantyService:
             ):
                 raise ModelNotFound()
 
-        # If frontend requests a new base, generate next base number
-        base_part = parts[0]
-        if base_part == "NEW":
-            for _ in range(3):  # Retry up to 3 times
-                next_base = await self.get_next_base_number(session)
-                srf_number = f"R{str(next_base).zfill(5)}/1"
-                warranty_data_dict = warranty.model_dump()
-                warranty_data_dict["srf_number"] = srf_number
-                master = await master_service.get_master_by_name(warranty.name, session)
-                if warranty.head == "REPLACE":
-                    await service_center_service.check_service_center_name_available(
-                        warranty.asc_name, session
-                    )
-                warranty_data_dict["created_by"] = token["user"]["username"]
-                warranty_data_dict["code"] = master.code
-                for date_field in [
-                    "srf_date",
-                    "purchase_date",
-                    "customer_challan_date",
-                ]:
-                    if date_field in warranty_data_dict:
-                        warranty_data_dict[date_field] = parse_date(
-                            warranty_data_dict[date_field]
-                        )
-                warranty_data_dict.pop("name", None)
-                new_warranty = Warranty(**warranty_data_dict)
-                session.add(new_warranty)
-                try:
-                    await session.commit()
-                    return new_warranty
-                except IntegrityError:
-                    await session.rollback()
-        else:
-            # Use the base provided by frontend, just validate sub-number
-            warranty_data_dict = warranty.model_dump()
-            master = await master_service.get_master_by_name(warranty.name, session)
-            if warranty.head == "REPLACE":
-                await service_center_service.check_service_center_name_available(
-                    warranty.asc_name, session
+        warranty_data_dict = warranty.model_dump()
+        master = await master_service.get_master_by_name(warranty.name, session)
+        if warranty.head == "REPLACE":
+            await service_center_service.check_service_center_name_available(
+                warranty.asc_name, session
+            )
+        warranty_data_dict["created_by"] = token["user"]["username"]
+        warranty_data_dict["code"] = master.code
+        for date_field in ["srf_date", "purchase_date", "customer_challan_date"]:
+            if date_field in warranty_data_dict:
+                warranty_data_dict[date_field] = parse_date(
+                    warranty_data_dict[date_field]
                 )
-            warranty_data_dict["created_by"] = token["user"]["username"]
-            warranty_data_dict["code"] = master.code
-            for date_field in ["srf_date", "purchase_date", "customer_challan_date"]:
-                if date_field in warranty_data_dict:
-                    warranty_data_dict[date_field] = parse_date(
-                        warranty_data_dict[date_field]
-                    )
-            warranty_data_dict.pop("name", None)
-            new_warranty = Warranty(**warranty_data_dict)
-            session.add(new_warranty)
-            await session.commit()
-            return new_warranty
+        warranty_data_dict.pop("name", None)
+
+        # If frontend requests a new base, allocate the next base number,
+        # otherwise use the base provided by frontend
+        if parts[0] == "NEW":
+            next_base = await self.get_next_base_number(session)
+            warranty_data_dict["srf_number"] = f"R{str(next_base).zfill(5)}/1"
+
+        new_warranty = Warranty(**warranty_data_dict)
+        session.add(new_warranty)
+        await session.commit()
+        dashboard_cache.invalidate("warranty", "master")
+        return new_warranty
 
     async def warranty_next_code(self, session: AsyncSession):
-        next_base_number = await self.get_next_base_number(session)
-        next_srf_number = "R" + str(next_base_number).zfill(5)
-        return next_srf_number
+        return await counter_service.peek_next_code("R", 5, session)
 
     async def list_warranty_pending(self, session: AsyncSession):
         statement = (
-            select(Warranty, Master)
+            select(
+                Warranty.srf_number,
+                Master.name,
+            )
             .join(Master, Warranty.code == Master.code)
             .where(Warranty.final_status == "N")
             .order_by(Warranty.srf_number)
@@ -155,8 +136,8 @@ class WarrantyService:
         rows = result.all()
         return [
             WarrantyPending(
-                srf_number=row.Warranty.srf_number,
-                name=row.Master.name,
+                srf_number=row.srf_number,
+                name=row.name,
             )
             for row in rows
         ]
@@ -178,6 +159,8 @@ class WarrantyService:
         result = await session.execute(statement)
         row = result.first()
         if row:
+            # update_warranty loads the same record next
+            entity_loader(session).prime(Warranty.srf_number, srf_number, row.Warranty)
             return WarrantyUpdateResponse(
                 srf_number=row.Warranty.srf_number,
                 name=row.name,
@@ -248,9 +231,9 @@ class WarrantyService:
         session: AsyncSession,
         token: dict,
     ):
-        statement = select(Warranty).where(Warranty.srf_number == srf_number)
-        result = await session.execute(statement)
-        existing_warranty = result.scalars().first()
+        existing_warranty = await entity_loader(session).load(
+            Warranty.srf_number, srf_number
+        )
         if not existing_warranty:
             raise WarrantyNotFound()
         if warranty.complaint_number:
@@ -277,6 +260,7 @@ class WarrantyService:
         existing_warranty.updated_by = token["user"]["username"]
         session.add(existing_warranty)
         await session.commit()
+        dashboard_cache.invalidate("warranty")
         await session.refresh(existing_warranty)
         return existing_warranty
 
@@ -291,17 +275,11 @@ class WarrantyService:
         return names
 
     async def last_srf_number(self, session: AsyncSession):
-        statement = (
-            select(Warranty.srf_number).order_by(Warranty.srf_number.desc()).limit(1)
-        )
-        result = await session.execute(statement)
-        last_srf_number = result.scalar()
-        last_srf_number = last_srf_number.split("/")[0] if last_srf_number else None
-        return last_srf_number
+        return await counter_service.last_code("R", 5, session)
 
     async def print_srf(
         self, srf_number: str, token: dict, session: AsyncSession
-    ) -> io.BytesIO:
+    ) -> RenderedPdf:
 
         # Normalize input SRF number
         if len(srf_number) > 6:
@@ -322,6 +300,50 @@ class WarrantyService:
         if not rows:
             raise WarrantyNotFound()
 
+        return await pdf_cache.render(
+            render_warranty_srf, *self._srf_document(rows, token["user"]["username"])
+        )
+
+    async def print_srf_batch(
+        self, data: WarrantySrfBatchPrint, token: dict, session: AsyncSession
+    ) -> RenderedPdf:
+        """
+        Prints a list or a range of SRFs as one PDF, from a single query.
+        """
+        srf_filter = batch_filter(
+            Warranty.srf_number,
+            "R",
+            data.srf_numbers,
+            data.from_srf_number,
+            data.to_srf_number,
+            suffixed=True,
+        )
+        statement = (
+            select(Warranty, Master)
+            .join(Master, Warranty.code == Master.code)
+            .where(srf_filter)
+            .order_by(Warranty.srf_number)
+        )
+        result = await session.execute(statement)
+        rows = result.fetchall()
+
+        if not rows:
+            raise WarrantyNotFound()
+
+        received_by = token["user"]["username"]
+        srf_groups = groupby(rows, key=lambda row: row.Warranty.srf_number[:6])
+        return await render_batch(
+            [
+                (render_warranty_srf, self._srf_document(list(srf_rows), received_by))
+                for _, srf_rows in srf_groups
+            ]
+        )
+
+    def _srf_document(self, rows, received_by: str):
+        """
+        Header and table rows of both pages of one SRF, from its
+        (Warranty, Master) rows.
+        """
         # Extract master and warranty details from the first row
         first_row = rows[0]
         warranty = first_row.Warranty
@@ -330,13 +352,11 @@ class WarrantyService:
         srf_no = warranty.srf_number[:6]
         srf_date = warranty.srf_date.strftime("%d-%m-%Y") if warranty.srf_date else ""
         code = warranty.code
-        master_code = master.code
-        master_details = await master_service.get_master_details(master_code, session)
+        master_details = master_service.master_details(master)
         name = master_details["name"]
         address = master_details["full_address"]
         contact1 = master_details["contact1"]
         gst = master_details.get("gst", "") or ""
-        received_by = token["user"]["username"]
 
         # Prepare table rows for pages
         page1_rows = []
@@ -367,113 +387,21 @@ class WarrantyService:
                 ]
             )
 
-        def generate_overlay(rows, columns):
-            packet = io.BytesIO()
-            can = canvas.Canvas(packet, pagesize=(595.27, 841.89))  # A4 in points
-            width, height = 595.27, 841.89
-
-            # Header details
-            can.setFont("Helvetica-Bold", 10)
-            can.drawString(140, 690, srf_no)
-            can.drawString(485, 690, srf_date)
-            can.drawString(375, 690, code)
-            can.drawString(220, 651, name)
-            can.drawString(220, 626, address)
-            can.drawString(220, 601, contact1)
-            can.drawString(475, 601, gst)
-            can.drawString(375, 187, received_by)
-
-            start_y = 541
-            y = start_y
-            line_spacing = 10
-            min_row_height = 20
-            row_padding = 6
-
-            # Prepare columns with x positions and widths
-            column_defs = [
-                {"x": 40, "width": 20},
-                {"x": 70, "width": 50},
-                {"x": 135, "width": 124},
-                {"x": 263, "width": 97},
-                {"x": 365, "width": 105},
-                {"x": 472, "width": 98},
-            ]
-            can.setFont("Helvetica", 9)
-
-            for row in rows:
-                row_lines = []
-                for col_def, text in zip(column_defs, row):
-                    words = str(text).split()
-                    lines = []
-                    line = ""
-                    for word in words:
-                        test_line = line + (" " if line else "") + word
-                        if stringWidth(test_line, "Helvetica", 9) <= col_def["width"]:
-                            line = test_line
-                        else:
-                            lines.append(line)
-                            line = word
-                    if line:
-                        lines.append(line)
-                    row_lines.append(lines)
-
-                max_lines = max(len(lines) for lines in row_lines)
-                row_height = max(max_lines * line_spacing, min_row_height)
-
-                if y - row_height < 100:  # simple page break
-                    can.showPage()
-                    can.setFont("Helvetica", 9)
-                    y = height - 50
-
-                for col_def, lines in zip(column_defs, row_lines):
-                    total_text_height = len(lines) * line_spacing
-                    vertical_offset = (row_height - total_text_height) / 2
-                    for i, ln in enumerate(lines):
-                        text_width = stringWidth(ln, "Helvetica", 9)
-                        center_x = col_def["x"] + col_def["width"] / 2 - text_width / 2
-                        y_position = y - vertical_offset - (i * line_spacing)
-                        can.drawString(center_x, y_position, ln)
-
-                y -= row_height + row_padding
-
-            can.save()
-            packet.seek(0)
-            return PdfReader(packet)
-
-        overlay_customer = generate_overlay(page1_rows, columns=6)
-        overlay_asc = generate_overlay(page2_rows, columns=6)
-
-        # Read the template PDF
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        static_dir = os.path.normpath(os.path.join(base_dir, "..", "static"))
-        template_path = safe_join(static_dir, "warranty_srf.pdf")
-        try:
-            with open(template_path, "rb") as f:
-                template_bytes = f.read()
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Template PDF not found at {template_path}")
-
-        template_pdf = PdfReader(io.BytesIO(template_bytes))
-        writer = PdfWriter()
-
-        # Merge overlays
-        page1 = template_pdf.pages[0]
-        page1.merge_page(overlay_customer.pages[0])
-        writer.add_page(page1)
-
-        if len(template_pdf.pages) > 1:
-            page2 = template_pdf.pages[1]
-            page2.merge_page(overlay_asc.pages[0])
-            writer.add_page(page2)
-
-        output_stream = io.BytesIO()
-        writer.write(output_stream)
-        output_stream.seek(0)
-        return output_stream
-
-    async def enquiry_warranty(
+        header = {
+            "srf_no": srf_no,
+            "srf_date": srf_date,
+            "code": code,
+            "name": name,
+            "address": address,
+            "contact1": contact1,
+            "gst": gst,
+            "received_by": received_by,
+        }
+        return header, page1_rows, page2_rows
+
+    def filter_enquiry(
         self,
-        session: AsyncSession,
+        statement,
         final_status: Optional[str] = None,
         final_settled: Optional[str] = None,
         vendor_settled: Optional[str] = None,
@@ -488,8 +416,6 @@ class WarrantyService:
         head: Optional[str] = None,
     ):
 
-        statement = select(Warranty, Master).join(Master, Warranty.code == Master.code)
-
         if final_status:
             statement = statement.where(Warranty.final_status == final_status)
 
@@ -549,39 +475,123 @@ class WarrantyService:
 
         if head:
             statement = statement.where(Warranty.head == head)
-        statement = statement.order_by(Warranty.srf_number)
+        return statement
 
-        result = await session.execute(statement)
-        rows = result.all()
-
-        return [
+    async def enquiry_warranty(
+        self,
+        session: AsyncSession,
+        final_status: Optional[str] = None,
+        final_settled: Optional[str] = None,
+        vendor_settled: Optional[str] = None,
+        name: Optional[str] = None,
+        division: Optional[str] = None,
+        from_srf_date: Optional[date] = None,
+        to_srf_date: Optional[date] = None,
+        serial_number: Optional[str] = None,
+        delivered: Optional[str] = None,
+        received: Optional[str] = None,
+        repaired: Optional[str] = None,
+        head: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+    ) -> WarrantyEnquiryPage:
+        statement = self.filter_enquiry(
+            select(
+                Warranty.srf_number,
+                sql_format_date_ddmmyyyy(Warranty.srf_date),
+                Master.name,
+                Warranty.model,
+                Warranty.serial_number,
+                sql_format_date_ddmmyyyy(Warranty.receive_date, ""),
+                sql_format_date_ddmmyyyy(Warranty.repair_date, ""),
+                sql_format_date_ddmmyyyy(Warranty.delivery_date, ""),
+                Master.contact1,
+                Master.contact2,
+            ).join(Master, Warranty.code == Master.code),
+            final_status=final_status,
+            final_settled=final_settled,
+            vendor_settled=vendor_settled,
+            name=name,
+            division=division,
+            from_srf_date=from_srf_date,
+            to_srf_date=to_srf_date,
+            serial_number=serial_number,
+            delivered=delivered,
+            received=received,
+            repaired=repaired,
+            head=head,
+        )
+        rows, next_cursor, total = await paginate(
+            session, statement, Warranty.srf_number, limit, cursor, with_total
+        )
+        items = [
             WarrantyEnquiry(
-                srf_number=row.Warranty.srf_number,
-                srf_date=format_date_ddmmyyyy(row.Warranty.srf_date),
-                name=row.Master.name,
-                model=row.Warranty.model,
-                receive_date=(
-                    format_date_ddmmyyyy(row.Warranty.receive_date)
-                    if row.Warranty.receive_date
-                    else ""
-                ),
-                repair_date=(
-                    format_date_ddmmyyyy(row.Warranty.repair_date)
-                    if row.Warranty.repair_date
-                    else ""
-                ),
-                delivery_date=(
-                    format_date_ddmmyyyy(row.Warranty.delivery_date)
-                    if row.Warranty.delivery_date
-                    else ""
-                ),
-                final_status=row.Warranty.final_status,
-                serial_number=row.Warranty.serial_number,
-                contact1=row.Master.contact1,
-                contact2=row.Master.contact2,
+                srf_number=row.srf_number,
+                srf_date=row.srf_date,
+                name=row.name,
+                model=row.model,
+                receive_date=row.receive_date,
+                repair_date=row.repair_date,
+                delivery_date=row.delivery_date,
+                serial_number=row.serial_number,
+                contact1=row.contact1,
+                contact2=row.contact2,
             )
             for row in rows
         ]
+        return WarrantyEnquiryPage(items=items, next_cursor=next_cursor, total=total)
+
+    async def export_warranty(
+        self,
+        final_status: Optional[str] = None,
+        final_settled: Optional[str] = None,
+        vendor_settled: Optional[str] = None,
+        name: Optional[str] = None,
+        division: Optional[str] = None,
+        from_srf_date: Optional[date] = None,
+        to_srf_date: Optional[date] = None,
+        serial_number: Optional[str] = None,
+        delivered: Optional[str] = None,
+        received: Optional[str] = None,
+        repaired: Optional[str] = None,
+        head: Optional[str] = None,
+    ) -> AsyncIterator[tuple]:
+        statement = self.filter_enquiry(
+            select(
+                Warranty.srf_number,
+                sql_format_date_ddmmyyyy(Warranty.srf_date),
+                Master.name,
+                Warranty.model,
+                Warranty.serial_number,
+                sql_format_date_ddmmyyyy(Warranty.receive_date),
+                sql_format_date_ddmmyyyy(Warranty.repair_date),
+                sql_format_date_ddmmyyyy(Warranty.delivery_date),
+                Warranty.final_status,
+                Master.contact1,
+                Master.contact2,
+            ).join(Master, Warranty.code == Master.code),
+            final_status=final_status,
+            final_settled=final_settled,
+            vendor_settled=vendor_settled,
+            name=name,
+            division=division,
+            from_srf_date=from_srf_date,
+            to_srf_date=to_srf_date,
+            serial_number=serial_number,
+            delivered=delivered,
+            received=received,
+            repaired=repaired,
+            head=head,
+        ).order_by(Warranty.srf_number)
+
+        # Own session, since the stream outlives the request handler
+        async with async_session_maker() as session:
+            result = await session.stream(
+                statement.execution_options(yield_per=Config.EXPORT_BATCH_SIZE)
+            )
+            async for row in result:
+                yield tuple(row)
 
     async def check_complaint_number_available(
         self, complaint_number: str, srf_number: str, session: AsyncSession
@@ -611,7 +621,16 @@ class WarrantyService:
 
     async def list_srf_not_settled(self, session: AsyncSession):
         statement = (
-            select(Warranty, Master)
+            select(
+                Warranty.srf_number,
+                Master.name,
+                Warranty.model,
+                Warranty.delivery_date,
+                Warranty.final_amount,
+                Warranty.received_by,
+                Warranty.pc_number,
+                Warranty.invoice_number,
+            )
             .join(Master, Warranty.code == Master.code)
             .where(
                 (Warranty.chargeable == "Y")
@@ -624,32 +643,45 @@ class WarrantyService:
         rows = result.all()
         return [
             WarrantySRFSettleRecord(
-                srf_number=row.Warranty.srf_number,
-                name=row.Master.name,
-                model=row.Warranty.model,
-                delivery_date=row.Warranty.delivery_date,
-                final_amount=row.Warranty.final_amount,
-                received_by=row.Warranty.received_by,
-                pc_number=row.Warranty.pc_number,
-                invoice_number=row.Warranty.invoice_number,
+                srf_number=row.srf_number,
+                name=row.name,
+                model=row.model,
+                delivery_date=row.delivery_date,
+                final_amount=row.final_amount,
+                received_by=row.received_by,
+                pc_number=row.pc_number,
+                invoice_number=row.invoice_number,
             )
             for row in rows
         ]
 
     async def update_srf_unsettled(
         self, list_srf: List[UpdateSRFUnsettled], session: AsyncSession
-    ):
-        for srf in list_srf:
-            statement = select(Warranty).where(Warranty.srf_number == srf.srf_number)
-            result = await session.execute(statement)
-            existing_srf = result.scalar_one_or_none()
-            if existing_srf:
-                existing_srf.settlement_date = srf.settlement_date
+    ) -> List[str]:
+        missing = await bulk_update(
+            session,
+            Warranty,
+            "srf_number",
+            [
+                (srf.srf_number, {"settlement_date": srf.settlement_date})
+                for srf in list_srf
+            ],
+        )
         await session.commit()
+        return missing
 
     async def list_final_srf_settlement(self, session: AsyncSession):
         statement = (
-            select(Warranty, Master)
+            select(
+                Warranty.srf_number,
+                Master.name,
+                Warranty.model,
+                Warranty.delivery_date,
+                Warranty.final_amount,
+                Warranty.received_by,
+                Warranty.pc_number,
+                Warranty.invoice_number,
+            )
             .join(Master, Warranty.code == Master.code)
             .where(
                 (Warranty.chargeable == "Y")
@@ -662,25 +694,29 @@ class WarrantyService:
         rows = result.all()
         return [
             WarrantySRFSettleRecord(
-                srf_number=row.Warranty.srf_number,
-                name=row.Master.name,
-                model=row.Warranty.model,
-                delivery_date=row.Warranty.delivery_date,
-                final_amount=row.Warranty.final_amount,
-                received_by=row.Warranty.received_by,
-                pc_number=row.Warranty.pc_number,
-                invoice_number=row.Warranty.invoice_number,
+                srf_number=row.srf_number,
+                name=row.name,
+                model=row.model,
+                delivery_date=row.delivery_date,
+                final_amount=row.final_amount,
+                received_by=row.received_by,
+                pc_number=row.pc_number,
+                invoice_number=row.invoice_number,
             )
             for row in rows
         ]
 
     async def update_final_srf_settlement(
         self, list_srf: List[UpdateSRFFinalSettlement], session: AsyncSession
-    ):
-        for srf in list_srf:
-            statement = select(Warranty).where(Warranty.srf_number == srf.srf_number)
-            result = await session.execute(statement)
-            existing_srf = result.scalar_one_or_none()
-            if existing_srf:
-                existing_srf.final_settled = srf.final_settled
+    ) -> List[str]:
+        missing = await bulk_update(
+            session,
+            Warranty,
+            "srf_number",
+            [
+                (srf.srf_number, {"final_settled": srf.final_settled})
+                for srf in list_srf
+            ],
+        )
         await session.commit()
+        return missing
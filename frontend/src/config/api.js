@@ -100,4 +100,7 @@ const API_ENDPOINTS = {
   VENDOR_UPDATE_COMPLAINT_NUMBER: `${BASE_API_URL}vendor/update_complaint_number`,
 };
 
+// Rows per enquiry page; the backend caps limit at ENQUIRY_MAX_PAGE_SIZE (1000)
+export const ENQUIRY_PAGE_SIZE = 1000;
+
 export default API_ENDPOINTS;
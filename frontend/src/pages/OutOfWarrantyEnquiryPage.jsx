@@ -661,6 +661,11 @@ const OutOfWarrantyEnquiryPage = () => {
   const [data, setData] = useState([]);
   const [loading, setLoading] = useState(false); // Don't load on mount
   const [error, setError] = useState(null);
+  // Filters of the last search and the cursor of its next page
+  const [searchParams, setSearchParams] = useState({});
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [filterOpen, setFilterOpen] = useState(true);
   const [searched, setSearched] = useState(false);
   const [masterNames, setMasterNames] = useState([]);
@@ -679,6 +684,8 @@ const OutOfWarrantyEnquiryPage = () => {
     setChallaned("");
     setSearched(false);
     setData([]);
+    setNextCursor(null);
+    setTotal(null);
     setError(null);
   };
 
@@ -716,15 +723,32 @@ const OutOfWarrantyEnquiryPage = () => {
       if (vendorSettled) params.vendor_settled = vendorSettled;
       if (estimated) params.estimated = estimated;
       if (challaned) params.challaned = challaned;
-      const res = await outOfWarrantyEnquiry(params);
-      setData(res);
+      const page = await outOfWarrantyEnquiry(params);
+      setSearchParams(params);
+      setData(page.items);
+      setNextCursor(page.nextCursor);
+      setTotal(page.total);
     } catch (err) {
       setError(err.message || "Failed to fetch data");
       setData([]);
+      setNextCursor(null);
     }
     setLoading(false);
   };
 
+  // Handler for load more button, appends the next page of the last search
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await outOfWarrantyEnquiry(searchParams, nextCursor);
+      setData((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err.message || "Failed to fetch data");
+    }
+    setLoadingMore(false);
+  };
+
   return (
     <Container maxWidth="xl" sx={{ mt: 4 }}>
       {/* Filter Bar for searching/filtering UI */}
@@ -789,6 +813,41 @@ const OutOfWarrantyEnquiryPage = () => {
               ) : null
             }
           />
+          {nextCursor && (
+            <div
+              style={{
+                display: "flex",
+                justifyContent: "center",
+                alignItems: "center",
+                margin: "16px 0",
+                gap: 16,
+              }}
+            >
+              <span style={{ color: "#555", fontSize: 14 }}>
+                Showing {data.length}
+                {total != null ? ` of ${total}` : ""} records
+              </span>
+              <button
+                onClick={handleLoadMore}
+                disabled={loadingMore}
+                style={{
+                  padding: "8px 16px",
+                  background: "linear-gradient(90deg, #1976d2 60%, #1565c0 100%)",
+                  color: "#fff",
+                  border: "none",
+                  borderRadius: 10,
+                  fontWeight: "bold",
+                  fontSize: 15,
+                  boxShadow: "0 2px 8px rgba(25,118,210,0.08)",
+                  cursor: loadingMore ? "default" : "pointer",
+                  letterSpacing: 1,
+                  transition: "background 0.2s, box-shadow 0.2s",
+                }}
+              >
+                {loadingMore ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
         </>
       )}
     </Container>
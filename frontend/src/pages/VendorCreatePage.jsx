@@ -87,11 +87,17 @@ const CreateVendorPage = () => {
       return;
     }
     try {
-      await createVendorChallan(payload);
+      const result = await createVendorChallan(payload);
+      const skipped = (result.outcomes || []).filter(
+        (o) => o.outcome !== "added",
+      ).length;
       setError({
         message: "Challan created successfully!",
         type: "success",
-        resolution: "Challan Number: " + form.challan_code,
+        resolution:
+          "Challan Number: " +
+          (result.challan_number || form.challan_code) +
+          (skipped ? ` (${skipped} SRF skipped)` : ""),
       });
       setShowToast(true);
       setTimeout(() => {
@@ -687,6 +687,11 @@ const WarrantyEnquiryPage = () => {
   const [data, setData] = useState([]);
   const [loading, setLoading] = useState(false); // Don't load on mount
   const [error, setError] = useState(null);
+  // Filters of the last search and the cursor of its next page
+  const [searchParams, setSearchParams] = useState({});
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [filterOpen, setFilterOpen] = useState(true);
   const [searched, setSearched] = useState(false);
   const [masterNames, setMasterNames] = useState([]);
@@ -707,6 +712,8 @@ const WarrantyEnquiryPage = () => {
     setSerialNumber("");
     setSearched(false);
     setData([]);
+    setNextCursor(null);
+    setTotal(null);
     setError(null);
   };
 
@@ -745,15 +752,32 @@ const WarrantyEnquiryPage = () => {
       if (head) params.head = head;
       if (serialNumber) params.serial_number = serialNumber;
       if (delivered) params.delivered = delivered;
-      const res = await warrantyEnquiry(params);
-      setData(res);
+      const page = await warrantyEnquiry(params);
+      setSearchParams(params);
+      setData(page.items);
+      setNextCursor(page.nextCursor);
+      setTotal(page.total);
     } catch (err) {
       setError(err.message || "Failed to fetch data");
       setData([]);
+      setNextCursor(null);
     }
     setLoading(false);
   };
 
+  // Handler for load more button, appends the next page of the last search
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await warrantyEnquiry(searchParams, nextCursor);
+      setData((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err.message || "Failed to fetch data");
+    }
+    setLoadingMore(false);
+  };
+
   return (
     <Container maxWidth="xl" sx={{ mt: 4 }}>
       {/* Filter Bar for searching/filtering UI */}
@@ -819,6 +843,41 @@ const WarrantyEnquiryPage = () => {
               ) : null
             }
           />
+          {nextCursor && (
+            <div
+              style={{
+                display: "flex",
+                justifyContent: "center",
+                alignItems: "center",
+                margin: "16px 0",
+                gap: 16,
+              }}
+            >
+              <span style={{ color: "#555", fontSize: 14 }}>
+                Showing {data.length}
+                {total != null ? ` of ${total}` : ""} records
+              </span>
+              <button
+                onClick={handleLoadMore}
+                disabled={loadingMore}
+                style={{
+                  padding: "8px 16px",
+                  background: "linear-gradient(90deg, #1976d2 60%, #1565c0 100%)",
+                  color: "#fff",
+                  border: "none",
+                  borderRadius: 10,
+                  fontWeight: "bold",
+                  fontSize: 15,
+                  boxShadow: "0 2px 8px rgba(25,118,210,0.08)",
+                  cursor: loadingMore ? "default" : "pointer",
+                  letterSpacing: 1,
+                  transition: "background 0.2s, box-shadow 0.2s",
+                }}
+              >
+                {loadingMore ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
         </>
       )}
     </Container>
@@ -1,21 +1,22 @@
-import { data } from "react-router-dom";
-import API_ENDPOINTS from "../config/api";
+import API_ENDPOINTS, { ENQUIRY_PAGE_SIZE } from "../config/api";
 import { authFetch } from "./authFetchService";
 
 /**
- * Fetch warranty enquiry records with optional filters
+ * Fetch one page of warranty enquiry records with optional filters
  * @param {Object} params - Filter params: final_status, name, division, delivery_date
- * @returns {Promise<Array>} List of warranty enquiry records
+ * @param {string|null} cursor - next_cursor of the previous page, null for the first page
+ * @returns {Promise<Object>} { items, nextCursor, total }; total is only set on the first page
  */
-async function warrantyEnquiry(params = {}) {
+async function warrantyEnquiry(params = {}, cursor = null) {
+  const pageParams = cursor
+    ? { ...params, limit: ENQUIRY_PAGE_SIZE, cursor }
+    : { ...params, limit: ENQUIRY_PAGE_SIZE, with_total: true };
   // Build query string from params
-  const query = Object.entries(params)
+  const query = Object.entries(pageParams)
     .filter(([_, v]) => v !== undefined && v !== "")
     .map(([k, v]) => `${encodeURIComponent(k)}=${encodeURIComponent(v)}`)
     .join("&");
-  const url = query
-    ? `${API_ENDPOINTS.WARRANTY_ENQUIRY}?${query}`
-    : API_ENDPOINTS.WARRANTY_ENQUIRY;
+  const url = `${API_ENDPOINTS.WARRANTY_ENQUIRY}?${query}`;
   const response = await authFetch(url, {
     method: "GET",
     headers: {
@@ -30,7 +31,11 @@ async function warrantyEnquiry(params = {}) {
       resolution: data.resolution || "",
     };
   }
-  return data;
+  return {
+    items: data.items,
+    nextCursor: data.next_cursor,
+    total: data.total,
+  };
 }
 
 export { warrantyEnquiry };